@@ -1,14 +1,104 @@
 """
 Admin Analytics - Analytics and statistics for admin dashboard
 """
-from firebase_admin import firestore
+import storage
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import copy
+import functools
+import inspect
+import threading
+import time
 import pandas as pd
 
+# Usage logs are fetched for the smallest window covering the requested period,
+# so switching between the dashboard's time filters re-slices a cached frame
+USAGE_WINDOWS_DAYS = (90, 365)
+
+
+class QueryCache:
+    """TTL cache for analytics query results, shared by all admin sessions in the process"""
+    def __init__(self, ttl_seconds=120):
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}  # (method, args) -> (expires_at, value)
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Returns (hit, value)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return False, None
+            return True, entry[1]
+    
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+    
+    def invalidate(self, *method_names):
+        """Drop cached results for the given methods (all results if none given)"""
+        with self._lock:
+            if not method_names:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] in method_names]:
+                del self._entries[key]
+
+
+_query_cache = QueryCache()
+
+# Admin-triggered cohort recomputes run here, one at a time, so a full export never blocks a page render
+_background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="admin-analytics")
+_cohort_refresh = None  # Future of the latest recompute
+_cohort_refresh_lock = threading.Lock()
+
+
+class _Uncached:
+    """Fallback result of a failed query: handed to the caller, never cached"""
+    def __init__(self, value):
+        self.value = value
+
+
+def uncached(value):
+    """Return this from a cached query's error path so a transient failure isn't cached for the TTL"""
+    return _Uncached(value)
+
+
+_query_state = threading.local()  # failures seen by this thread, so callers of a failed query aren't cached either
+
+
+def cached_query(method):
+    """Cache a method's result keyed by method name and bound arguments (failed results are not cached)"""
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, tuple(list(bound.arguments.items())[1:]))
+        
+        hit, value = _query_cache.get(key)
+        if not hit:
+            failures_before = getattr(_query_state, 'failures', 0)
+            value = method(self, *args, **kwargs)
+            if isinstance(value, _Uncached):
+                _query_state.failures = getattr(_query_state, 'failures', 0) + 1
+                return value.value
+            if getattr(_query_state, 'failures', 0) == failures_before:
+                _query_cache.put(key, value)
+        # Callers get their own copy so cached results are never mutated
+        return value.copy() if isinstance(value, pd.DataFrame) else copy.deepcopy(value)
+    return wrapper
+
+
 class AdminAnalytics:
     def __init__(self):
-        self.db = firestore.client()
+        self.db = storage.get_db()
     
+    @cached_query
     def get_total_users(self):
         """Get total number of registered users"""
         try:
@@ -16,8 +106,9 @@ class AdminAnalytics:
             return len(list(users))
         except Exception as e:
             print(f"Error getting total users: {e}")
-            return 0
+            return uncached(0)
     
+    @cached_query
     def get_active_users(self, days=30):
         """Get number of active users in the last N days"""
         try:
@@ -36,8 +127,9 @@ class AdminAnalytics:
             return active_count
         except Exception as e:
             print(f"Error getting active users: {e}")
-            return 0
+            return uncached(0)
     
+    @cached_query
     def get_total_stats(self):
         """Get overall platform statistics"""
         try:
@@ -71,8 +163,9 @@ class AdminAnalytics:
             }
         except Exception as e:
             print(f"Error getting total stats: {e}")
-            return {}
+            return uncached({})
     
+    @cached_query
     def get_token_usage_by_service(self):
         """Get token usage breakdown by service type"""
         try:
@@ -100,56 +193,97 @@ class AdminAnalytics:
             return usage_by_service
         except Exception as e:
             print(f"Error getting usage by service: {e}")
-            return {}
+            return uncached({})
     
-    def get_token_usage_by_service_filtered(self, days=None, service_type=None):
-        """Get token usage breakdown with optional filters"""
+    @cached_query
+    def get_usage_logs_frame(self, window_days=None):
+        """
+        API usage logs as a DataFrame (timestamp, service, tokens, cost).
+        
+        Args:
+            window_days: Only logs from the last N days (all logs if None)
+        """
         try:
             query = self.db.collection('api_usage_logs')
-            
-            # Apply time filter
-            if days:
-                cutoff_date = datetime.now() - timedelta(days=days)
+            if window_days:
+                cutoff_date = datetime.now() - timedelta(days=window_days)
                 query = query.where('timestamp', '>=', cutoff_date)
             
-            logs = query.stream()
+            rows = []
+            for log in query.stream():
+                data = log.to_dict()
+                rows.append({
+                    'timestamp': data.get('timestamp'),
+                    'service': data.get('service_type', 'unknown'),
+                    'tokens': data.get('tokens_used', {}).get('total', 0),
+                    'cost': data.get('cost_estimate', 0)
+                })
             
-            usage_by_service = {}
+            frame = pd.DataFrame(rows, columns=['timestamp', 'service', 'tokens', 'cost'])
+            frame['timestamp'] = pd.to_datetime(frame['timestamp'], utc=True, errors='coerce')
+            return frame
+        except Exception as e:
+            print(f"Error getting usage logs: {e}")
+            return uncached(pd.DataFrame(columns=['timestamp', 'service', 'tokens', 'cost']))
+    
+    def _usage_logs_since(self, days):
+        """Cached usage logs sliced to the last N days"""
+        window = next((w for w in USAGE_WINDOWS_DAYS if days and days <= w), None)
+        frame = self.get_usage_logs_frame(window_days=window)
+        if days:
+            cutoff = pd.Timestamp.now(tz='UTC') - pd.Timedelta(days=days)
+            frame = frame[frame['timestamp'] >= cutoff]
+        return frame
+    
+    def get_token_usage_by_service_filtered(self, days=None, service_type=None):
+        """Get token usage breakdown with optional filters"""
+        try:
+            frame = self._usage_logs_since(days)
             
-            for log in logs:
-                data = log.to_dict()
-                service = data.get('service_type', 'unknown')
-                
-                # Apply service filter
-                if service_type and service_type != "All Services" and service != service_type:
-                    continue
-                
-                tokens = data.get('tokens_used', {}).get('total', 0)
-                cost = data.get('cost_estimate', 0)
-                
-                if service not in usage_by_service:
-                    usage_by_service[service] = {
-                        'tokens': 0,
-                        'cost': 0,
-                        'count': 0
-                    }
-                
-                usage_by_service[service]['tokens'] += tokens
-                usage_by_service[service]['cost'] += cost
-                usage_by_service[service]['count'] += 1
+            # Apply service filter
+            if service_type and service_type != "All Services":
+                frame = frame[frame['service'] == service_type]
             
-            return usage_by_service
+            grouped = frame.groupby('service').agg(
+                tokens=('tokens', 'sum'),
+                cost=('cost', 'sum'),
+                count=('tokens', 'size')
+            )
+            return {
+                service: {'tokens': int(row['tokens']), 'cost': float(row['cost']), 'count': int(row['count'])}
+                for service, row in grouped.iterrows()
+            }
         except Exception as e:
             print(f"Error getting filtered usage: {e}")
             return {}
     
-    def get_top_users(self, limit=10):
-        """Get top users by token usage"""
+    def _page_after(self, query, cursor):
+        """Continue a query after the document with ID `cursor` (None = first page)"""
+        if not cursor:
+            return query
+        cursor_doc = self.db.collection('users').document(cursor).get()
+        return query.start_after(cursor_doc) if cursor_doc.exists else query
+    
+    @cached_query
+    def get_top_users(self, limit=10, cursor=None):
+        """
+        Get top users by token usage (one page, highest first).
+        
+        Args:
+            limit: Page size
+            cursor: Document ID of the last user on the previous page
+        
+        Returns:
+            dict: {'users': [...], 'next_cursor': document ID or None}
+        """
         try:
-            users = self.db.collection('users').stream()
+            query = self.db.collection('users')\
+                          .order_by('usage_stats.total_tokens', direction=storage.DESCENDING)\
+                          .limit(limit)
+            docs = list(self._page_after(query, cursor).stream())
             
             user_list = []
-            for user in users:
+            for user in docs:
                 user_data = user.to_dict()
                 email = user_data.get('email', user.id)
                 stats = user_data.get('usage_stats', {})
@@ -162,14 +296,74 @@ class AdminAnalytics:
                     'last_activity': stats.get('last_activity')
                 })
             
-            # Sort by tokens descending
-            user_list.sort(key=lambda x: x['total_tokens'], reverse=True)
-            
-            return user_list[:limit]
+            next_cursor = docs[-1].id if len(docs) == limit else None
+            return {'users': user_list, 'next_cursor': next_cursor}
         except Exception as e:
             print(f"Error getting top users: {e}")
+            return uncached({'users': [], 'next_cursor': None})
+    
+    def get_all_users(self):
+        """All users with their usage stats (for exports)"""
+        try:
+            user_list = []
+            for user in self.db.collection('users').stream():
+                user_data = user.to_dict()
+                stats = user_data.get('usage_stats', {})
+                user_list.append({
+                    'email': user_data.get('email', user.id),
+                    'role': user_data.get('role', 'user'),
+                    'total_sessions': stats.get('total_sessions', 0),
+                    'total_tokens': stats.get('total_tokens', 0),
+                    'total_cost': stats.get('total_cost', 0),
+                    'last_activity': stats.get('last_activity')
+                })
+            return user_list
+        except Exception as e:
+            print(f"Error getting all users: {e}")
             return []
     
+    @cached_query
+    def get_cohort_snapshot(self):
+        """Latest materialized cohort analytics snapshot (written by cohort_analytics.py), or None"""
+        try:
+            from cohort_analytics import SNAPSHOT_COLLECTION, LATEST_SNAPSHOT_ID
+            doc = self.db.collection(SNAPSHOT_COLLECTION).document(LATEST_SNAPSHOT_ID).get()
+            return doc.to_dict() if doc.exists else None
+        except Exception as e:
+            print(f"Error getting cohort snapshot: {e}")
+            return uncached(None)
+    
+    def start_cohort_refresh(self):
+        """
+        Recompute the cohort snapshot in the background (see refresh_cohort_snapshot).
+        
+        Returns:
+            bool: False if a recompute is already running
+        """
+        global _cohort_refresh
+        with _cohort_refresh_lock:
+            if _cohort_refresh is not None and not _cohort_refresh.done():
+                return False
+            _cohort_refresh = _background.submit(self.refresh_cohort_snapshot)
+            return True
+    
+    def cohort_refresh_running(self):
+        """True while a recompute started by start_cohort_refresh is in progress"""
+        with _cohort_refresh_lock:
+            return _cohort_refresh is not None and not _cohort_refresh.done()
+    
+    def refresh_cohort_snapshot(self):
+        """Recompute the cohort snapshot now (a full export - normally left to the scheduled job)"""
+        try:
+            from cohort_analytics import run_cohort_job
+            snapshot = run_cohort_job(self.db)
+            self.invalidate('get_cohort_snapshot')
+            return snapshot
+        except Exception as e:
+            print(f"Error computing cohort snapshot: {e}")
+            return None
+    
+    @cached_query
     def get_user_progress(self, user_id):
         """Get user's progress over time (scores)"""
         try:
@@ -192,64 +386,102 @@ class AdminAnalytics:
             return progress_data
         except Exception as e:
             print(f"Error getting user progress: {e}")
-            return []
+            return uncached([])
     
     def get_usage_over_time(self, days=30):
         """Get token usage over time"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            
-            logs = self.db.collection('api_usage_logs')\
-                         .where('timestamp', '>=', cutoff_date)\
-                         .stream()
-            
-            daily_usage = {}
-            
-            for log in logs:
-                data = log.to_dict()
-                timestamp = data.get('timestamp')
-                
-                if timestamp:
-                    date_key = timestamp.strftime('%Y-%m-%d')
-                    tokens = data.get('tokens_used', {}).get('total', 0)
-                    cost = data.get('cost_estimate', 0)
-                    
-                    if date_key not in daily_usage:
-                        daily_usage[date_key] = {'tokens': 0, 'cost': 0, 'calls': 0}
-                    
-                    daily_usage[date_key]['tokens'] += tokens
-                    daily_usage[date_key]['cost'] += cost
-                    daily_usage[date_key]['calls'] += 1
+            frame = self._usage_logs_since(days)
+            frame = frame[frame['timestamp'].notna()]
             
-            return daily_usage
+            grouped = frame.groupby(frame['timestamp'].dt.strftime('%Y-%m-%d')).agg(
+                tokens=('tokens', 'sum'),
+                cost=('cost', 'sum'),
+                calls=('tokens', 'size')
+            )
+            return {
+                date_key: {'tokens': int(row['tokens']), 'cost': float(row['cost']), 'calls': int(row['calls'])}
+                for date_key, row in grouped.iterrows()
+            }
         except Exception as e:
             print(f"Error getting usage over time: {e}")
             return {}
     
-    def search_users(self, search_term):
-        """Search users by email"""
+    def invalidate(self, *method_names):
+        """Drop cached query results (targeted by method name, or everything if none given)"""
+        _query_cache.invalidate(*method_names)
+    
+    @cached_query
+    def search_users(self, search_term, limit=20, cursor=None):
+        """
+        Search users by email prefix (uses the normalized 'email_lower' field).
+        Users created before 'email_lower' existed are found once backfill_email_lower has run.
+        
+        Args:
+            search_term: Start of the email address (case-insensitive)
+            limit: Page size
+            cursor: Document ID of the last user on the previous page
+        
+        Returns:
+            dict: {'users': [...], 'next_cursor': document ID or None}
+        """
         try:
-            users = self.db.collection('users').stream()
-            
-            results = []
-            search_lower = search_term.lower()
+            prefix = search_term.strip().lower()
+            if not prefix:
+                return {'users': [], 'next_cursor': None}
             
-            for user in users:
-                user_data = user.to_dict()
-                email = user_data.get('email', user.id)
-                
-                if search_lower in email.lower():
-                    results.append({
-                        'email': email,
-                        'role': user_data.get('role', 'user'),
-                        'created_at': user_data.get('created_at'),
-                        'usage_stats': user_data.get('usage_stats', {})
-                    })
-            
-            return results
+            query = self.db.collection('users')\
+                          .where('email_lower', '>=', prefix)\
+                          .where('email_lower', '<', prefix + '\uf8ff')\
+                          .order_by('email_lower')\
+                          .limit(limit)
+            docs = list(self._page_after(query, cursor).stream())
+            next_cursor = docs[-1].id if len(docs) == limit else None
+            return {'users': [self._user_row(user) for user in docs], 'next_cursor': next_cursor}
         except Exception as e:
             print(f"Error searching users: {e}")
-            return []
+            return uncached({'users': [], 'next_cursor': None})
+    
+    @staticmethod
+    def _user_row(user):
+        user_data = user.to_dict()
+        return {
+            'email': user_data.get('email', user.id),
+            'role': user_data.get('role', 'user'),
+            'created_at': user_data.get('created_at'),
+            'usage_stats': user_data.get('usage_stats', {})
+        }
+    
+    def backfill_email_lower(self, batch_size=400):
+        """
+        One-off migration: add 'email_lower' to user documents created before prefix search.
+        
+        Returns:
+            Number of documents updated
+        """
+        try:
+            updated = 0
+            batch = self.db.batch()
+            pending = 0
+            for user in self.db.collection('users').stream():
+                user_data = user.to_dict()
+                email_lower = str(user_data.get('email', user.id)).lower()
+                if user_data.get('email_lower') == email_lower:
+                    continue
+                batch.update(user.reference, {'email_lower': email_lower})
+                pending += 1
+                if pending >= batch_size:
+                    batch.commit()
+                    updated += pending
+                    batch = self.db.batch()
+                    pending = 0
+            if pending:
+                batch.commit()
+                updated += pending
+            return updated
+        except Exception as e:
+            print(f"Error backfilling email_lower: {e}")
+            return 0
 
 
 # Singleton instance
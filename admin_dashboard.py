@@ -10,6 +10,24 @@ from admin_middleware import get_admin_middleware
 from admin_analytics import get_admin_analytics
 from translations import translations
 
+def _page_controls(name, next_cursor, language):
+    """Previous / Next buttons for a cursor-paginated list (cursor stack in st.session_state[f'{name}_cursors'])"""
+    cursors = st.session_state[f'{name}_cursors']
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    
+    with prev_col:
+        if len(cursors) > 1 and st.button("⬅️ Previous" if language == "English" else "⬅️ السابق", key=f"{name}_prev"):
+            cursors.pop()
+            st.rerun()
+    
+    with page_col:
+        st.caption(f"Page {len(cursors)}" if language == "English" else f"صفحة {len(cursors)}")
+    
+    with next_col:
+        if next_cursor and st.button("Next ➡️" if language == "English" else "التالي ➡️", key=f"{name}_next"):
+            cursors.append(next_cursor)
+            st.rerun()
+
 def show_admin_dashboard():
     """Main admin dashboard page"""
     # Get language
@@ -28,8 +46,13 @@ def show_admin_dashboard():
     st.title("📊 Admin Dashboard" if language == "English" else "📊 لوحة تحكم الأدمن")
     st.markdown("---")
     
-    # Refresh button
+    # Refresh button (query results are cached briefly; drop the ones shown on this page)
     if st.button("🔄 Refresh Data" if language == "English" else "🔄 تحديث البيانات"):
+        analytics.invalidate(
+            'get_total_stats', 'get_total_users', 'get_active_users',
+            'get_token_usage_by_service', 'get_usage_logs_frame', 'get_top_users',
+            'get_cohort_snapshot'
+        )
         st.rerun()
     
     # Get overall stats
@@ -240,10 +263,84 @@ def show_admin_dashboard():
     
     st.markdown("---")
     
+    # Cohort Analytics (materialized snapshot - see cohort_analytics.py)
+    st.subheader("🎓 Cohort Analytics" if language == "English" else "🎓 تحليلات المتدربين")
+    
+    cohort = analytics.get_cohort_snapshot()
+    
+    if cohort:
+        computed_at = cohort.get('computed_at')
+        if computed_at:
+            computed_label = computed_at.strftime('%Y-%m-%d %H:%M')
+            st.caption(f"Snapshot computed {computed_label} UTC" if language == "English"
+                       else f"تم حساب اللقطة {computed_label} UTC")
+        
+        distribution = cohort.get('score_distribution', {})
+        improvement = cohort.get('improvement', {})
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Scored Sessions" if language == "English" else "الجلسات المقيّمة", distribution.get('count', 0))
+        with col2:
+            st.metric("Median Score" if language == "English" else "الدرجة الوسيطة",
+                      f"{distribution.get('quantiles', {}).get('p50', 0)}%")
+        with col3:
+            st.metric("Avg. Improvement" if language == "English" else "متوسط التحسن",
+                      f"{improvement.get('avg_change', 0):+.1f} pts")
+        with col4:
+            st.metric("Users Improving" if language == "English" else "المتحسنون",
+                      f"{improvement.get('improved_share', 0)}%")
+        
+        col_dist, col_curve = st.columns(2)
+        
+        with col_dist:
+            df_hist = pd.DataFrame(distribution.get('histogram', []))
+            if not df_hist.empty:
+                fig_hist = px.bar(df_hist, x='bin', y='sessions', title='Score Distribution',
+                                  color_discrete_sequence=['#06b6d4'])
+                fig_hist.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                                       font_color='#ffffff', xaxis_title='Score (%)', yaxis_title='Sessions')
+                st.plotly_chart(fig_hist, use_container_width=True)
+        
+        with col_curve:
+            df_curve = pd.DataFrame(cohort.get('improvement_curve', []))
+            if not df_curve.empty:
+                fig_curve = px.line(df_curve, x='session_number', y='avg_score', markers=True,
+                                    title='Improvement Curve', hover_data=['users'],
+                                    color_discrete_sequence=['#3b82f6'])
+                fig_curve.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                                        font_color='#ffffff', xaxis_title='Session #', yaxis_title='Avg. Score (%)')
+                st.plotly_chart(fig_curve, use_container_width=True)
+        
+        df_markers = pd.DataFrame(cohort.get('marker_pass_rates', []))
+        if not df_markers.empty:
+            fig_markers = px.bar(df_markers, x='marker_id', y='pass_rate', color='competency',
+                                 title='Marker Pass Rates (weakest first)', hover_data=['observations'])
+            fig_markers.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                                      font_color='#ffffff', xaxis_title='Marker', yaxis_title='Pass Rate (%)')
+            st.plotly_chart(fig_markers, use_container_width=True)
+    else:
+        st.info("No cohort snapshot yet - run cohort_analytics.py (scheduled job)" if language == "English"
+                else "لا توجد لقطة بعد - شغّل cohort_analytics.py (مهمة مجدولة)")
+    
+    # The recompute is a full export: it runs in the background and the caption above shows when it lands
+    if analytics.cohort_refresh_running():
+        st.info("Recomputing the snapshot in the background - refresh the page to see it" if language == "English"
+                else "جاري إعادة حساب اللقطة في الخلفية - حدّث الصفحة لعرضها")
+    elif st.button("🧮 Recompute Cohort Snapshot" if language == "English" else "🧮 إعادة حساب اللقطة"):
+        analytics.start_cohort_refresh()
+        st.rerun()
+    
+    st.markdown("---")
+    
     # Top Users
     st.subheader("👥 Top Users" if language == "English" else "👥 أكثر المستخدمين نشاطاً")
     
-    top_users = analytics.get_top_users(limit=10)
+    # Pages are fetched with a Firestore cursor; the stack holds the start cursor of each visited page
+    if 'top_users_cursors' not in st.session_state:
+        st.session_state.top_users_cursors = [None]
+    
+    top_page = analytics.get_top_users(limit=10, cursor=st.session_state.top_users_cursors[-1])
+    top_users = top_page['users']
     
     if top_users:
         # Convert to dataframe
@@ -263,6 +360,8 @@ def show_admin_dashboard():
             }),
             use_container_width=True
         )
+        
+        _page_controls('top_users', top_page['next_cursor'], language)
     else:
         st.info("No user data available yet" if language == "English" else "لا توجد بيانات مستخدمين بعد")
     
@@ -277,7 +376,13 @@ def show_admin_dashboard():
     )
     
     if search_term:
-        search_results = analytics.search_users(search_term)
+        # New search term -> back to the first page
+        if st.session_state.get('user_search_term') != search_term.strip().lower():
+            st.session_state.user_search_term = search_term.strip().lower()
+            st.session_state.user_search_cursors = [None]
+        
+        search_page = analytics.search_users(search_term, limit=20, cursor=st.session_state.user_search_cursors[-1])
+        search_results = search_page['users']
         
         if search_results:
             st.success(f"Found {len(search_results)} user(s)" if language == "English" else f"تم العثور على {len(search_results)} مستخدم")
@@ -339,9 +444,19 @@ def show_admin_dashboard():
                             })
                         
                         st.table(pd.DataFrame(service_rows))
+            
+            _page_controls('user_search', search_page['next_cursor'], language)
         else:
             st.warning("No users found" if language == "English" else "لم يتم العثور على مستخدمين")
     
+    # One-time migration: users created before prefix search have no 'email_lower' yet
+    if st.button("🛠️ Index Existing Users for Search" if language == "English" else "🛠️ فهرسة المستخدمين الحاليين للبحث"):
+        with st.spinner("Indexing..." if language == "English" else "جاري الفهرسة..."):
+            updated = analytics.backfill_email_lower()
+        analytics.invalidate('search_users')
+        admin.log_admin_action(st.session_state.get('user_email'), 'backfill_email_lower', {'updated': updated})
+        st.success(f"Indexed {updated} user(s)" if language == "English" else f"تمت فهرسة {updated} مستخدم")
+    
     st.markdown("---")
     
     # Export Data
@@ -352,7 +467,7 @@ def show_admin_dashboard():
     with col1:
         if st.button("📊 Export All Users (CSV)" if language == "English" else "📊 تصدير جميع المستخدمين (CSV)"):
             # Get all users
-            all_users = analytics.get_top_users (limit=1000)  # Get all
+            all_users = analytics.get_all_users()
             
             if all_users:
                 df_export = pd.DataFrame(all_users)
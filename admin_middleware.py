@@ -1,23 +1,41 @@
 """
 Admin Middleware - Handle admin authentication and authorization
 """
+import threading
+import time
+
 import streamlit as st
 
+# How long a session trusts its cached role before checking Firestore again
+ROLE_CACHE_TTL_SECONDS = 300
+ROLE_CACHE_KEY = 'admin_role_cache'
+
+# Bumped by set_user_role so every session drops its cached role for that user
+_role_versions = {}
+_role_versions_lock = threading.Lock()
+
+
+def _role_version(user_email):
+    with _role_versions_lock:
+        return _role_versions.get(user_email, 0)
+
+
 class AdminMiddleware:
-    def __init__(self):
+    def __init__(self, role_cache_ttl=ROLE_CACHE_TTL_SECONDS):
         self._db = None
+        self.role_cache_ttl = role_cache_ttl
     
     @property
     def db(self):
-        """Lazy load Firestore client"""
+        """Lazy load the database client"""
         if self._db is None:
-            from firebase_admin import firestore
-            self._db = firestore.client()
+            import storage
+            self._db = storage.get_db()
         return self._db
     
     def is_admin(self, user_email):
         """
-        Check if a user has admin role
+        Check if a user has admin role (cached per session for role_cache_ttl seconds)
         
         Args:
             user_email: User's email address
@@ -25,6 +43,36 @@ class AdminMiddleware:
         Returns:
             bool: True if user is admin, False otherwise
         """
+        cached = st.session_state.get(ROLE_CACHE_KEY)
+        if (cached
+                and cached['email'] == user_email
+                and cached['version'] == _role_version(user_email)
+                and time.time() - cached['checked_at'] < self.role_cache_ttl):
+            return cached['is_admin']
+        
+        return self.refresh_role(user_email)
+    
+    def refresh_role(self, user_email):
+        """Look up the user's role in Firestore and cache it for this session (call at login)"""
+        version = _role_version(user_email)
+        result = self._lookup_is_admin(user_email)
+        if result is None:
+            # Lookup failed - deny for now but don't cache, so the next run retries
+            return False
+        st.session_state[ROLE_CACHE_KEY] = {
+            'email': user_email,
+            'is_admin': result,
+            'version': version,
+            'checked_at': time.time()
+        }
+        return result
+    
+    def clear_role_cache(self):
+        """Forget this session's cached role (call at logout)"""
+        st.session_state.pop(ROLE_CACHE_KEY, None)
+    
+    def _lookup_is_admin(self, user_email):
+        """Uncached Firestore role check; returns None if the lookup failed"""
         try:
             # 1. Try direct lookup (if ID is email)
             user_ref = self.db.collection('users').document(user_email)
@@ -47,7 +95,7 @@ class AdminMiddleware:
             return False
         except Exception as e:
             print(f"Error checking admin status: {e}")
-            return False
+            return None
     
     def require_admin(self):
         """
@@ -85,6 +133,8 @@ class AdminMiddleware:
         try:
             user_ref = self.db.collection('users').document(user_email)
             user_ref.update({'role': role})
+            with _role_versions_lock:
+                _role_versions[user_email] = _role_versions.get(user_email, 0) + 1
             return True
         except Exception as e:
             print(f"Error setting user role: {e}")
@@ -106,11 +156,11 @@ class AdminMiddleware:
     def log_admin_action(self, admin_email, action, details=None):
         """Log admin actions for audit trail"""
         try:
-            from firebase_admin import firestore
+            import storage
             log_entry = {
                 'admin_email': admin_email,
                 'action': action,
-                'timestamp': firestore.SERVER_TIMESTAMP
+                'timestamp': storage.SERVER_TIMESTAMP
             }
             
             if details:
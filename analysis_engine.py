@@ -4,6 +4,7 @@ import os
 import random
 import time
 from token_tracker import get_token_tracker
+from reference_data import get_core_competencies
 
 class AnalysisEngine:
     def __init__(self, api_key, markers_data, user_id=None):
@@ -14,8 +15,7 @@ class AnalysisEngine:
         
         # Load 2025 Competencies
         try:
-            with open('icf_core_competencies_2025.json', 'r', encoding='utf-8') as f:
-                self.core_competencies_2025 = json.load(f)
+            self.core_competencies_2025 = get_core_competencies()
         except Exception as e:
             print(f"Warning: Could not load 2025 Competencies: {e}")
             self.core_competencies_2025 = None
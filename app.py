@@ -2,13 +2,13 @@ import streamlit as st
 import json
 import os
 import tempfile
-import plotly.express as px
-import pandas as pd
-import importlib
-import translations as translations_module
-importlib.reload(translations_module)
+from lazy_imports import lazy, load as load_module
 from translations import translations
 
+# Heavy dependencies load on first use, not at startup (see lazy_imports.py)
+px = lazy('px')
+pd = lazy('pd')
+
 from marker_helpers import get_marker_recommendation, get_marker_explanation
 
 from dotenv import load_dotenv
@@ -16,8 +16,6 @@ from dotenv import load_dotenv
 # ... (lines 10-81 omitted) ...
 
 # Import User Dashboard
-import user_dashboard as user_dashboard_module
-importlib.reload(user_dashboard_module)
 from user_dashboard import show_user_dashboard
 
 # Sidebar Language Selector
@@ -25,6 +23,11 @@ st.sidebar.image("logo.jpg", width=200)
 language = st.sidebar.selectbox("Language / اللغة", ["English", "العربية"], key="language_selector")
 t = translations[language]
 
+# Precompute Arabic shaping for report labels and ICF texts (no-op after the first call in the process)
+if language == "العربية":
+    from pdf_renderer import warm_arabic_cache
+    warm_arabic_cache()
+
 # Check if user is admin
 from admin_middleware import get_admin_middleware
 admin = get_admin_middleware()
@@ -86,9 +89,8 @@ if 'user_email' in st.session_state:
     st.sidebar.caption("🔧 Debug Info")
     st.sidebar.caption(f"User: {st.session_state.user_email}")
     
-    from admin_middleware import get_admin_middleware
-    admin_mw = get_admin_middleware()
-    is_admin_check = admin_mw.is_admin(st.session_state.user_email)
+    # Reuse the (cached) role checked at the top of the run
+    is_admin_check = is_admin_user
     st.sidebar.caption(f"Is Admin: {is_admin_check}")
     st.sidebar.caption(f"Current Page: {st.session_state.get('current_page', 'Not Set')}")
     
@@ -131,6 +133,8 @@ if not auth_handler.is_authenticated():
     saved_session = auth_handler.load_from_cookie(cookies=cookies)
     if saved_session:
         auth_handler.save_session(saved_session)
+        admin.refresh_role(saved_session.get("email"))
+        firebase_config.link_user_id(saved_session.get("email"), saved_session.get("localId"))
         st.rerun()
 
 # Check if user wants to view landing page or login
@@ -196,6 +200,8 @@ if not auth_handler.is_authenticated():
                             
                             if result.get("success"):
                                 auth_handler.save_session(result)
+                                admin.refresh_role(result.get("email"))
+                                firebase_config.link_user_id(result.get("email"), result.get("localId"))
                                 # Save to cookie if remember_me is checked
                                 if remember_me:
                                     with st.spinner("Saving login info..."):
@@ -232,6 +238,8 @@ if not auth_handler.is_authenticated():
                     "refreshToken": "google_refresh_token"
                 }
                 auth_handler.save_session(google_session)
+                admin.refresh_role(google_session.get("email"))
+                firebase_config.link_user_id(google_session.get("email"), google_session.get("localId"))
                 
                 # Also create user profile in Firestore if doesn't exist
                 firebase_config.create_user(
@@ -429,6 +437,7 @@ st.sidebar.markdown("---")
 st.sidebar.write(f"👤 **{st.session_state.user_email}**")
 if st.sidebar.button("🚪 Logout / خروج"):
     auth_handler.clear_session()
+    admin.clear_role_cache()
     auth_handler.clear_cookie()  # Clear saved cookie
     st.rerun()
 st.sidebar.markdown("---")
@@ -498,12 +507,11 @@ st.markdown("""
     </style>
     """ % ("rtl" if language == "العربية" else "ltr"), unsafe_allow_html=True)
 
-# Load Markers
-@st.cache_data
+# Load Markers (shared, read-only snapshot - see reference_data.py)
 def load_markers():
+    from reference_data import get_markers
     try:
-        with open('markers.json', 'r') as f:
-            return json.load(f)
+        return get_markers()
     except FileNotFoundError:
         st.error("markers.json not found!")
         return None
@@ -616,17 +624,17 @@ elif mode == t["mode_training"]:
             is_audio = False
             try:
                 if file_type == 'pdf':
-                    import PyPDF2
+                    PyPDF2 = load_module('PyPDF2')
                     pdf_reader = PyPDF2.PdfReader(uploaded_file)
                     for page in pdf_reader.pages:
                         transcript_text += page.extract_text() + "\n"
                 elif file_type == 'docx':
-                    import docx
+                    docx = load_module('docx')
                     doc = docx.Document(uploaded_file)
                     for para in doc.paragraphs:
                         transcript_text += para.text + "\n"
                 elif file_type == 'rtf':
-                    from striprtf.striprtf import rtf_to_text
+                    rtf_to_text = load_module('striprtf').rtf_to_text
                     rtf_content = uploaded_file.read().decode("utf-8", errors="ignore")
                     transcript_text = rtf_to_text(rtf_content)
                 else: # txt
@@ -683,6 +691,25 @@ elif mode == t["mode_training"]:
                         with st.spinner(t["analyzing_markers"]):
                             st.session_state.analysis_result = engine.analyze_markers(content_to_analyze, is_audio=is_audio, language=language)
                             st.session_state.analysis_result['ethics_status'] = st.session_state.ethics_result.get("status", "UNKNOWN")
+                            
+                            # Start rendering the audit PDF now so the download is instant
+                            if "error" not in st.session_state.analysis_result:
+                                from report_jobs import get_report_jobs
+                                get_report_jobs().submit('mcc', st.session_state.analysis_result, language)
+
+                                # Save to Firebase (also updates the competency profile)
+                                if auth_handler.is_authenticated():
+                                    import datetime
+                                    session_data = {
+                                        'user_id': st.session_state.user_id,
+                                        'session_type': 'MCC Analysis',
+                                        'score': st.session_state.analysis_result.get('overall_score', 0),
+                                        'duration': "N/A",
+                                        'date': datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+                                        'report_json': st.session_state.analysis_result,
+                                        'compliance_percentage': round(st.session_state.analysis_result.get('compliance_percentage', 0), 1)
+                                    }
+                                    firebase_config.save_session(st.session_state.user_id, session_data)
                         
                         # 3. GROW Model Analysis
                         with st.spinner("Analyzing Session Flow (GROW Model)..." if language == "English" else "جاري تحليل تدفق الجلسة (نموذج GROW)..."):
@@ -879,30 +906,28 @@ elif mode == t["mode_training"]:
                         
                         st.markdown("---")
 
-                        # 3. PDF Generation using ReportLab
-                        from pdf_renderer import generate_mcc_pdf
+                        # 3. PDF Generation using ReportLab (rendered in the background once the analysis completes)
+                        from report_jobs import get_report_jobs
+                        report_jobs = get_report_jobs()
                         
-                        if st.button("📄 Download PCC Audit Report / تحميل تقرير التدقيق"):
+                        # Add ethics_status to result for PDF
+                        analysis_result['ethics_status'] = st.session_state.ethics_result.get('status', 'PASS') if st.session_state.ethics_result else 'PASS'
+                        
+                        pdf_bytes = report_jobs.get('mcc', analysis_result, language)
+                        if pdf_bytes is None and st.button("📄 Download PCC Audit Report / تحميل تقرير التدقيق"):
                             try:
-                                # Add ethics_status to result for PDF
-                                analysis_result['ethics_status'] = st.session_state.ethics_result.get('status', 'PASS') if st.session_state.ethics_result else 'PASS'
-                                
-                                # Generate PDF
-                                radar_path = "radar_chart.png" if os.path.exists("radar_chart.png") else None
-                                pdf_bytes = generate_mcc_pdf(
-                                    analysis_result, 
-                                    language=language,
-                                    radar_chart_path=radar_path
-                                )
-                                
-                                st.download_button(
-                                    label="📥 Click to Download PDF / اضغط للتحميل",
-                                    data=pdf_bytes,
-                                    file_name="mcc_audit_report.pdf",
-                                    mime="application/pdf"
-                                )
+                                with st.spinner("Preparing PDF..." if language == "English" else "جاري تجهيز ملف PDF..."):
+                                    pdf_bytes = report_jobs.get('mcc', analysis_result, language, wait=True, timeout=120)
                             except Exception as e:
                                 st.error(f"PDF Generation Error: {e}")
+                        
+                        if pdf_bytes:
+                            st.download_button(
+                                label="📥 Click to Download PDF / اضغط للتحميل",
+                                data=pdf_bytes,
+                                file_name="mcc_audit_report.pdf",
+                                mime="application/pdf"
+                            )
 
 
 # --- TRAINING GYM (ADVANCED SIMULATOR) ---
@@ -945,8 +970,14 @@ elif mode == t["mode_exam"]:
         st.session_state.session_start_time = None
     if 'session_messages' not in st.session_state:
         st.session_state.session_messages = []
+    from evaluation_queue import EvaluationQueue
+    from session_aggregator import SessionAggregator
     if 'hidden_analyses' not in st.session_state:
         st.session_state.hidden_analyses = []  # Store all background analyses
+    if 'evaluation_queue' not in st.session_state:
+        st.session_state.evaluation_queue = EvaluationQueue()  # Hidden evaluations still running
+    if 'session_aggregator' not in st.session_state:
+        st.session_state.session_aggregator = SessionAggregator()  # Running per-turn statistics
     if 'session_phase' not in st.session_state:
         st.session_state.session_phase = 'not_started'  # not_started, opening, exploration, deepening, closing, ended
     if 'final_session_report' not in st.session_state:
@@ -956,6 +987,14 @@ elif mode == t["mode_exam"]:
     if 'session_client_topic' not in st.session_state:
         st.session_state.session_client_topic = "career"
     
+    # Bounded prompt history for the client simulators (recent turns + rolling summary)
+    from conversation_memory import RollingHistory
+    from training_engine import CLIENT_HISTORY_RECENT_TURNS
+    if 'client_sim_history' not in st.session_state:
+        st.session_state.client_sim_history = RollingHistory(max_recent_turns=CLIENT_HISTORY_RECENT_TURNS)
+    if 'session_history' not in st.session_state:
+        st.session_state.session_history = RollingHistory(max_recent_turns=CLIENT_HISTORY_RECENT_TURNS)
+    
     # Mode Selection
     training_mode_label = "Select Training Level / اختر مستوى التدريب"
     mode_a_label = "Level 1: Re-Phrase Challenge / التحدي: إعادة الصياغة"
@@ -1203,7 +1242,10 @@ elif mode == t["mode_exam"]:
                     st.session_state.full_session_active = True
                     st.session_state.session_start_time = datetime.datetime.now()
                     st.session_state.session_messages = []
+                    st.session_state.session_history.reset()
                     st.session_state.hidden_analyses = []
+                    st.session_state.evaluation_queue = EvaluationQueue()
+                    st.session_state.session_aggregator = SessionAggregator()
                     st.session_state.session_phase = 'opening'
                     st.session_state.final_session_report = None
                     st.rerun()
@@ -1214,6 +1256,10 @@ elif mode == t["mode_exam"]:
         else:
             import datetime
             
+            # Pick up hidden evaluations that finished since the last rerun
+            for finished in st.session_state.evaluation_queue.collect():
+                st.session_state.session_aggregator.add_analysis(finished)
+            
             # Calculate session duration
             elapsed = datetime.datetime.now() - st.session_state.session_start_time
             elapsed_minutes = int(elapsed.total_seconds() / 60)
@@ -1291,30 +1337,32 @@ elif mode == t["mode_exam"]:
                             'phase': st.session_state.session_phase
                         })
                         
-                        # Background analysis (hidden from user during session)
-                        analysis = trainer.evaluate_coach_response(
+                        # Background analysis (hidden from user during session):
+                        # runs in a worker while the client reply is generated below
+                        analysis_entry = {
+                            'message_index': len(st.session_state.session_messages) - 1,
+                            'coach_message': coach_response,
+                            'timestamp': f"{elapsed_minutes:02d}:{elapsed_seconds:02d}",
+                            'phase': st.session_state.session_phase
+                        }
+                        st.session_state.hidden_analyses.append(analysis_entry)
+                        st.session_state.evaluation_queue.submit(
+                            trainer,
+                            analysis_entry,
                             st.session_state.session_messages,
                             coach_response,
                             language=language
                         )
                         
-                        # Store analysis with message index
-                        st.session_state.hidden_analyses.append({
-                            'message_index': len(st.session_state.session_messages) - 1,
-                            'coach_message': coach_response,
-                            'timestamp': f"{elapsed_minutes:02d}:{elapsed_seconds:02d}",
-                            'phase': st.session_state.session_phase,
-                            'analysis': analysis
-                        })
-                        
-                        # Get phase-aware client response
+                        # Get phase-aware client response (critical path)
                         client_response = trainer.simulate_full_session_client(
                             st.session_state.session_client_persona,
                             st.session_state.session_client_topic,
                             st.session_state.session_messages,
                             st.session_state.session_phase,
                             elapsed_minutes,
-                            language=language
+                            language=language,
+                            history=st.session_state.session_history
                         )
                         
                         if 'error' not in client_response:
@@ -1380,20 +1428,35 @@ elif mode == t["mode_exam"]:
                             duration = end_time - st.session_state.session_start_time
                             duration_minutes = int(duration.total_seconds() / 60)
                             
+                            # Make sure every hidden evaluation has landed before scoring
+                            for finished in st.session_state.evaluation_queue.collect(wait_for_all=True, timeout=120):
+                                st.session_state.session_aggregator.add_analysis(finished)
+                            
+                            # Final report works from the running per-turn summary, not the full transcript
                             report = trainer.analyze_full_coaching_session(
                                 st.session_state.session_messages,
                                 st.session_state.hidden_analyses,
                                 duration_minutes,
-                                language=language
+                                language=language,
+                                aggregator=st.session_state.session_aggregator
                             )
                             
+                            # Turns whose evaluation outlived the wait are scored without it - record how many
+                            pending_evaluations = st.session_state.evaluation_queue.pending_count()
+                            if pending_evaluations and 'error' not in report:
+                                report['pending_evaluations'] = pending_evaluations
+                            
                             st.session_state.final_session_report = report
                             st.session_state.session_debrief_active = False
                             
+                            # Render the PDF in the background while the report page loads
+                            from report_jobs import get_report_jobs
+                            get_report_jobs().submit('session', report, language)
+                            
                             # Save to Firebase
                             if auth_handler.is_authenticated():
                                 session_data = {
-                                    'user_id': st.session_state.user_email,
+                                    'user_id': st.session_state.user_id,
                                     'session_type': 'Full Session',
                                     'score': report.get('overall_score', 0),
                                     'duration': f"{duration_minutes} min",
@@ -1401,7 +1464,7 @@ elif mode == t["mode_exam"]:
                                     'report_json': report,
                                     'compliance_percentage': int(report.get('overall_score', 0) * 10) # Convert 0-10 to %
                                 }
-                                firebase_config.save_session(st.session_state.user_email, session_data)
+                                firebase_config.save_session(st.session_state.user_id, session_data)
                             
                             st.rerun()
 
@@ -1410,6 +1473,13 @@ elif mode == t["mode_exam"]:
             
             report = st.session_state.final_session_report
             
+            if report.get('pending_evaluations'):
+                st.warning(
+                    f"⏳ {report['pending_evaluations']} turn evaluation(s) did not finish in time and are not included in this report."
+                    if language == "English" else
+                    f"⏳ لم يكتمل تقييم {report['pending_evaluations']} من الردود في الوقت المحدد ولم يُدرج في هذا التقرير."
+                )
+            
             if 'error' not in report:
                 # Header metrics
                 col1, col2, col3 = st.columns([1, 1, 1])
@@ -1560,8 +1630,10 @@ elif mode == t["mode_exam"]:
             
             with col1:
                 try:
-                    from pdf_renderer import generate_session_pdf
-                    pdf_bytes = generate_session_pdf(report, language=language)
+                    # Served from the background render cache (queued when the report was generated)
+                    from report_jobs import get_report_jobs
+                    with st.spinner("Preparing PDF..." if language == "English" else "جاري تجهيز ملف PDF..."):
+                        pdf_bytes = get_report_jobs().get('session', report, language, wait=True, timeout=120)
                     
                     st.download_button(
                         label="📥 Download PDF Report / تحميل تقرير PDF",
@@ -1579,7 +1651,10 @@ elif mode == t["mode_exam"]:
                     st.session_state.full_session_active = False
                     st.session_state.final_session_report = None
                     st.session_state.session_messages = []
+                    st.session_state.session_history.reset()
                     st.session_state.hidden_analyses = []
+                    st.session_state.evaluation_queue = EvaluationQueue()
+                    st.session_state.session_aggregator = SessionAggregator()
                     st.rerun()
         
 
@@ -1653,6 +1728,7 @@ elif mode == t["mode_exam"]:
 
             
                 st.session_state.conversation_history = []
+                st.session_state.client_sim_history.reset()
                 if 'coach_textarea_value' in st.session_state:
                     del st.session_state.coach_textarea_value
                 if 'transcribed_text' in st.session_state:
@@ -1673,7 +1749,8 @@ elif mode == t["mode_exam"]:
                     st.session_state.client_persona,
                     [],
                     st.session_state.get('client_topic', 'career'),
-                    language=language
+                    language=language,
+                    history=st.session_state.client_sim_history
                 )
                 if 'error' not in opening:
                     st.session_state.conversation_history.append({
@@ -1883,7 +1960,8 @@ elif mode == t["mode_exam"]:
                         st.session_state.client_persona,
                         st.session_state.conversation_history,
                         st.session_state.get('client_topic', 'career'),
-                        language=language
+                        language=language,
+                        history=st.session_state.client_sim_history
                     )
                     
                     if 'error' not in client_response:
@@ -215,10 +215,10 @@ def show(api_key, markers_data, language="English"):
                     }
                     
                     # Save to Database
-                    if 'user_email' in st.session_state:
+                    if 'user_id' in st.session_state:
                         from firebase_config import save_arcade_result
                         save_arcade_result(
-                            user_id=st.session_state.user_email,
+                            user_id=st.session_state.user_id,
                             score=points,
                             level=difficulty,
                             details={
@@ -1,6 +1,9 @@
 import requests
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 import streamlit as st
 
 # Load environment variables
@@ -15,6 +18,41 @@ SIGN_UP_URL = f"https://identitytoolkit.googleapis.com/v1/accounts:signUp?key={F
 PASSWORD_RESET_URL = f"https://identitytoolkit.googleapis.com/v1/accounts:sendOobCode?key={FIREBASE_API_KEY}"
 REFRESH_TOKEN_URL = f"https://securetoken.googleapis.com/v1/token?key={FIREBASE_API_KEY}"
 
+AUTH_REQUEST_TIMEOUT = 15  # seconds
+# Refresh the ID token only when it expires within this window
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# Keep-alive connection pool shared by all auth calls in the process
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def _get_http_session():
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=10)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+def _post(url, payload):
+    return _get_http_session().post(url, json=payload, timeout=AUTH_REQUEST_TIMEOUT)
+
+def _expires_at(expires_in):
+    """Absolute expiry time (epoch seconds) from Firebase's expiresIn, or None"""
+    try:
+        return time.time() + int(expires_in)
+    except (TypeError, ValueError):
+        return None
+
+def token_needs_refresh(expires_at):
+    """True if the ID token is unknown/expired or expires within TOKEN_REFRESH_MARGIN_SECONDS"""
+    if not expires_at:
+        return True
+    return time.time() >= float(expires_at) - TOKEN_REFRESH_MARGIN_SECONDS
+
 def sign_in_with_email(email, password):
     """
     Sign in with email and password using Firebase REST API.
@@ -27,7 +65,7 @@ def sign_in_with_email(email, password):
             "returnSecureToken": True
         }
         
-        response = requests.post(SIGN_IN_URL, json=payload)
+        response = _post(SIGN_IN_URL, payload)
         data = response.json()
         
         if response.status_code == 200:
@@ -62,7 +100,7 @@ def sign_up_with_email(email, password):
             "returnSecureToken": True
         }
         
-        response = requests.post(SIGN_UP_URL, json=payload)
+        response = _post(SIGN_UP_URL, payload)
         data = response.json()
         
         if response.status_code == 200:
@@ -71,7 +109,8 @@ def sign_up_with_email(email, password):
                 "idToken": data.get("idToken"),
                 "refreshToken": data.get("refreshToken"),
                 "email": data.get("email"),
-                "localId": data.get("localId")
+                "localId": data.get("localId"),
+                "expiresIn": data.get("expiresIn")
             }
         else:
             error_message = data.get("error", {}).get("message", "Unknown error")
@@ -95,7 +134,7 @@ def send_password_reset_email(email):
             "email": email
         }
         
-        response = requests.post(PASSWORD_RESET_URL, json=payload)
+        response = _post(PASSWORD_RESET_URL, payload)
         data = response.json()
         
         if response.status_code == 200:
@@ -125,7 +164,7 @@ def refresh_id_token(refresh_token):
             "refresh_token": refresh_token
         }
         
-        response = requests.post(REFRESH_TOKEN_URL, json=payload)
+        response = _post(REFRESH_TOKEN_URL, payload)
         data = response.json()
         
         if response.status_code == 200:
@@ -155,6 +194,23 @@ def save_session(user_data):
     st.session_state.user_email = user_data.get("email")
     st.session_state.user_id = user_data.get("localId")
     st.session_state.refresh_token = user_data.get("refreshToken")
+    st.session_state.token_expires_at = user_data.get("expiresAt") or _expires_at(user_data.get("expiresIn"))
+
+def get_id_token():
+    """
+    Current user's ID token, refreshed first only if it is close to expiry.
+    Returns None if not signed in or the refresh failed.
+    """
+    if not st.session_state.get('user_token'):
+        return None
+    if token_needs_refresh(st.session_state.get('token_expires_at')):
+        result = refresh_id_token(st.session_state.get('refresh_token'))
+        if not result.get("success"):
+            return None
+        st.session_state.user_token = result.get("idToken")
+        st.session_state.refresh_token = result.get("refreshToken")
+        st.session_state.token_expires_at = _expires_at(result.get("expiresIn"))
+    return st.session_state.user_token
 
 def clear_session():
     """
@@ -170,6 +226,8 @@ def clear_session():
         del st.session_state.user_id
     if 'refresh_token' in st.session_state:
         del st.session_state.refresh_token
+    if 'token_expires_at' in st.session_state:
+        del st.session_state.token_expires_at
 
 def is_authenticated():
     """
@@ -185,11 +243,14 @@ def save_to_cookie(user_data, remember_me=False, cookies=None):
         try:
             import json
             
-            # Store minimal session data
+            # Store minimal session data (plus the current ID token so a reload
+            # within its lifetime doesn't need a refresh round trip)
             session_data = {
                 "email": user_data.get("email"),
                 "user_id": user_data.get("localId"),
-                "refresh_token": user_data.get("refreshToken")
+                "refresh_token": user_data.get("refreshToken"),
+                "id_token": user_data.get("idToken"),
+                "expires_at": user_data.get("expiresAt") or _expires_at(user_data.get("expiresIn"))
             }
             
             cookies["user_session"] = json.dumps(session_data)
@@ -212,18 +273,32 @@ def load_from_cookie(cookies=None):
         if session_json:
             session_data = json.loads(session_json)
             
-            # Try to refresh the token
             refresh_token = session_data.get("refresh_token")
+            
+            # Reuse the saved ID token while it is still valid
+            if session_data.get("id_token") and not token_needs_refresh(session_data.get("expires_at")):
+                return {
+                    "email": session_data.get("email"),
+                    "localId": session_data.get("user_id"),
+                    "idToken": session_data.get("id_token"),
+                    "refreshToken": refresh_token,
+                    "expiresAt": session_data.get("expires_at")
+                }
+            
+            # Otherwise refresh the token
             if refresh_token:
                 result = refresh_id_token(refresh_token)
                 if result.get("success"):
-                    # Return refreshed session
-                    return {
+                    # Return refreshed session and remember the new token for the next load
+                    refreshed = {
                         "email": session_data.get("email"),
                         "localId": session_data.get("user_id"),
                         "idToken": result.get("idToken"),
-                        "refreshToken": result.get("refreshToken")
+                        "refreshToken": result.get("refreshToken"),
+                        "expiresIn": result.get("expiresIn")
                     }
+                    save_to_cookie(refreshed, remember_me=True, cookies=cookies)
+                    return refreshed
         return None
     except Exception as e:
         print(f"Failed to load cookie: {e}")
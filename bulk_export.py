@@ -0,0 +1,221 @@
+"""
+Bulk Export - Render PDF reports for many saved sessions into a single ZIP archive
+Sessions are streamed from Firestore in pages, rendered in a process pool and written
+to the ZIP as each PDF completes, so memory use stays flat regardless of batch size.
+
+Usage:
+    python bulk_export.py --user coach@example.com --since 2025-01-01 --out reports.zip
+    python bulk_export.py --ids SESSION_ID SESSION_ID ... --language العربية
+"""
+import argparse
+import csv
+import io
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
+from datetime import datetime, timezone
+
+import storage
+
+from firebase_config import load_session_reports
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _with_reports(db, docs):
+    """Attach each session's full report (stored in a child document) to its data"""
+    sessions = [(doc.id, doc.to_dict()) for doc in docs if doc.exists]
+    reports = load_session_reports(sessions, db)
+    for session_id, data in sessions:
+        if session_id in reports:
+            data['report_json'] = reports[session_id]
+    return sessions
+
+
+def iter_sessions(db, session_ids=None, user_id=None, since=None, until=None, page_size=50):
+    """
+    Stream session documents page by page.
+
+    Args:
+        db: Firestore client
+        session_ids: Explicit session document IDs (takes precedence over the filters)
+        user_id: Only sessions of this user (Firebase uid - the key sessions are stored under)
+        since / until: Optional datetime bounds on created_at (until is exclusive)
+        page_size: Documents fetched per round trip
+
+    Yields:
+        (doc_id, session_data) with the full report under 'report_json'
+    """
+    sessions_ref = db.collection('sessions')
+
+    if session_ids:
+        for id_page in _chunks(list(session_ids), page_size):
+            refs = [sessions_ref.document(doc_id) for doc_id in id_page]
+            yield from _with_reports(db, db.get_all(refs))
+        return
+
+    # Note: user_id + created_at range needs a composite index on (user_id, created_at)
+    query = sessions_ref
+    if user_id:
+        query = query.where('user_id', '==', user_id)
+    if since:
+        query = query.where('created_at', '>=', since)
+    if until:
+        query = query.where('created_at', '<', until)
+    query = query.order_by('created_at').limit(page_size)
+
+    last_doc = None
+    while True:
+        page_query = query.start_after(last_doc) if last_doc is not None else query
+        docs = list(page_query.stream())
+        yield from _with_reports(db, docs)
+        if len(docs) < page_size:
+            break
+        last_doc = docs[-1]
+
+
+def _report_kind(session_data):
+    """Pick the PDF layout for a stored report ('mcc', 'session' or None if not exportable)"""
+    report = session_data.get('report_json') or {}
+    if not isinstance(report, dict) or 'error' in report:
+        return None
+    if isinstance(report.get('competencies'), dict):
+        return 'mcc'
+    if session_data.get('session_type') == 'Full Session' or 'session_flow' in report:
+        return 'session'
+    return None
+
+
+def _render_pdf(doc_id, kind, report, language):
+    """Worker: render one report in a separate process"""
+    from pdf_renderer import PDFRenderer
+    renderer = PDFRenderer(language=language)
+    if kind == 'mcc':
+        buffer = renderer.create_report(report)
+    else:
+        buffer = renderer.create_session_report(report)
+    return doc_id, buffer.getvalue()
+
+
+def _archive_name(doc_id, session_data):
+    user = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(session_data.get('user_id', 'unknown')))
+    date = re.sub(r'[^0-9-]+', '', str(session_data.get('date', ''))[:10]) or 'undated'
+    return f"{user}/{date}_{doc_id}.pdf"
+
+
+def export_sessions_zip(output, session_ids=None, user_id=None, since=None, until=None,
+                        language="English", max_workers=4, max_in_flight=None, page_size=50, db=None):
+    """
+    Render the selected sessions to PDF and write them into a ZIP archive.
+
+    Args:
+        output: ZIP file path or writable binary file object
+        max_workers: Render processes
+        max_in_flight: Maximum reports submitted but not yet written (bounds memory)
+
+    Returns:
+        dict: {'exported', 'skipped', 'failed'} counts
+    """
+    db = db or storage.get_db()
+    max_in_flight = max_in_flight or max_workers * 2
+    counts = {'exported': 0, 'skipped': 0, 'failed': 0}
+    manifest = io.StringIO()
+    manifest_writer = csv.writer(manifest)
+    manifest_writer.writerow(['session_id', 'user_id', 'session_type', 'status', 'file'])
+
+    # PDFs are already compressed internally, so entries are stored rather than deflated
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED) as archive, \
+            ProcessPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}  # future -> (doc_id, archive name, user_id, session_type)
+
+        def drain(return_when):
+            done, _ = wait(list(in_flight), return_when=return_when)
+            for future in done:
+                doc_id, name, owner, session_type = in_flight.pop(future)
+                try:
+                    _, pdf_bytes = future.result()
+                    archive.writestr(name, pdf_bytes)
+                    manifest_writer.writerow([doc_id, owner, session_type, 'exported', name])
+                    counts['exported'] += 1
+                except Exception as e:
+                    print(f"Error rendering session {doc_id}: {e}")
+                    manifest_writer.writerow([doc_id, owner, session_type, f'failed: {e}', ''])
+                    counts['failed'] += 1
+
+        for doc_id, session_data in iter_sessions(db, session_ids, user_id, since, until, page_size):
+            owner = session_data.get('user_id', '')
+            session_type = session_data.get('session_type', '')
+            kind = _report_kind(session_data)
+            if kind is None:
+                manifest_writer.writerow([doc_id, owner, session_type, 'skipped', ''])
+                counts['skipped'] += 1
+                continue
+
+            if len(in_flight) >= max_in_flight:
+                drain(FIRST_COMPLETED)
+
+            future = executor.submit(_render_pdf, doc_id, kind, session_data['report_json'], language)
+            in_flight[future] = (doc_id, _archive_name(doc_id, session_data), owner, session_type)
+
+        if in_flight:
+            drain(ALL_COMPLETED)
+
+        archive.writestr('manifest.csv', manifest.getvalue())
+
+    return counts
+
+
+def _parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export saved coaching session reports as PDFs in a ZIP archive")
+    parser.add_argument('--ids', nargs='*', help="Session document IDs")
+    parser.add_argument('--ids-file', help="File with one session document ID per line")
+    parser.add_argument('--user', help="Only sessions of this user (email address or Firebase uid)")
+    parser.add_argument('--since', type=_parse_date, help="Created on or after (YYYY-MM-DD)")
+    parser.add_argument('--until', type=_parse_date, help="Created before (YYYY-MM-DD)")
+    parser.add_argument('--language', default="English", choices=["English", "العربية"])
+    parser.add_argument('--out', default="session_reports.zip", help="Output ZIP path")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    session_ids = list(args.ids or [])
+    if args.ids_file:
+        with open(args.ids_file, 'r', encoding='utf-8') as f:
+            session_ids.extend(line.strip() for line in f if line.strip())
+
+    from firebase_config import initialize_firebase, resolve_user_id
+    if not initialize_firebase():
+        return 1
+    
+    # Sessions are keyed by uid; map an email address to it first
+    user_id = args.user
+    if user_id and '@' in user_id:
+        user_id = resolve_user_id(args.user)
+        if not user_id:
+            print(f"Error: no user id found for {args.user}")
+            return 1
+
+    counts = export_sessions_zip(
+        args.out,
+        session_ids=session_ids or None,
+        user_id=user_id,
+        since=args.since,
+        until=args.until,
+        language=args.language,
+        max_workers=args.workers,
+        page_size=args.page_size
+    )
+    print(f"Exported {counts['exported']} reports to {args.out} "
+          f"({counts['skipped']} skipped, {counts['failed']} failed)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+"""
+Cohort Analytics - Score distributions, marker pass rates and improvement curves across all users
+Runs as a scheduled job (cron / Cloud Scheduler): session summaries are exported page by page,
+aggregated with pandas/NumPy and materialized to snapshot documents, so the admin dashboard reads
+one document instead of scanning the sessions collection.
+
+Usage:
+    python cohort_analytics.py                  # compute and store a new snapshot
+    python cohort_analytics.py --dry-run        # compute and print, don't store
+"""
+import argparse
+from datetime import datetime, timezone
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+import storage
+
+SNAPSHOT_COLLECTION = 'cohort_snapshots'
+LATEST_SNAPSHOT_ID = 'latest'
+
+SUMMARY_FIELDS = ['user_id', 'created_at', 'session_type', 'compliance_percentage', 'score_summary']
+SCORE_BINS = np.arange(0, 101, 10)  # 0-10, ..., 90-100
+MAX_CURVE_SESSIONS = 20  # improvement curve: 1st..20th session of each user
+
+
+def export_session_summaries(db, page_size=500):
+    """
+    Stream compact session summaries (no reports) ordered by creation time.
+
+    Yields:
+        dict with SUMMARY_FIELDS
+    """
+    query = db.collection('sessions').select(SUMMARY_FIELDS).order_by('created_at').limit(page_size)
+    last_doc = None
+    while True:
+        page_query = query.start_after(last_doc) if last_doc is not None else query
+        docs = list(page_query.stream())
+        for doc in docs:
+            yield doc.to_dict() or {}
+        if len(docs) < page_size:
+            break
+        last_doc = docs[-1]
+
+
+def build_frames(rows):
+    """
+    Columnar views of the exported summaries.
+
+    Returns:
+        (sessions, markers, competencies) DataFrames. sessions has one row per session
+        (user_id, created_at, session_type, score, session_number); markers and competencies have one
+        row per scored item, with the session's row label in 'session'.
+    """
+    rows = list(rows)
+    summaries = [row.get('score_summary') or {} for row in rows]
+
+    sessions = pd.DataFrame({
+        'user_id': [row.get('user_id') for row in rows],
+        'created_at': pd.to_datetime(pd.Series([row.get('created_at') for row in rows], dtype=object),
+                                     utc=True, errors='coerce'),
+        'session_type': [row.get('session_type') or 'unknown' for row in rows],
+        'score': pd.to_numeric(pd.Series([row.get('compliance_percentage') for row in rows], dtype=object),
+                               errors='coerce')
+    })
+    # n-th session of each user (the export is already chronological; the stable sort keeps ties in order)
+    chronological = sessions.sort_values('created_at', kind='stable')
+    sessions['session_number'] = chronological.groupby('user_id').cumcount() + 1
+
+    def items(ids_key, values_key, value_name):
+        ids_per_session = [summary.get(ids_key, []) for summary in summaries]
+        counts = np.fromiter((len(ids) for ids in ids_per_session), dtype=np.int64, count=len(rows))
+        values = np.fromiter(
+            chain.from_iterable(summary.get(values_key, []) for summary in summaries),
+            dtype=float, count=int(counts.sum())
+        )
+        return pd.DataFrame({
+            'session': np.repeat(np.arange(len(rows)), counts),
+            'id': list(chain.from_iterable(ids_per_session)),
+            value_name: values
+        })
+
+    markers = items('marker_ids', 'marker_observed', 'observed')
+    competencies = items('competency_ids', 'competency_scores', 'score')
+    return sessions, markers, competencies
+
+
+def _distribution(scores):
+    scores = scores.dropna().clip(0, 100)
+    counts, _ = np.histogram(scores, bins=SCORE_BINS)
+    quantiles = scores.quantile([0.1, 0.25, 0.5, 0.75, 0.9]) if len(scores) else pd.Series(dtype=float)
+    return {
+        'count': int(len(scores)),
+        'mean': round(float(scores.mean()), 1) if len(scores) else 0,
+        'quantiles': {f"p{int(q * 100)}": round(float(v), 1) for q, v in quantiles.items()},
+        'histogram': [
+            {'bin': f"{int(low)}-{int(high)}", 'sessions': int(count)}
+            for low, high, count in zip(SCORE_BINS[:-1], SCORE_BINS[1:], counts)
+        ]
+    }
+
+
+def compute_cohort_snapshot(sessions, markers, competencies):
+    """Aggregate the columnar frames into a JSON-serializable snapshot"""
+    scored = sessions[sessions['score'].notna()]
+
+    # Score distributions (overall and per session type)
+    by_type = {
+        str(session_type): _distribution(group['score'])
+        for session_type, group in scored.groupby('session_type')
+    }
+
+    # Per-marker pass rates
+    marker_rates = markers.groupby('id').agg(observations=('observed', 'size'), pass_rate=('observed', 'mean'))
+    marker_rates = marker_rates.sort_values('pass_rate')
+    marker_pass_rates = [
+        {
+            'marker_id': str(marker_id),
+            'competency': f"C{str(marker_id).split('.')[0]}",
+            'pass_rate': round(float(row['pass_rate']) * 100, 1),
+            'observations': int(row['observations'])
+        }
+        for marker_id, row in marker_rates.iterrows()
+    ]
+
+    competency_stats = competencies.groupby('id')['score'].agg(['size', 'mean', 'median'])
+    competency_scores = [
+        {
+            'competency': str(comp_id),
+            'sessions': int(row['size']),
+            'mean': round(float(row['mean']), 1),
+            'median': round(float(row['median']), 1)
+        }
+        for comp_id, row in competency_stats.iterrows()
+    ]
+
+    # Improvement curve: average score by the user's n-th session
+    curve_frame = scored[scored['session_number'] <= MAX_CURVE_SESSIONS]
+    curve = curve_frame.groupby('session_number')['score'].agg(['mean', 'size'])
+    improvement_curve = [
+        {'session_number': int(n), 'avg_score': round(float(row['mean']), 1), 'users': int(row['size'])}
+        for n, row in curve.iterrows()
+    ]
+
+    # First vs latest score per user (users with at least two scored sessions)
+    per_user = scored.sort_values('created_at', kind='stable').groupby('user_id')['score'].agg(['first', 'last', 'size'])
+    per_user = per_user[per_user['size'] >= 2]
+    deltas = per_user['last'] - per_user['first']
+
+    return {
+        'session_count': int(len(sessions)),
+        'user_count': int(sessions['user_id'].nunique()),
+        'score_distribution': _distribution(scored['score']),
+        'score_distribution_by_type': by_type,
+        'marker_pass_rates': marker_pass_rates,
+        'competency_scores': competency_scores,
+        'improvement_curve': improvement_curve,
+        'improvement': {
+            'users': int(len(deltas)),
+            'avg_change': round(float(deltas.mean()), 1) if len(deltas) else 0,
+            'improved_share': round(float((deltas > 0).mean()) * 100, 1) if len(deltas) else 0
+        }
+    }
+
+
+def run_cohort_job(db=None, store=True, page_size=500):
+    """
+    Export summaries, compute the snapshot and (optionally) store it as 'latest' plus a dated copy.
+
+    Returns:
+        The snapshot dict
+    """
+    db = db or storage.get_db()
+    sessions, markers, competencies = build_frames(export_session_summaries(db, page_size))
+    snapshot = compute_cohort_snapshot(sessions, markers, competencies)
+    computed_at = datetime.now(timezone.utc)
+    snapshot['computed_at'] = computed_at
+
+    if store:
+        snapshots_ref = db.collection(SNAPSHOT_COLLECTION)
+        batch = db.batch()
+        batch.set(snapshots_ref.document(LATEST_SNAPSHOT_ID), snapshot)
+        batch.set(snapshots_ref.document(computed_at.strftime('%Y-%m-%d')), snapshot)
+        batch.commit()
+    return snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute cohort analytics and store a snapshot")
+    parser.add_argument('--dry-run', action='store_true', help="Print the snapshot instead of storing it")
+    parser.add_argument('--page-size', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    from firebase_config import initialize_firebase
+    if not initialize_firebase():
+        return 1
+
+    snapshot = run_cohort_job(store=not args.dry_run, page_size=args.page_size)
+    distribution = snapshot['score_distribution']
+    print(f"Cohort snapshot: {snapshot['session_count']} sessions, {snapshot['user_count']} users, "
+          f"mean score {distribution['mean']}")
+    if args.dry_run:
+        import json
+        print(json.dumps(snapshot, indent=2, default=str, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""
+Conversation Memory - Bounded rolling history for multi-turn AI prompts
+Keeps the last N turns verbatim plus a compact, incrementally updated summary of older turns,
+so the history section of a prompt stays the same size no matter how long the conversation runs.
+"""
+import re
+from collections import deque
+
+
+class RollingHistory:
+    def __init__(self, max_recent_turns=6, max_summary_lines=10, summary_line_chars=160):
+        """
+        Args:
+            max_recent_turns: Number of latest turns kept verbatim
+            max_summary_lines: Maximum number of compressed lines for older turns
+            summary_line_chars: Maximum length of a single compressed turn
+        """
+        self.max_recent_turns = max_recent_turns
+        self.max_summary_lines = max_summary_lines
+        self.summary_line_chars = summary_line_chars
+        self.reset()
+
+    def reset(self):
+        """Forget all turns"""
+        self.recent = deque()
+        self.summary_lines = deque(maxlen=self.max_summary_lines)
+        self.opening_line = None  # First summarized turn is kept as the conversation anchor
+        self.turn_count = 0
+
+    def add(self, role, content):
+        """Append a turn, folding the oldest verbatim turn into the summary when the window is full"""
+        self.recent.append((role, str(content or "")))
+        self.turn_count += 1
+
+        while len(self.recent) > self.max_recent_turns:
+            old_role, old_content = self.recent.popleft()
+            line = f"{old_role}: {self._compress(old_content)}"
+            if self.opening_line is None:
+                self.opening_line = line
+            else:
+                self.summary_lines.append(line)
+
+    def sync(self, messages):
+        """
+        Ingest only the messages added since the last sync.
+        Rebuilds from scratch if the message list was reset or truncated.
+
+        Args:
+            messages: List of dicts with 'role' and 'content'
+        """
+        if len(messages) < self.turn_count:
+            self.reset()
+        for msg in messages[self.turn_count:]:
+            self.add(msg.get('role', 'unknown'), msg.get('content', ''))
+        return self
+
+    def has_turns(self):
+        return self.turn_count > 0
+
+    def summary_text(self):
+        """Compressed summary of turns that left the verbatim window"""
+        lines = []
+        if self.opening_line:
+            lines.append(self.opening_line)
+        if self.turn_count - len(self.recent) > len(self.summary_lines) + len(lines):
+            lines.append("...")
+        lines.extend(self.summary_lines)
+        return "\n".join(lines)
+
+    def recent_text(self):
+        """Latest turns, verbatim"""
+        return "\n".join(f"{role}: {content}" for role, content in self.recent)
+
+    def render(self):
+        """History block ready to be embedded in a prompt"""
+        parts = []
+        summary = self.summary_text()
+        if summary:
+            parts.append("EARLIER IN THE CONVERSATION (summarized):")
+            parts.append(summary)
+            parts.append("")
+            parts.append("MOST RECENT EXCHANGES:")
+        parts.append(self.recent_text())
+        return "\n".join(parts)
+
+    def _compress(self, content):
+        """Collapse a turn to its first sentence(s), capped at summary_line_chars"""
+        text = " ".join(content.split())
+        if len(text) <= self.summary_line_chars:
+            return text
+
+        sentences = re.split(r'(?<=[.!?؟])\s+', text)
+        compressed = ""
+        for sentence in sentences:
+            candidate = f"{compressed} {sentence}".strip()
+            if len(candidate) > self.summary_line_chars:
+                break
+            compressed = candidate
+
+        if not compressed:
+            compressed = text[:self.summary_line_chars - 4].rstrip()
+        return f"{compressed} ..."
@@ -0,0 +1,76 @@
+"""
+Evaluation Queue - Run hidden per-turn coach evaluations off the critical path
+The client reply is generated while the evaluation runs in a background worker;
+results are collected on later reruns and awaited before the final session report.
+Evaluations that outlive a wait stay queued and are flagged 'analysis_pending' until they land.
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Shared worker pool for all sessions in the process (calls are I/O bound)
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="coach-eval")
+
+
+class EvaluationQueue:
+    def __init__(self):
+        self.pending = []  # (hidden analysis entry, future)
+
+    def submit(self, trainer, entry, conversation_history, coach_message, language="English"):
+        """
+        Schedule evaluate_coach_response for a coach turn.
+
+        Args:
+            trainer: TrainingEngine instance
+            entry: Hidden analysis dict; its 'analysis' key is filled in when collected
+            conversation_history: Conversation up to and including the coach message
+            coach_message: The coach message being evaluated
+        """
+        # Snapshot the history - the live list keeps growing while the worker runs
+        snapshot = list(conversation_history)
+        future = _executor.submit(
+            trainer.evaluate_coach_response,
+            snapshot,
+            coach_message,
+            language=language
+        )
+        self.pending.append((entry, future))
+        return future
+
+    def collect(self, wait_for_all=False, timeout=None):
+        """
+        Move finished evaluations into their entries.
+
+        Args:
+            wait_for_all: Block until every pending evaluation is done (use before the final report)
+            timeout: Maximum seconds to wait when wait_for_all is True
+
+        Entries still running after the wait keep their futures (a later collect fills them in)
+        and are flagged with entry['analysis_pending'] = True so the UI can say so.
+        
+        Returns:
+            list: Entries completed by this call, in submission order
+        """
+        if wait_for_all and self.pending:
+            wait([future for _, future in self.pending], timeout=timeout)
+
+        completed = []
+        still_pending = []
+        for entry, future in self.pending:
+            if not future.done():
+                still_pending.append((entry, future))
+                continue
+            entry.pop('analysis_pending', None)
+            try:
+                entry['analysis'] = future.result()
+            except Exception as e:
+                entry['analysis'] = {"error": str(e)}
+            completed.append(entry)
+
+        self.pending = still_pending
+        if wait_for_all and still_pending:
+            for entry, _ in still_pending:
+                entry['analysis_pending'] = True
+            print(f"Evaluations still running after {timeout}s: {len(still_pending)}")
+        return completed
+
+    def pending_count(self):
+        return len(self.pending)
@@ -1,11 +1,17 @@
 import firebase_admin
-from firebase_admin import credentials, firestore, auth
+from firebase_admin import credentials, auth
 import streamlit as st
+import storage
 import os
 import json
+import zlib
+from datetime import datetime, timezone
 
 # Initialize Firebase App
 def initialize_firebase():
+    # The local store needs no Firebase app or credentials
+    if storage.is_local():
+        return True
     # Check if already initialized
     if not firebase_admin._apps:
         try:
@@ -26,7 +32,7 @@ def verify_login(email, password):
     import hashlib
     
     try:
-        db = firestore.client()
+        db = storage.get_db()
         # Query for user with this email
         users_ref = db.collection('users')
         query = users_ref.where('email', '==', email).limit(1).stream()
@@ -64,7 +70,7 @@ def create_user(email, password, username):
     import hashlib
     
     try:
-        db = firestore.client()
+        db = storage.get_db()
         
         # Check if email already exists
         users_ref = db.collection('users')
@@ -80,8 +86,9 @@ def create_user(email, password, username):
         user_data = {
             'username': username,
             'email': email,
+            'email_lower': email.lower(),  # Used for admin prefix search
             'password_hash': password_hash,
-            'created_at': firestore.SERVER_TIMESTAMP,
+            'created_at': storage.SERVER_TIMESTAMP,
             'role': 'coach'
         }
         new_user_ref.set(user_data)
@@ -98,7 +105,7 @@ def get_user_profile(email):
     Fetch user profile data (name, title, etc.) from Firestore.
     """
     try:
-        db = firestore.client()
+        db = storage.get_db()
         doc_ref = db.collection('users').document(email)
         doc = doc_ref.get()
         if doc.exists:
@@ -113,7 +120,7 @@ def update_user_profile(email, profile_data):
     Update user profile fields.
     """
     try:
-        db = firestore.client()
+        db = storage.get_db()
         doc_ref = db.collection('users').document(email)
         # Use set with merge=True to update existing fields or create if missing
         doc_ref.set(profile_data, merge=True)
@@ -122,40 +129,415 @@ def update_user_profile(email, profile_data):
         print(f"Error updating profile: {e}")
         return False
 
+def link_user_id(email, user_id):
+    """
+    Record the user's Firebase uid (the key sessions are stored under) on users/{email},
+    so tools and migrations can map an email address to its sessions.
+    """
+    if not email or not user_id:
+        return False
+    try:
+        db = storage.get_db()
+        doc_ref = db.collection('users').document(email)
+        doc = doc_ref.get()
+        if doc.exists and (doc.to_dict() or {}).get('uid') == user_id:
+            return True
+        doc_ref.set({'uid': user_id, 'email': email, 'email_lower': email.lower()}, merge=True)
+        # First login since sessions were keyed by uid: move the ones saved under the email
+        rekey_user_records(email, user_id)
+        return True
+    except Exception as e:
+        print(f"Error linking user id: {e}")
+        return False
+
+def resolve_user_id(email):
+    """
+    Firebase uid for an email address: users/{email}.uid, else a Firebase Auth lookup.
+    
+    Returns:
+        uid string, or None if unknown
+    """
+    try:
+        doc = storage.get_db().collection('users').document(email).get()
+        if doc.exists and (doc.to_dict() or {}).get('uid'):
+            return doc.to_dict()['uid']
+        if not storage.is_local():
+            return auth.get_user_by_email(email).uid
+        return None
+    except Exception as e:
+        print(f"Error resolving user id for {email}: {e}")
+        return None
+
 # Database Functions
+
+# Full reports live in a child document (sessions/{id}/details/report) as a compressed blob,
+# so queries over 'sessions' only transfer the summary fields
+REPORT_SUBCOLLECTION = 'details'
+REPORT_DOC_ID = 'report'
+
+def _encode_report(report):
+    return zlib.compress(json.dumps(report, ensure_ascii=False, default=str).encode('utf-8'))
+
+def _decode_report(data):
+    if not data:
+        return None
+    if data.get('encoding') == 'zlib+json':
+        return json.loads(zlib.decompress(data['report_blob']).decode('utf-8'))
+    return data.get('report_json')
+
+def _report_ref(db, session_id):
+    return db.collection('sessions').document(session_id).collection(REPORT_SUBCOLLECTION).document(REPORT_DOC_ID)
+
+PROFILE_COLLECTION = 'competency_profiles'
+
 def save_session(user_id, session_data):
     try:
-        db = firestore.client()
+        db = storage.get_db()
+        session_data = dict(session_data)
+        report = session_data.pop('report_json', None)
+        
         # Add timestamp
-        session_data['created_at'] = firestore.SERVER_TIMESTAMP
-        db.collection('sessions').add(session_data)
+        session_data['created_at'] = storage.SERVER_TIMESTAMP
+        session_data['has_report'] = report is not None
+        
+        # Compact per-marker results so scoring never has to load the report
+        from recommendation_engine import summarize_report, update_profile
+        summary = summarize_report(report)
+        session_data['score_summary'] = summary
+        
+        session_ref = db.collection('sessions').document()
+        profile_ref = db.collection(PROFILE_COLLECTION).document(user_id)
+        
+        # Summary document, report child and competency profile are written atomically
+        @storage.transactional
+        def write(transaction):
+            # All reads happen before the first write
+            profile = None
+            if summary['competency_ids']:
+                profile_snapshot = profile_ref.get(transaction=transaction)
+                if profile_snapshot.exists:
+                    profile = update_profile(profile_snapshot.to_dict(), summary)
+                else:
+                    # First scored session: build from the history read in this transaction, plus this session
+                    profile = _build_profile(db, user_id, transaction, extra=[(datetime.now(timezone.utc), summary)])
+            
+            transaction.set(session_ref, session_data)
+            if report is not None:
+                transaction.set(_report_ref(db, session_ref.id), {
+                    'encoding': 'zlib+json',
+                    'report_blob': _encode_report(report)
+                })
+            if profile is not None:
+                profile['user_id'] = user_id
+                transaction.set(profile_ref, dict(profile, updated_at=storage.SERVER_TIMESTAMP))
+        
+        write(db.transaction())
         return True
     except Exception as e:
         print(f"Error saving session: {e}")
         return False
 
+def load_session_reports(session_docs, db=None, transaction=None):
+    """
+    Fetch full reports for several sessions in one round trip.
+    
+    Args:
+        session_docs: Iterable of (session_id, session_data) pairs
+    
+    Returns:
+        dict: session_id -> report (sessions saved before the split keep their inline report_json)
+    """
+    db = db or storage.get_db()
+    reports = {}
+    refs = []
+    for session_id, data in session_docs:
+        if data.get('has_report'):
+            refs.append(_report_ref(db, session_id))
+        elif data.get('report_json') is not None:
+            reports[session_id] = data['report_json']
+    
+    if refs:
+        for doc in db.get_all(refs, transaction=transaction):
+            if doc.exists:
+                reports[doc.reference.parent.parent.id] = _decode_report(doc.to_dict())
+    return reports
+
+def migrate_inline_reports(batch_size=200):
+    """
+    One-off migration: move report_json out of session documents saved before the split.
+    
+    Returns:
+        Number of sessions migrated
+    """
+    try:
+        db = storage.get_db()
+        sessions_ref = db.collection('sessions')
+        
+        # Cheap projection to find legacy documents (they have no 'has_report' flag)
+        legacy_ids = [doc.id for doc in sessions_ref.select(['has_report']).stream()
+                      if 'has_report' not in (doc.to_dict() or {})]
+        
+        migrated = 0
+        for i in range(0, len(legacy_ids), batch_size):
+            batch = db.batch()
+            refs = [sessions_ref.document(session_id) for session_id in legacy_ids[i:i + batch_size]]
+            for doc in db.get_all(refs):
+                if not doc.exists:
+                    continue
+                report = doc.to_dict().get('report_json')
+                if report is not None:
+                    batch.set(_report_ref(db, doc.id), {
+                        'encoding': 'zlib+json',
+                        'report_blob': _encode_report(report)
+                    })
+                batch.update(doc.reference, {
+                    'report_json': storage.DELETE_FIELD,
+                    'has_report': report is not None
+                })
+                migrated += 1
+            batch.commit()
+        return migrated
+    except Exception as e:
+        print(f"Error migrating session reports: {e}")
+        return 0
+
+# Collections whose documents carry the owner's user_id (saved under the email address before uids)
+USER_KEYED_COLLECTIONS = ('sessions', 'arcade_results')
+
+def rekey_user_records(email, user_id, batch_size=200):
+    """
+    One-off migration for one user: re-key sessions and arcade results saved under the email
+    address to the user's uid. A competency profile built without them is dropped, so the next
+    request rebuilds it from the whole history.
+    
+    Returns:
+        Number of documents re-keyed
+    """
+    try:
+        db = storage.get_db()
+        refs = [doc.reference for name in USER_KEYED_COLLECTIONS
+                for doc in db.collection(name).where('user_id', '==', email).select(['user_id']).stream()]
+        for i in range(0, len(refs), batch_size):
+            batch = db.batch()
+            for ref in refs[i:i + batch_size]:
+                batch.update(ref, {'user_id': user_id})
+            batch.commit()
+        if refs:
+            db.collection(PROFILE_COLLECTION).document(user_id).delete()
+        return len(refs)
+    except Exception as e:
+        print(f"Error re-keying records of {email}: {e}")
+        return 0
+
+def migrate_email_user_ids(batch_size=200):
+    """
+    One-off migration: re-key every session and arcade result still saved under an email address,
+    mapping it to the uid via the users collection (or Firebase Auth).
+    
+    Returns:
+        Number of documents re-keyed
+    """
+    try:
+        db = storage.get_db()
+        emails = {(doc.to_dict() or {}).get('user_id') for name in USER_KEYED_COLLECTIONS
+                  for doc in db.collection(name).select(['user_id']).stream()}
+        migrated = 0
+        for email in sorted(e for e in emails if isinstance(e, str) and '@' in e):
+            user_id = resolve_user_id(email)
+            if user_id:
+                migrated += rekey_user_records(email, user_id, batch_size)
+            else:
+                print(f"Skipping records of {email}: no user id found")
+        return migrated
+    except Exception as e:
+        print(f"Error migrating user ids: {e}")
+        return 0
+
+SCORE_HISTORY_FIELDS = ['created_at', 'has_report', 'score_summary']
+
+def _read_score_history(db, user_id, transaction=None, batch_size=200):
+    """
+    (created_at, score_summary) pairs for the user's whole history, read inside transaction if given.
+    Sessions saved before summaries existed are summarized from their reports.
+    
+    Returns:
+        (history, backfilled) where backfilled maps session_id -> summary computed from its report
+    """
+    from recommendation_engine import summarize_report
+    
+    sessions_ref = db.collection('sessions')
+    docs = sessions_ref.where('user_id', '==', user_id).select(SCORE_HISTORY_FIELDS).stream(transaction=transaction)
+    history = []
+    missing_ids = []
+    for doc in docs:
+        data = doc.to_dict() or {}
+        if 'score_summary' in data:
+            history.append((data.get('created_at'), data['score_summary']))
+        else:
+            missing_ids.append(doc.id)
+    
+    # Full documents for the rest (legacy inline reports are not in the projection)
+    backfilled = {}
+    for i in range(0, len(missing_ids), batch_size):
+        refs = [sessions_ref.document(session_id) for session_id in missing_ids[i:i + batch_size]]
+        full_docs = [(doc.id, doc.to_dict()) for doc in db.get_all(refs, transaction=transaction) if doc.exists]
+        reports = load_session_reports(full_docs, db, transaction=transaction)
+        for session_id, data in full_docs:
+            summary = summarize_report(reports.get(session_id))
+            history.append((data.get('created_at'), summary))
+            backfilled[session_id] = summary
+    return history, backfilled
+
+def get_user_score_history(user_id, batch_size=200):
+    """
+    Per-session score summaries for the user's whole history.
+    Summaries computed from legacy reports are written back so later calls only read the projection.
+    
+    Returns:
+        list of (created_at, score_summary) pairs, or None on error
+    """
+    try:
+        db = storage.get_db()
+        history, backfilled = _read_score_history(db, user_id, batch_size=batch_size)
+        
+        sessions_ref = db.collection('sessions')
+        items = list(backfilled.items())
+        for i in range(0, len(items), batch_size):
+            batch = db.batch()
+            for session_id, summary in items[i:i + batch_size]:
+                batch.update(sessions_ref.document(session_id), {'score_summary': summary})
+            batch.commit()
+        
+        return history
+    except Exception as e:
+        print(f"Error getting score history: {e}")
+        return None
+
+def _build_profile(db, user_id, transaction, extra=()):
+    """
+    Competency profile from the user's whole history, read inside transaction.
+    Building and writing in one transaction means a concurrent save_session either sees the
+    new profile or is retried - its session can't be left out.
+    """
+    from recommendation_engine import build_profile
+    history, _ = _read_score_history(db, user_id, transaction)
+    return build_profile(history + list(extra))
+
+def get_competency_profile(user_id):
+    """
+    The user's competency profile document (kept current by save_session).
+    Built from the whole session history the first time it is requested.
+    
+    Returns:
+        dict or None on error
+    """
+    try:
+        db = storage.get_db()
+        profile_ref = db.collection(PROFILE_COLLECTION).document(user_id)
+        snapshot = profile_ref.get()
+        if snapshot.exists:
+            return snapshot.to_dict()
+        
+        @storage.transactional
+        def build(transaction):
+            snapshot = profile_ref.get(transaction=transaction)
+            if snapshot.exists:
+                return snapshot.to_dict()  # built by a concurrent request or save
+            profile = _build_profile(db, user_id, transaction)
+            profile['user_id'] = user_id
+            transaction.set(profile_ref, dict(profile, updated_at=storage.SERVER_TIMESTAMP))
+            return profile
+        
+        return build(db.transaction())
+    except Exception as e:
+        print(f"Error getting competency profile: {e}")
+        return None
+
 def get_user_history(user_id):
     try:
-        db = firestore.client()
-        docs = db.collection('sessions').where('user_id', '==', user_id).order_by('created_at', direction=firestore.Query.DESCENDING).stream()
-        return [doc.to_dict() for doc in docs]
+        db = storage.get_db()
+        docs = db.collection('sessions').where('user_id', '==', user_id).order_by('created_at', direction=storage.DESCENDING).stream()
+        sessions = [(doc.id, doc.to_dict()) for doc in docs]
+        reports = load_session_reports(sessions, db)
+        for session_id, data in sessions:
+            if session_id in reports:
+                data['report_json'] = reports[session_id]
+        return [data for _, data in sessions]
     except Exception as e:
         print(f"Error getting history: {e}")
         return []
 
+# Lightweight fields shown in history lists (report_json is fetched separately on demand)
+HISTORY_SUMMARY_FIELDS = ['user_id', 'session_type', 'score', 'duration', 'date', 'compliance_percentage', 'created_at']
+
+def get_user_history_page(user_id, page_size=10, start_after=None):
+    """
+    Fetch one page of a user's session history as summary rows (newest first).
+    
+    Args:
+        user_id: User email
+        page_size: Sessions per page
+        start_after: Cursor returned by the previous page (None for the first page)
+    
+    Returns:
+        dict: {'sessions': [summary dicts with 'id'], 'next_cursor': cursor or None}
+    """
+    try:
+        db = storage.get_db()
+        query = db.collection('sessions')\
+                  .where('user_id', '==', user_id)\
+                  .order_by('created_at', direction=storage.DESCENDING)\
+                  .select(HISTORY_SUMMARY_FIELDS)\
+                  .limit(page_size)
+        if start_after is not None:
+            query = query.start_after(start_after)
+        
+        docs = list(query.stream())
+        sessions = []
+        for doc in docs:
+            row = doc.to_dict()
+            row['id'] = doc.id
+            sessions.append(row)
+        
+        # The last snapshot carries the created_at value the next page continues from
+        next_cursor = docs[-1] if len(docs) == page_size else None
+        return {'sessions': sessions, 'next_cursor': next_cursor}
+    except Exception as e:
+        print(f"Error getting history page: {e}")
+        return {'sessions': [], 'next_cursor': None}
+
+def get_session_report(session_id):
+    """
+    Fetch the full report of a single session (loaded lazily when a history row is opened).
+    """
+    try:
+        db = storage.get_db()
+        report_doc = _report_ref(db, session_id).get()
+        if report_doc.exists:
+            return _decode_report(report_doc.to_dict())
+        
+        # Sessions saved before reports moved to the child document
+        doc = db.collection('sessions').document(session_id).get(field_paths=['report_json'])
+        if doc.exists:
+            return (doc.to_dict() or {}).get('report_json')
+        return None
+    except Exception as e:
+        print(f"Error getting session report: {e}")
+        return None
+
 def save_arcade_result(user_id, score, level, details):
     """
     Save Arcade Mode game results to Firestore.
     """
     try:
-        db = firestore.client()
+        db = storage.get_db()
         data = {
             'user_id': user_id,
             'score': score,
             'level': level,
             'details': details,
             'type': 'arcade',
-            'created_at': firestore.SERVER_TIMESTAMP
+            'created_at': storage.SERVER_TIMESTAMP
         }
         db.collection('arcade_results').add(data)
         return True
@@ -168,11 +550,11 @@ def get_user_stats(user_id):
     Aggregate user statistics for the profile page.
     """
     try:
-        db = firestore.client()
+        db = storage.get_db()
         
-        # 1. Fetch Training Sessions
+        # 1. Fetch Training Sessions (only the fields the stats need - no report payloads)
         sessions_ref = db.collection('sessions').where('user_id', '==', user_id)
-        sessions = [doc.to_dict() for doc in sessions_ref.stream()]
+        sessions = [doc.to_dict() for doc in sessions_ref.select(['compliance_percentage']).stream()]
         
         # 2. Fetch Arcade Results
         arcade_ref = db.collection('arcade_results').where('user_id', '==', user_id)
@@ -206,8 +588,7 @@ def get_user_stats(user_id):
             'avg_score': round(avg_score, 1),
             'arcade_games': total_arcade_games,
             'arcade_points': total_arcade_points,
-            'rank_key': rank_key,
-            'recent_sessions': sorted(sessions, key=lambda x: x.get('created_at', ''), reverse=True)[:5]
+            'rank_key': rank_key
         }
         
     except Exception as e:
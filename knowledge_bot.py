@@ -1,6 +1,8 @@
 import google.generativeai as genai
 import json
 import os
+from tutor_cache import get_tutor_cache
+from reference_data import get_reference_data
 
 class KnowledgeEngine:
     def __init__(self, api_key):
@@ -13,7 +15,7 @@ class KnowledgeEngine:
         
     def _load_context(self):
         """
-        Load ICF Competencies, Markers, and GROW model data into memory.
+        Collect ICF Competencies, Markers, and GROW model data (shared reference data, parsed once).
         """
         context = {
             "competencies": [],
@@ -21,24 +23,12 @@ class KnowledgeEngine:
             "grow_model": {}
         }
         
-        # Load Competencies (2025)
         try:
-            if os.path.exists('icf_core_competencies_2025.json'):
-                with open('icf_core_competencies_2025.json', 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    context["competencies"] = data.get('competencies', [])
+            reference = get_reference_data()
+            context["competencies"] = reference.core_competencies.get('competencies', [])
+            context["markers"] = reference.markers.get('competencies', [])
         except Exception as e:
-            print(f"Error loading competencies: {e}")
-            
-        # Load Markers
-        try:
-            if os.path.exists('markers.json'):
-                with open('markers.json', 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Flatten markers for easier search if needed, or keep structure
-                    context["markers"] = data.get('competencies', [])
-        except Exception as e:
-            print(f"Error loading markers: {e}")
+            print(f"Error loading reference data: {e}")
             
         # Define GROW Model Context
         context["grow_model"] = {
@@ -50,12 +40,28 @@ class KnowledgeEngine:
         
         return context
 
-    def ask_tutor(self, query, language="English"):
+    def ask_tutor(self, query, language="English", use_cache=True, conversation=None):
         """
         Ask the AI Tutor a question. Enforces strict topic guardrails.
+        Repeated (or near-duplicate) questions are answered from the shared answer cache.
+        
+        Args:
+            conversation: Optional RollingHistory for multi-turn chats. Its bounded window and
+                summary are sent as context, and the new question/answer are appended to it.
         """
         if not self.api_key:
             return "Error: API Key missing."
+        
+        # Follow-up questions depend on earlier turns, so only standalone questions use the cache
+        is_follow_up = conversation is not None and conversation.has_turns()
+        use_cache = use_cache and not is_follow_up
+        
+        cache = get_tutor_cache()
+        if use_cache:
+            cached_answer = cache.get(query, language)
+            if cached_answer is not None:
+                self._remember_turn(conversation, query, cached_answer)
+                return cached_answer
             
         lang_instruction = "Answer in Arabic." if language == "العربية" else "Answer in English."
         
@@ -64,6 +70,13 @@ class KnowledgeEngine:
         markers_text = json.dumps(self.context_data['markers'], ensure_ascii=False)
         grow_text = json.dumps(self.context_data['grow_model'], ensure_ascii=False)
         
+        conversation_context = ""
+        if is_follow_up:
+            conversation_context = f"""
+        CONVERSATION SO FAR (use it to resolve follow-up questions):
+        {conversation.render()}
+        """
+        
         prompt = f"""
         You are an EXPERT ICF MENTOR COACH and AI TUTOR.
         
@@ -85,7 +98,7 @@ class KnowledgeEngine:
         - CITE SPECIFIC MARKERS or COMPETENCIES where relevant (e.g., "This relates to Marker 5.2...").
         - Use bullet points for readability.
         - Keep answers concise but complete.
-        
+        {conversation_context}
         USER QUESTION: "{query}"
         
         {lang_instruction}
@@ -93,6 +106,16 @@ class KnowledgeEngine:
         
         try:
             response = self.model.generate_content(prompt)
-            return response.text
+            answer = response.text
+            if use_cache:
+                cache.put(query, answer, language)
+            self._remember_turn(conversation, query, answer)
+            return answer
         except Exception as e:
             return f"Error: {str(e)}"
+
+    def _remember_turn(self, conversation, query, answer):
+        """Append a question/answer pair to the conversation memory (if any)"""
+        if conversation is not None:
+            conversation.add("user", query)
+            conversation.add("assistant", answer)
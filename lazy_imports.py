@@ -0,0 +1,156 @@
+"""
+Lazy Imports - Load heavy third-party modules the first time a page actually uses them
+Modules are imported once per process (never reloaded) and the time of each first import is
+recorded, so slow dependencies show up in get_import_times() and the startup profile.
+
+Usage:
+    python lazy_imports.py              # import-time profile of the app's startup imports
+    python lazy_imports.py --top 40 pandas plotly.express
+"""
+import argparse
+import importlib
+import subprocess
+import sys
+import threading
+import time
+
+# Heavy dependencies, keyed by the name the app uses for them
+HEAVY_MODULES = {
+    'pd': 'pandas',
+    'px': 'plotly.express',
+    'go': 'plotly.graph_objects',
+    'PyPDF2': 'PyPDF2',
+    'docx': 'docx',
+    'striprtf': 'striprtf.striprtf',
+    'genai': 'google.generativeai',
+    'reportlab': 'reportlab'
+}
+
+# Modules app.py imports before the first page renders
+STARTUP_MODULES = [
+    'streamlit',
+    'translations',
+    'marker_helpers',
+    'user_dashboard',
+    'admin_middleware',
+    'auth_handler',
+    'firebase_config'
+]
+
+_import_times = {}  # module name -> seconds taken by the first import
+_import_lock = threading.Lock()
+
+
+def load(name):
+    """
+    Import a registered (or any) module once and return it.
+
+    Args:
+        name: Registry alias ('pd', 'px', ...) or a full module name
+    """
+    module_name = HEAVY_MODULES.get(name, name)
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    with _import_lock:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        _import_times.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = load(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {HEAVY_MODULES.get(self._name, self._name)} ({state})>"
+
+
+def lazy(name):
+    """Module proxy for a registry alias or module name; nothing is imported until it is used"""
+    return LazyModule(name)
+
+
+def get_import_times():
+    """First-import durations (seconds) of modules loaded through the registry, slowest first"""
+    return dict(sorted(_import_times.items(), key=lambda item: item[1], reverse=True))
+
+
+def profile_imports(modules=None, top=25):
+    """
+    Measure a cold import of the given modules in a fresh interpreter (python -X importtime).
+
+    Returns:
+        dict: {'total_ms', 'modules': [{'name', 'cumulative_ms', 'self_ms'}, ...]} or {'error'}
+    """
+    modules = modules or STARTUP_MODULES
+    code = "\n".join(f"import {name}" for name in modules)
+    try:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, timeout=300
+        )
+    except Exception as e:
+        return {"error": str(e)}
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"}
+
+    entries = []
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        entries.append({
+            'name': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_ms': int(parts[0]) / 1000,
+            'cumulative_ms': int(parts[1]) / 1000
+        })
+
+    top_level = [e for e in entries if e['depth'] == 0]
+    total_ms = sum(e['cumulative_ms'] for e in top_level)
+    slowest = sorted(top_level, key=lambda e: e['cumulative_ms'], reverse=True)[:top]
+    return {
+        'total_ms': round(total_ms, 1),
+        'modules': [
+            {'name': e['name'], 'cumulative_ms': round(e['cumulative_ms'], 1), 'self_ms': round(e['self_ms'], 1)}
+            for e in slowest
+        ]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time profile of the app's startup modules")
+    parser.add_argument('modules', nargs='*', help="Modules to profile (default: app startup imports)")
+    parser.add_argument('--top', type=int, default=25, help="Number of slowest top-level imports to list")
+    args = parser.parse_args(argv)
+
+    report = profile_imports(args.modules or None, top=args.top)
+    if 'error' in report:
+        print(f"Error profiling imports: {report['error']}")
+        return 1
+
+    print(f"Cold import total: {report['total_ms']:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>10}  module")
+    for entry in report['modules']:
+        print(f"{entry['cumulative_ms']:>14.1f} {entry['self_ms']:>10.1f}  {entry['name']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,8 +2,8 @@ import streamlit as st
 import json
 import os
 from knowledge_bot import KnowledgeEngine
-from icf_data_arabic import COMPETENCIES_AR
-from grow_model_data import GROW_MODEL_EN, GROW_MODEL_AR
+from conversation_memory import RollingHistory
+from reference_data import get_reference_data
 
 def show(api_key, language="English"):
     """
@@ -74,7 +74,7 @@ def show(api_key, language="English"):
         
         # Load Competencies
         if language == "العربية":
-            comps = COMPETENCIES_AR
+            comps = get_reference_data().competencies_ar
         else:
             comps = st.session_state.knowledge_engine.context_data.get('competencies', [])
         
@@ -146,7 +146,7 @@ def show(api_key, language="English"):
         
         # Load Markers
         if language == "العربية":
-            markers_data = COMPETENCIES_AR # Structure matches
+            markers_data = get_reference_data().competencies_ar # Structure matches
         else:
             markers_data = st.session_state.knowledge_engine.context_data.get('markers', [])
         
@@ -223,7 +223,7 @@ def show(api_key, language="English"):
         st.write(txt['grow_desc'])
         
         # Select Data based on Language
-        grow_data = GROW_MODEL_AR if language == "العربية" else GROW_MODEL_EN
+        grow_data = get_reference_data().grow_model["العربية" if language == "العربية" else "English"]
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -261,6 +261,9 @@ def show(api_key, language="English"):
         # Chat History
         if "tutor_messages" not in st.session_state:
             st.session_state.tutor_messages = []
+        if "tutor_conversation" not in st.session_state:
+            # Bounded context for follow-ups: recent turns verbatim + summary of older ones
+            st.session_state.tutor_conversation = RollingHistory(max_recent_turns=6)
             
         # Display Chat
         for msg in st.session_state.tutor_messages:
@@ -279,11 +282,16 @@ def show(api_key, language="English"):
             # Generate Answer
             with st.chat_message("assistant"):
                 with st.spinner("Thinking..."):
-                    response = st.session_state.knowledge_engine.ask_tutor(prompt, language)
+                    response = st.session_state.knowledge_engine.ask_tutor(
+                        prompt,
+                        language,
+                        conversation=st.session_state.tutor_conversation
+                    )
                     st.write(response)
                     st.session_state.tutor_messages.append({"role": "assistant", "content": response})
                     
         # Clear Chat
         if st.button(txt['clear_chat']):
             st.session_state.tutor_messages = []
+            st.session_state.tutor_conversation.reset()
             st.rerun()
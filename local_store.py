@@ -0,0 +1,501 @@
+"""
+Local Store - In-process document database with the subset of the Firestore client API the app uses
+Collections, documents and subcollections live in memory; with a file path every write is also
+persisted to SQLite and the file is reloaded on start. Queries (where / order_by / limit / select /
+start_after) run in Python over the cached documents, which is plenty for load tests, benchmarks
+and small on-prem installs.
+
+Supported:
+    db.collection(name).document(id=None).collection(name)...
+    ref.get(field_paths=None, transaction=None), ref.set(data, merge=False), ref.update(data), ref.delete()
+    collection.add(data), collection.where(field, op, value).order_by(field, direction)
+              .limit(n).select(fields).start_after(snapshot_or_dict).stream() / .get()
+    db.get_all(refs), db.batch(), db.transaction() with @transactional
+    SERVER_TIMESTAMP, DELETE_FIELD and Increment(n) in set/update, dotted field paths in update
+"""
+import base64
+import copy
+import functools
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+
+ASCENDING = 'ASCENDING'
+DESCENDING = 'DESCENDING'
+
+
+class _Sentinel:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+SERVER_TIMESTAMP = _Sentinel('SERVER_TIMESTAMP')
+DELETE_FIELD = _Sentinel('DELETE_FIELD')
+
+
+class Increment:
+    """Add value to the stored number (a missing field counts as 0)"""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class NotFound(Exception):
+    pass
+
+
+_MISSING = object()
+
+
+# --- Field paths and write transforms ---
+
+def _get_field(data, path):
+    value = data
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set_field(data, parts, value):
+    for part in parts[:-1]:
+        child = data.get(part)
+        if not isinstance(child, dict):
+            child = data[part] = {}
+        data = child
+    data[parts[-1]] = value
+
+
+def _delete_field(data, parts):
+    for part in parts[:-1]:
+        data = data.get(part)
+        if not isinstance(data, dict):
+            return
+    data.pop(parts[-1], None)
+
+
+def _apply(target, parts, value, now):
+    """Write one value (or transform) at a field path"""
+    if value is SERVER_TIMESTAMP:
+        _set_field(target, parts, now)
+    elif value is DELETE_FIELD:
+        _delete_field(target, parts)
+    elif isinstance(value, Increment):
+        current = _get_field(target, '.'.join(parts))
+        base = current if isinstance(current, (int, float)) and not isinstance(current, bool) else 0
+        _set_field(target, parts, base + value.value)
+    elif isinstance(value, dict):
+        child = {}
+        _set_field(target, parts, child)
+        for key, item in value.items():
+            _apply(child, [key], item, now)
+    else:
+        _set_field(target, parts, copy.deepcopy(value))
+
+
+def _merge(target, data, now):
+    """set(merge=True): nested maps are merged key by key"""
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value, now)
+        else:
+            _apply(target, [key], value, now)
+
+
+def _project(data, field_paths):
+    projected = {}
+    for path in field_paths:
+        value = _get_field(data, path)
+        if value is not _MISSING:
+            _set_field(projected, path.split('.'), copy.deepcopy(value))
+    return projected
+
+
+# --- Value ordering (Firestore orders by type first, then by value) ---
+
+def _sort_key(value):
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (3, value if value.tzinfo else value.replace(tzinfo=timezone.utc))
+    if isinstance(value, str):
+        return (4, value)
+    if isinstance(value, bytes):
+        return (5, value)
+    if isinstance(value, (list, tuple)):
+        return (6, tuple(_sort_key(item) for item in value))
+    return (7, json.dumps(value, sort_keys=True, default=str))
+
+
+def _matches(value, op, expected):
+    if value is _MISSING:
+        return False
+    if op == '==':
+        return _sort_key(value) == _sort_key(expected)
+    if op == '!=':
+        return _sort_key(value) != _sort_key(expected)
+    if op == 'in':
+        return any(_sort_key(value) == _sort_key(item) for item in expected)
+    if op == 'not-in':
+        return all(_sort_key(value) != _sort_key(item) for item in expected)
+    if op == 'array_contains':
+        return isinstance(value, list) and any(_sort_key(item) == _sort_key(expected) for item in value)
+    if op == 'array_contains_any':
+        return isinstance(value, list) and any(_sort_key(item) == _sort_key(e) for item in value for e in expected)
+
+    # Range comparisons only match values of the same type
+    key, expected_key = _sort_key(value), _sort_key(expected)
+    if key[0] != expected_key[0]:
+        return False
+    if op == '<':
+        return key < expected_key
+    if op == '<=':
+        return key <= expected_key
+    if op == '>':
+        return key > expected_key
+    if op == '>=':
+        return key >= expected_key
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+# --- Snapshots and references ---
+
+class DocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self._data = data
+
+    @property
+    def id(self):
+        return self.reference.id
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path):
+        value = _get_field(self._data or {}, field_path)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+
+class DocumentReference:
+    def __init__(self, store, path):
+        self._store = store
+        self.path = path  # 'sessions/abc' or 'sessions/abc/details/report'
+
+    @property
+    def id(self):
+        return self.path.rsplit('/', 1)[-1]
+
+    @property
+    def parent(self):
+        return CollectionReference(self._store, self.path.rsplit('/', 1)[0])
+
+    def collection(self, name):
+        return CollectionReference(self._store, f"{self.path}/{name}")
+
+    def get(self, field_paths=None, transaction=None):
+        data = self._store._read(self.path)
+        if data is not None and field_paths is not None:
+            data = _project(data, field_paths)
+        return DocumentSnapshot(self, copy.deepcopy(data))
+
+    def set(self, document_data, merge=False):
+        self._store._commit([('set', self.path, document_data, merge)])
+
+    def update(self, field_updates):
+        self._store._commit([('update', self.path, field_updates, False)])
+
+    def delete(self):
+        self._store._commit([('delete', self.path, None, False)])
+
+    def __eq__(self, other):
+        return isinstance(other, DocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+
+class Query:
+    def __init__(self, store, path, filters=(), orders=(), limit=None, fields=None, cursor=None):
+        self._store = store
+        self._path = path
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._limit = limit
+        self._fields = fields
+        self._cursor = cursor
+
+    def _copy(self, **changes):
+        state = dict(filters=self._filters, orders=self._orders, limit=self._limit,
+                     fields=self._fields, cursor=self._cursor)
+        state.update(changes)
+        return Query(self._store, self._path, **state)
+
+    def where(self, field_path, op_string, value):
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path, direction=ASCENDING):
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def select(self, field_paths):
+        return self._copy(fields=list(field_paths))
+
+    def start_after(self, document_fields_or_snapshot):
+        return self._copy(cursor=document_fields_or_snapshot)
+
+    def _effective_orders(self):
+        """Explicit orders, else the inequality field, then the document id (like Firestore)"""
+        orders = list(self._orders)
+        if not orders:
+            for field_path, op, _ in self._filters:
+                if op in ('<', '<=', '>', '>=', '!=', 'not-in'):
+                    orders.append((field_path, ASCENDING))
+                    break
+        last_direction = orders[-1][1] if orders else ASCENDING
+        orders.append(('__name__', last_direction))
+        return orders
+
+    def _order_values(self, doc_id, data, orders):
+        return [doc_id if field_path == '__name__' else _get_field(data, field_path) for field_path, _ in orders]
+
+    def _compare(self, left, right, orders):
+        for a, b, (_, direction) in zip(left, right, orders):
+            key_a, key_b = _sort_key(a), _sort_key(b)
+            if key_a != key_b:
+                result = -1 if key_a < key_b else 1
+                return -result if direction == DESCENDING else result
+        return 0
+
+    def stream(self, transaction=None):
+        orders = self._effective_orders()
+        rows = []
+        for doc_id, data in self._store._documents(self._path):
+            if not all(_matches(_get_field(data, f), op, v) for f, op, v in self._filters):
+                continue
+            values = self._order_values(doc_id, data, orders)
+            if any(value is _MISSING for value in values):
+                continue  # Firestore leaves out documents without the ordered field
+            rows.append((values, doc_id, data))
+
+        rows.sort(key=functools.cmp_to_key(lambda a, b: self._compare(a[0], b[0], orders)))
+
+        if self._cursor is not None:
+            if isinstance(self._cursor, DocumentSnapshot):
+                cursor = self._order_values(self._cursor.id, self._cursor._data or {}, orders)
+            else:
+                cursor = [_get_field(self._cursor, field_path) for field_path, _ in orders[:-1]]
+            rows = [row for row in rows if self._compare(row[0][:len(cursor)], cursor, orders) > 0]
+
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        for _, doc_id, data in rows:
+            if self._fields is not None:
+                data = _project(data, self._fields)
+            yield DocumentSnapshot(DocumentReference(self._store, f"{self._path}/{doc_id}"), copy.deepcopy(data))
+
+    def get(self, transaction=None):
+        return list(self.stream(transaction))
+
+
+class CollectionReference(Query):
+    def __init__(self, store, path):
+        super().__init__(store, path)
+
+    @property
+    def id(self):
+        return self._path.rsplit('/', 1)[-1]
+
+    @property
+    def parent(self):
+        if '/' not in self._path:
+            return None
+        return DocumentReference(self._store, self._path.rsplit('/', 1)[0])
+
+    def document(self, document_id=None):
+        return DocumentReference(self._store, f"{self._path}/{document_id or uuid.uuid4().hex[:20]}")
+
+    def add(self, document_data, document_id=None):
+        ref = self.document(document_id)
+        ref.set(document_data)
+        return datetime.now(timezone.utc), ref
+
+    def list_documents(self):
+        return [DocumentReference(self._store, f"{self._path}/{doc_id}") for doc_id, _ in self._store._documents(self._path)]
+
+
+# --- Batched writes and transactions ---
+
+class WriteBatch:
+    def __init__(self, store):
+        self._store = store
+        self._writes = []
+
+    def set(self, reference, document_data, merge=False):
+        self._writes.append(('set', reference.path, document_data, merge))
+
+    def update(self, reference, field_updates):
+        self._writes.append(('update', reference.path, field_updates, False))
+
+    def delete(self, reference):
+        self._writes.append(('delete', reference.path, None, False))
+
+    def commit(self):
+        writes, self._writes = self._writes, []
+        self._store._commit(writes)
+        return []
+
+
+class Transaction(WriteBatch):
+    """Writes are buffered and committed together; the store is locked while the function runs"""
+
+
+def transactional(to_wrap):
+    """Local counterpart of firestore.transactional: runs to_wrap(transaction, ...) atomically"""
+    def wrapper(transaction, *args, **kwargs):
+        with transaction._store._lock:
+            result = to_wrap(transaction, *args, **kwargs)
+            transaction.commit()
+        return result
+    return wrapper
+
+
+# --- Persistence ---
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, bytes):
+        return {'$bytes': base64.b64encode(value).decode('ascii')}
+    raise TypeError(f"Cannot store value of type {type(value).__name__}")
+
+
+def _decode(obj):
+    if len(obj) == 1:
+        if '$datetime' in obj:
+            return datetime.fromisoformat(obj['$datetime'])
+        if '$bytes' in obj:
+            return base64.b64decode(obj['$bytes'])
+    return obj
+
+
+class LocalStore:
+    """
+    Firestore-compatible client backed by memory and (optionally) SQLite.
+
+    Args:
+        path: SQLite file; None keeps everything in memory for the lifetime of the process
+    """
+
+    def __init__(self, path=None):
+        self._lock = threading.RLock()
+        self._collections = {}  # collection path -> {document id: data}
+        self._conn = None
+        self.path = path
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents (path TEXT PRIMARY KEY, collection TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            for doc_path, collection, data in self._conn.execute("SELECT path, collection, data FROM documents"):
+                doc_id = doc_path.rsplit('/', 1)[-1]
+                self._collections.setdefault(collection, {})[doc_id] = json.loads(data, object_hook=_decode)
+
+    def collection(self, collection_path):
+        return CollectionReference(self, collection_path)
+
+    def document(self, document_path):
+        return DocumentReference(self, document_path)
+
+    def get_all(self, references, field_paths=None, transaction=None):
+        for reference in references:
+            yield reference.get(field_paths=field_paths)
+
+    def batch(self):
+        return WriteBatch(self)
+
+    def transaction(self, **kwargs):
+        return Transaction(self)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _read(self, doc_path):
+        collection, doc_id = doc_path.rsplit('/', 1)
+        with self._lock:
+            return self._collections.get(collection, {}).get(doc_id)
+
+    def _documents(self, collection_path):
+        with self._lock:
+            return list(self._collections.get(collection_path, {}).items())
+
+    def _commit(self, writes):
+        """Apply (kind, path, data, merge) writes atomically"""
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            staged = {}  # doc path -> new data (None = deleted)
+            for kind, doc_path, data, merge in writes:
+                current = staged[doc_path] if doc_path in staged else self._read(doc_path)
+                if kind == 'delete':
+                    staged[doc_path] = None
+                    continue
+                if kind == 'update':
+                    if current is None:
+                        raise NotFound(f"No document to update: {doc_path}")
+                    updated = copy.deepcopy(current)
+                    for field_path, value in data.items():
+                        _apply(updated, field_path.split('.'), value, now)
+                elif merge and current is not None:
+                    updated = copy.deepcopy(current)
+                    _merge(updated, data, now)
+                else:
+                    updated = {}
+                    _merge(updated, data, now)
+                staged[doc_path] = updated
+
+            rows = []
+            for doc_path, data in staged.items():
+                collection, doc_id = doc_path.rsplit('/', 1)
+                if data is None:
+                    self._collections.get(collection, {}).pop(doc_id, None)
+                else:
+                    self._collections.setdefault(collection, {})[doc_id] = data
+                rows.append((doc_path, collection, data))
+            self._persist(rows)
+
+    def _persist(self, rows):
+        if self._conn is None:
+            return
+        with self._conn:
+            for doc_path, collection, data in rows:
+                if data is None:
+                    self._conn.execute("DELETE FROM documents WHERE path = ?", (doc_path,))
+                else:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO documents (path, collection, data) VALUES (?, ?, ?)",
+                        (doc_path, collection, json.dumps(data, default=_encode, ensure_ascii=False))
+                    )
@@ -11,91 +11,443 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.graphics.shapes import Drawing, Polygon, Line, String
 import arabic_reshaper
 from bidi.algorithm import get_display
 import os
+import re
+import json
+import copy
+import math
+import hashlib
+import threading
+from collections import OrderedDict
 from io import BytesIO
 
+ARABIC_LANGUAGE = "العربية"
+ARABIC_FONT_NAME = 'AmiriFont'
+ARABIC_FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Amiri-Regular.ttf")
+
+# Process-level renderer resources: fonts are parsed once and style sets are built once per language
+_resource_lock = threading.Lock()
+_arabic_font = None
+_style_sets = {}
+
+
+def register_fonts():
+    """
+    Register the Arabic-compatible font once per process.
+    
+    Returns:
+        Name of the font to use for Arabic text ('Helvetica' if Amiri is unavailable)
+    """
+    global _arabic_font
+    if _arabic_font is not None:
+        return _arabic_font
+    
+    with _resource_lock:
+        if _arabic_font is None:
+            try:
+                if os.path.exists(ARABIC_FONT_PATH):
+                    pdfmetrics.registerFont(TTFont(ARABIC_FONT_NAME, ARABIC_FONT_PATH))
+                    _arabic_font = ARABIC_FONT_NAME
+                else:
+                    print("WARNING: Amiri font not found. Arabic text may not render correctly.")
+                    _arabic_font = 'Helvetica'
+            except Exception as e:
+                print(f"WARNING: Font loading failed: {e}. Using default font.")
+                _arabic_font = 'Helvetica'
+    return _arabic_font
+
+
+def _build_style_set(language, arabic_font):
+    """Create the full stylesheet (base, custom and table/section styles) for one language"""
+    is_arabic = language == ARABIC_LANGUAGE
+    body_align = TA_RIGHT if is_arabic else TA_LEFT
+    body_font = arabic_font if is_arabic else 'Helvetica'
+    bold_font = arabic_font if is_arabic else 'Helvetica-Bold'
+    
+    styles = getSampleStyleSheet()
+    
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1a237e'),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName=bold_font
+    ))
+    
+    # Header style
+    styles.add(ParagraphStyle(
+        name='CustomHeader',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#283593'),
+        spaceAfter=12,
+        fontName=bold_font
+    ))
+    
+    # Body style
+    styles.add(ParagraphStyle(
+        name='CustomBody',
+        parent=styles['Normal'],
+        fontSize=11,
+        alignment=body_align,
+        fontName=body_font
+    ))
+    body = styles['CustomBody']
+    
+    # Metrics tables (session report / audit report)
+    styles.add(ParagraphStyle('SessionTableHeader', parent=body, fontSize=12, textColor=colors.whitesmoke,
+                              alignment=TA_CENTER, fontName='Helvetica-Bold'))
+    styles.add(ParagraphStyle('SessionTableData', parent=body, fontSize=14, alignment=TA_CENTER,
+                              fontName='Helvetica-Bold'))
+    styles.add(ParagraphStyle('AuditTableHeader', parent=body, fontSize=11, textColor=colors.whitesmoke,
+                              alignment=TA_CENTER, fontName='Helvetica-Bold'))
+    styles.add(ParagraphStyle('AuditTableData', parent=body, fontSize=13, alignment=TA_CENTER,
+                              fontName='Helvetica-Bold'))
+    
+    # Session flow table
+    styles.add(ParagraphStyle('FlowHeader', parent=body, fontSize=11, textColor=colors.whitesmoke,
+                              alignment=body_align, fontName=bold_font))
+    styles.add(ParagraphStyle('FlowData', parent=body, fontSize=11, alignment=body_align, fontName=body_font))
+    
+    # Free text sections
+    styles.add(ParagraphStyle('AssessmentStyle', parent=body, fontSize=11, alignment=body_align,
+                              fontName=body_font, leading=16))
+    styles.add(ParagraphStyle('SectionStyle', parent=body, fontSize=11, alignment=body_align,
+                              fontName=body_font, leading=16, spaceBefore=6, spaceAfter=6))
+    
+    # Recommendations page
+    styles.add(ParagraphStyle('IntroStyle', parent=body, fontSize=12, spaceAfter=20, fontName=bold_font))
+    styles.add(ParagraphStyle('CompHeader', parent=body, fontSize=13, textColor=colors.HexColor('#1a237e'),
+                              fontName=bold_font, spaceAfter=5))
+    return styles
+
+
+def get_style_set(language):
+    """
+    Shared, precomputed stylesheet for a language.
+    The returned stylesheet is shared across renderers and must be treated as read-only.
+    """
+    styles = _style_sets.get(language)
+    if styles is not None:
+        return styles
+    
+    arabic_font = register_fonts()
+    with _resource_lock:
+        if language not in _style_sets:
+            _style_sets[language] = _build_style_set(language, arabic_font)
+        return _style_sets[language]
+
+
+# Arabic shaping cache: reshape + bidi is the dominant cost of Arabic reports.
+# Static labels and reference texts live in an unbounded precomputed table;
+# dynamic strings (AI feedback, evidence quotes) go through a bounded LRU.
+SHAPING_CACHE_SIZE = 2048
+_shaping_lock = threading.Lock()
+_shaped_static = {}
+_shaped_lru = OrderedDict()
+_shaping_stats = {'static_hits': 0, 'lru_hits': 0, 'misses': 0}
+
+# Fixed Arabic headings and labels used by the report layouts
+ARABIC_REPORT_LABELS = (
+    "تقرير جلسة التدريب الكاملة", "جودة تدفق الجلسة", "تقييم نسبة الحديث", "غير متوفر",
+    "الافتتاح", "الاستكشاف", "التعمق", "الاغلاق",
+    "نقاط القوة", "مجالات التحسين", "اللحظات الرئيسية", "التوصيات العملية",
+    "تقرير تدقيق أداء PCC", "النتيجة الإجمالية", "نسبة التحدث", "لحظات الصمت", "الأخلاقيات",
+    "التحليل التفصيلي للجدارات", "المؤشر", "الدليل والوقت", "ملاحظة المدقق",
+    "توصيات التطوير", "إجراء التطوير",
+    "بناءً على تدقيق مستوى PCC، تحتاج العلامات التالية إلى تطوير مركز:",
+    "عمل ممتاز! جميع العلامات ظهرت بمستوى PCC.", "توازن الجدارات"
+)
+
+
+def _shape(text):
+    return get_display(arabic_reshaper.reshape(text))
+
+
+def shape_arabic(text):
+    """Reshape and reorder text for RTL rendering, memoized"""
+    text = str(text)
+    shaped = _shaped_static.get(text)
+    if shaped is not None:
+        _shaping_stats['static_hits'] += 1
+        return shaped
+    
+    with _shaping_lock:
+        shaped = _shaped_lru.get(text)
+        if shaped is not None:
+            _shaped_lru.move_to_end(text)
+            _shaping_stats['lru_hits'] += 1
+            return shaped
+    
+    shaped = _shape(text)
+    with _shaping_lock:
+        _shaping_stats['misses'] += 1
+        _shaped_lru[text] = shaped
+        while len(_shaped_lru) > SHAPING_CACHE_SIZE:
+            _shaped_lru.popitem(last=False)
+    return shaped
+
+
+def _reference_texts():
+    """Competency and marker texts that appear verbatim in Arabic reports"""
+    texts = list(ARABIC_REPORT_LABELS)
+    
+    try:
+        from reference_data import get_reference_data
+        reference = get_reference_data()
+    except Exception as e:
+        print(f"WARNING: Could not load reference data for shaping cache: {e}")
+        return [text for text in texts if text]
+    
+    for comp in reference.competencies_ar:
+        texts.extend([comp.get('name', ''), comp.get('definition', '')])
+        texts.extend(comp.get('key_points', []))
+        texts.extend(comp.get('common_mistakes', []))
+        texts.extend(marker.get('text', '') for marker in comp.get('markers', []))
+    
+    for comp in reference.markers.get('competencies', []):
+        texts.extend([comp.get('name', ''), comp.get('description', '')])
+        texts.extend(marker.get('text', '') for marker in comp.get('markers', []))
+    
+    return [text for text in texts if text]
+
+
+def warm_arabic_cache():
+    """
+    Precompute shaped forms of all static labels and reference texts (idempotent).
+    
+    Returns:
+        Number of entries in the static shaping table
+    """
+    if _shaped_static:
+        return len(_shaped_static)
+    
+    table = {}
+    for text in _reference_texts():
+        if text not in table:
+            table[text] = _shape(text)
+    
+    with _shaping_lock:
+        if not _shaped_static:
+            _shaped_static.update(table)
+    return len(_shaped_static)
+
+
+def get_shaping_stats():
+    """Shaping cache metrics for monitoring"""
+    with _shaping_lock:
+        return {
+            'static_entries': len(_shaped_static),
+            'lru_entries': len(_shaped_lru),
+            **_shaping_stats
+        }
+
+
+# Radar charts are drawn as vector graphics from each result (no shared image file on disk).
+# Cached drawings are templates: callers get their own copy, since a render may wrap or scale it.
+RADAR_CACHE_SIZE = 128
+_radar_lock = threading.Lock()
+_radar_cache = OrderedDict()
+
+
+def competency_scores(competencies):
+    """
+    Per-competency percentage (0-100) for the radar chart, ordered C1..C8.
+    Marker-based competencies use the share of observed markers; the others
+    fall back to their score (0-10) or Pass/Fail status.
+    """
+    scores = []
+    for comp_id, comp_data in competencies.items():
+        markers = comp_data.get('markers') or []
+        if markers:
+            observed = sum(1 for m in markers if str(m.get('status', '')).lower() in ('observed', 'pass'))
+            score = observed / len(markers) * 100
+        elif isinstance(comp_data.get('score'), (int, float)):
+            score = min(max(comp_data['score'] * 10, 0), 100)
+        else:
+            score = 100 if str(comp_data.get('status', '')).lower() == 'pass' else 0
+        scores.append((str(comp_id), round(score, 1)))
+    
+    def order(item):
+        match = re.search(r'\d+', item[0])
+        return (int(match.group()) if match else 99, item[0])
+    return sorted(scores, key=order)
+
+
+def _build_radar_drawing(scores, title, title_font, width, height):
+    drawing = Drawing(width, height)
+    cx, cy = width / 2, (height - 24) / 2
+    radius = min(width, height - 24) / 2 - 24
+    count = len(scores)
+    
+    def point(index, fraction):
+        angle = math.pi / 2 - 2 * math.pi * index / count
+        return cx + radius * fraction * math.cos(angle), cy + radius * fraction * math.sin(angle)
+    
+    # Grid rings (25/50/75/100%) and spokes
+    for level in (0.25, 0.5, 0.75, 1.0):
+        ring = []
+        for i in range(count):
+            ring.extend(point(i, level))
+        drawing.add(Polygon(ring, strokeColor=colors.HexColor('#cfd8dc'), strokeWidth=0.5, fillColor=None))
+    
+    for i, (comp_id, _) in enumerate(scores):
+        x, y = point(i, 1.0)
+        drawing.add(Line(cx, cy, x, y, strokeColor=colors.HexColor('#cfd8dc'), strokeWidth=0.5))
+        lx, ly = point(i, 1.12)
+        drawing.add(String(lx, ly - 3, comp_id, fontName='Helvetica-Bold', fontSize=9,
+                           fillColor=colors.HexColor('#37474f'), textAnchor='middle'))
+    
+    # Score polygon
+    shape = []
+    for i, (_, score) in enumerate(scores):
+        shape.extend(point(i, score / 100))
+    drawing.add(Polygon(shape, strokeColor=colors.HexColor('#06b6d4'), strokeWidth=2,
+                        fillColor=colors.Color(6 / 255, 182 / 255, 212 / 255, alpha=0.2)))
+    
+    drawing.add(String(width / 2, height - 14, title, fontName=title_font, fontSize=12,
+                       fillColor=colors.HexColor('#1a237e'), textAnchor='middle'))
+    return drawing
+
+
+def get_radar_drawing(competencies, language="English", width=5 * inch, height=4 * inch):
+    """
+    Vector radar chart for a result's competencies, cached by content digest.
+    
+    Returns:
+        reportlab Drawing (a private copy, safe to use in concurrent renders), or None if fewer than 3 competencies
+    """
+    scores = competency_scores(competencies)
+    if len(scores) < 3:
+        return None
+    
+    digest = hashlib.sha256(json.dumps([scores, language, width, height]).encode('utf-8')).hexdigest()
+    with _radar_lock:
+        drawing = _radar_cache.get(digest)
+        if drawing is not None:
+            _radar_cache.move_to_end(digest)
+            return copy.deepcopy(drawing)
+    
+    if language == ARABIC_LANGUAGE:
+        title, title_font = shape_arabic("توازن الجدارات"), register_fonts()
+    else:
+        title, title_font = "Competency Balance", 'Helvetica-Bold'
+    drawing = _build_radar_drawing(scores, title, title_font, width, height)
+    
+    with _radar_lock:
+        _radar_cache[digest] = drawing
+        while len(_radar_cache) > RADAR_CACHE_SIZE:
+            _radar_cache.popitem(last=False)
+    return copy.deepcopy(drawing)
+
+
+class _LazyStory(list):
+    """
+    Flowable list for doc.build that pulls report sections from a generator as layout consumes it,
+    so only the sections around the current page are held in memory.
+    """
+    def __init__(self, sections, lookahead=2):
+        super().__init__()
+        self._sections = iter(sections)
+        self._lookahead = lookahead
+    
+    def _refill(self):
+        while self._sections is not None and super().__len__() < self._lookahead:
+            try:
+                self.extend(next(self._sections))
+            except StopIteration:
+                self._sections = None
+    
+    def __len__(self):
+        self._refill()
+        return super().__len__()
+
+
+# Detailed analysis marker tables (styles are shared by every row table)
+MARKER_TABLE_COL_WIDTHS = [0.8*inch, 2.8*inch, 2.8*inch]
+LONG_CELL_CHARS = 1800  # Comfortably less than a full page of text in a 2.8 inch column
+MARKER_HEADER_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#37474f')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP')
+])
+_MARKER_ROW_COMMANDS = [
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('TOPPADDING', (0, 0), (-1, -1), 5),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP')
+]
+MARKER_PASS_ROW_STYLE = TableStyle(_MARKER_ROW_COMMANDS + [('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#e8f5e9'))])
+MARKER_FAIL_ROW_STYLE = TableStyle(_MARKER_ROW_COMMANDS + [('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#ffebee'))])
+
+
+def _split_long_text(text, limit=LONG_CELL_CHARS):
+    """Split text at word boundaries into chunks of at most `limit` characters"""
+    text = str(text)
+    if len(text) <= limit:
+        return [text]
+    
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind(' ', 0, limit)
+        if cut <= 0:
+            cut = limit
+        chunks.append(text[:cut].rstrip())
+        text = text[cut:].lstrip()
+    if text:
+        chunks.append(text)
+    return chunks
+
+
+def _doc_template(buffer):
+    """Letter page with compressed page streams (TTF fonts are embedded as subsets by ReportLab)"""
+    return SimpleDocTemplate(buffer, pagesize=letter,
+                             rightMargin=0.75*inch, leftMargin=0.75*inch,
+                             topMargin=0.75*inch, bottomMargin=0.75*inch,
+                             pageCompression=1)
+
+
 class PDFRenderer:
     def __init__(self, language="English"):
         self.language = language
         self.buffer = BytesIO()
-        self.styles = getSampleStyleSheet()
-        self._setup_fonts()
-        self._setup_custom_styles()
-    
-    def _setup_fonts(self):
-        """Attempt to load Arabic-compatible fonts with graceful fallback"""
-        try:
-            # Try to load the Amiri font if available
-            if os.path.exists("Amiri-Regular.ttf"):
-                pdfmetrics.registerFont(TTFont('AmiriFont', 'Amiri-Regular.ttf'))
-                self.arabic_font = 'AmiriFont'
-            else:
-                print("WARNING: Amiri font not found. Arabic text may not render correctly.")
-                self.arabic_font = 'Helvetica'
-        except Exception as e:
-            print(f"WARNING: Font loading failed: {e}. Using default font.")
-            self.arabic_font = 'Helvetica'
-    
-    def _setup_custom_styles(self):
-        """Create custom paragraph styles for the report"""
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1a237e'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName=self.arabic_font if self.language == "العربية" else 'Helvetica-Bold'
-        ))
-        
-        # Header style
-        self.styles.add(ParagraphStyle(
-            name='CustomHeader',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#283593'),
-            spaceAfter=12,
-            fontName=self.arabic_font if self.language == "العربية" else 'Helvetica-Bold'
-        ))
-        
-        # Body style
-        self.styles.add(ParagraphStyle(
-            name='CustomBody',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            alignment=TA_RIGHT if self.language == "العربية" else TA_LEFT,
-            fontName=self.arabic_font if self.language == "العربية" else 'Helvetica'
-        ))
+        self.arabic_font = register_fonts()
+        self.styles = get_style_set(language)
     
     def _process_arabic_text(self, text):
         """Process Arabic text for proper RTL rendering"""
         if self.language == "العربية":
-            reshaped_text = arabic_reshaper.reshape(str(text))
-            return get_display(reshaped_text)
+            return shape_arabic(text)
         return str(text)
     
     def create_session_report(self, session_report):
         """
         Generate PDF report for Level 3 Full Coaching Session
         """
-        doc = SimpleDocTemplate(self.buffer, pagesize=letter,
-                               rightMargin=0.75*inch, leftMargin=0.75*inch,
-                               topMargin=0.75*inch, bottomMargin=0.75*inch)
-        
-        story = []
+        doc = _doc_template(self.buffer)
         
-        # PAGE 1: SESSION SUMMARY
-        story.extend(self._create_session_summary(session_report))
-        story.append(PageBreak())
-        
-        # PAGE 2: DETAILED ANALYSIS
-        story.extend(self._create_session_details(session_report))
+        def sections():
+            # PAGE 1: SESSION SUMMARY
+            yield self._create_session_summary(session_report)
+            yield [PageBreak()]
+            
+            # PAGE 2: DETAILED ANALYSIS
+            yield self._create_session_details(session_report)
         
-        # Build PDF
-        doc.build(story)
+        # Build PDF (sections are generated as the layout reaches them)
+        doc.build(_LazyStory(sections()))
         self.buffer.seek(0)
         return self.buffer
     
@@ -112,22 +464,9 @@ class PDFRenderer:
         # Metrics Table with proper alignment
         is_arabic = self.language == "العربية"
         
-        header_style = ParagraphStyle(
-            'TableHeader',
-            parent=self.styles['CustomBody'],
-            fontSize=12,
-            textColor=colors.whitesmoke,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        data_style = ParagraphStyle(
-            'TableData',
-            parent=self.styles['CustomBody'],
-            fontSize=14,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
+        header_style = self.styles['SessionTableHeader']
+        
+        data_style = self.styles['SessionTableData']
         
         # Create table data with proper headers
         if is_arabic:
@@ -186,22 +525,9 @@ class PDFRenderer:
         flow = report.get('session_flow', {})
         
         # Flow table header style
-        flow_header_style = ParagraphStyle(
-            'FlowHeader',
-            parent=self.styles['CustomBody'],
-            fontSize=11,
-            textColor=colors.whitesmoke,
-            alignment=TA_RIGHT if is_arabic else TA_LEFT,
-            fontName=self.arabic_font if is_arabic else 'Helvetica-Bold'
-        )
-        
-        flow_data_style = ParagraphStyle(
-            'FlowData',
-            parent=self.styles['CustomBody'],
-            fontSize=11,
-            alignment=TA_RIGHT if is_arabic else TA_LEFT,
-            fontName=self.arabic_font if is_arabic else 'Helvetica'
-        )
+        flow_header_style = self.styles['FlowHeader']
+        
+        flow_data_style = self.styles['FlowData']
         
         if is_arabic:
             flow_data = [
@@ -218,10 +544,12 @@ class PDFRenderer:
                 ('closing', 'الاغلاق')
             ]:
                 phase_assessment = flow.get(phase_name, 'غير متوفر')
-                flow_data.append([
-                    Paragraph(self._process_arabic_text(phase_assessment), flow_data_style),
-                    Paragraph(self._process_arabic_text(phase_label), flow_data_style)
-                ])
+                # Over-long assessments continue in extra rows, each short enough to fit on a page
+                for part, text in enumerate(_split_long_text(phase_assessment)):
+                    flow_data.append([
+                        Paragraph(self._process_arabic_text(text), flow_data_style),
+                        Paragraph(self._process_arabic_text(phase_label if part == 0 else "..."), flow_data_style)
+                    ])
         else:
             flow_data = [
                 [
@@ -237,12 +565,14 @@ class PDFRenderer:
                 ('closing', 'Closing')
             ]:
                 phase_assessment = flow.get(phase_name, 'N/A')
-                flow_data.append([
-                    Paragraph(phase_label, flow_data_style),
-                    Paragraph(phase_assessment, flow_data_style)
-                ])
-        
-        flow_table = Table(flow_data, colWidths=[2*inch, 4.4*inch])
+                # Over-long assessments continue in extra rows, each short enough to fit on a page
+                for part, text in enumerate(_split_long_text(phase_assessment)):
+                    flow_data.append([
+                        Paragraph(phase_label if part == 0 else "...", flow_data_style),
+                        Paragraph(text, flow_data_style)
+                    ])
+        
+        flow_table = Table(flow_data, colWidths=[2*inch, 4.4*inch], repeatRows=1, splitInRow=1)
         flow_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#37474f')),
             ('ALIGN', (0, 0), (-1, -1), 'RIGHT' if is_arabic else 'LEFT'),
@@ -265,14 +595,7 @@ class PDFRenderer:
         
         talk_ratio_assessment = report.get('talk_ratio_assessment', 'N/A' if not is_arabic else 'غير متوفر')
         
-        assessment_style = ParagraphStyle(
-            'AssessmentStyle',
-            parent=self.styles['CustomBody'],
-            fontSize=11,
-            alignment=TA_RIGHT if is_arabic else TA_LEFT,
-            fontName=self.arabic_font if is_arabic else 'Helvetica',
-            leading=16
-        )
+        assessment_style = self.styles['AssessmentStyle']
         
         talk_para = Paragraph(self._process_arabic_text(talk_ratio_assessment), assessment_style)
         elements.append(talk_para)
@@ -285,16 +608,7 @@ class PDFRenderer:
         is_arabic = self.language == "العربية"
         
         # Define paragraph style for sections
-        section_style = ParagraphStyle(
-            'SectionStyle',
-            parent=self.styles['CustomBody'],
-            fontSize=11,
-            alignment=TA_RIGHT if is_arabic else TA_LEFT,
-            fontName=self.arabic_font if is_arabic else 'Helvetica',
-            leading=16,
-            spaceBefore=6,
-            spaceAfter=6
-        )
+        section_style = self.styles['SectionStyle']
         
         # Strengths
         header_text = "Strengths" if self.language == "English" else "نقاط القوة"
@@ -382,30 +696,27 @@ class PDFRenderer:
         
         Args:
             analysis_result: Dictionary containing analysis data
-            radar_chart_path: Path to the radar chart image (optional)
+            radar_chart_path: Path to a radar chart image (optional; drawn from the competencies if omitted)
         
         Returns:
             BytesIO buffer containing the PDF
         """
-        doc = SimpleDocTemplate(self.buffer, pagesize=letter,
-                               rightMargin=0.75*inch, leftMargin=0.75*inch,
-                               topMargin=0.75*inch, bottomMargin=0.75*inch)
-        
-        story = []
-        
-        # PAGE 1: EXECUTIVE SUMMARY
-        story.extend(self._create_executive_summary(analysis_result, radar_chart_path))
-        story.append(PageBreak())
-        
-        # PAGE 2+: DETAILED ANALYSIS
-        story.extend(self._create_detailed_analysis(analysis_result))
-        story.append(PageBreak())
+        doc = _doc_template(self.buffer)
         
-        # FINAL PAGE: DEVELOPMENT RECOMMENDATIONS
-        story.extend(self._create_recommendations(analysis_result))
+        def sections():
+            # PAGE 1: EXECUTIVE SUMMARY
+            yield self._create_executive_summary(analysis_result, radar_chart_path)
+            yield [PageBreak()]
+            
+            # PAGE 2+: DETAILED ANALYSIS (one section per competency)
+            yield from self._iter_detailed_analysis(analysis_result)
+            yield [PageBreak()]
+            
+            # FINAL PAGE: DEVELOPMENT RECOMMENDATIONS
+            yield from self._iter_recommendations(analysis_result)
         
-        # Build PDF
-        doc.build(story)
+        # Build PDF (sections are generated as the layout reaches them)
+        doc.build(_LazyStory(sections()))
         self.buffer.seek(0)
         return self.buffer
     
@@ -420,22 +731,9 @@ class PDFRenderer:
         elements.append(Spacer(1, 0.3*inch))
         
         # Metrics Table - using Paragraphs for all cells
-        header_style = ParagraphStyle(
-            'TableHeader',
-            parent=self.styles['CustomBody'],
-            fontSize=11,
-            textColor=colors.whitesmoke,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        data_style = ParagraphStyle(
-            'TableData',
-            parent=self.styles['CustomBody'],
-            fontSize=13,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
+        header_style = self.styles['AuditTableHeader']
+        
+        data_style = self.styles['AuditTableData']
         
         metrics_data = [
             [
@@ -468,29 +766,34 @@ class PDFRenderer:
         elements.append(metrics_table)
         elements.append(Spacer(1, 0.5*inch))
         
-        # Radar Chart
+        # Radar Chart (an explicit image path is still honoured; otherwise drawn from this result)
         if radar_chart_path and os.path.exists(radar_chart_path):
             try:
                 img = Image(radar_chart_path, width=5*inch, height=4*inch)
                 elements.append(img)
             except Exception as e:
                 print(f"WARNING: Could not embed radar chart: {e}")
+        else:
+            try:
+                radar = get_radar_drawing(result.get('competencies', {}), self.language)
+                if radar is not None:
+                    elements.append(radar)
+            except Exception as e:
+                print(f"WARNING: Could not draw radar chart: {e}")
         
         return elements
     
-    def _create_detailed_analysis(self, result):
-        """Create detailed competency analysis with evidence tables"""
-        elements = []
-        
+    def _iter_detailed_analysis(self, result):
+        """Yield the detailed competency analysis section by section (one evidence table per competency)"""
         # Section title
         header_text = "Detailed Competency Analysis" if self.language == "English" else "التحليل التفصيلي للجدارات"
         header = Paragraph(self._process_arabic_text(header_text), self.styles['CustomHeader'])
-        elements.append(header)
-        elements.append(Spacer(1, 0.2*inch))
+        yield [header, Spacer(1, 0.2*inch)]
         
         competencies = result.get('competencies', {})
         
         for comp_id, comp_data in competencies.items():
+            elements = []
             comp_name = comp_data.get('name', comp_id)
             comp_score = comp_data.get('score', 0)
             
@@ -500,12 +803,16 @@ class PDFRenderer:
             elements.append(comp_para)
             elements.append(Spacer(1, 0.1*inch))
             
-            # Markers table - using Paragraphs for proper text wrapping
-            table_data = [[
+            # Markers table - using Paragraphs for proper text wrapping.
+            # Each marker is its own one-row table so page breaks fall between rows without
+            # re-measuring the whole table.
+            header_table = Table([[
                 Paragraph(self._process_arabic_text("Marker" if self.language == "English" else "المؤشر"), self.styles['CustomBody']),
                 Paragraph(self._process_arabic_text("Evidence & Time" if self.language == "English" else "الدليل والوقت"), self.styles['CustomBody']),
                 Paragraph(self._process_arabic_text("Auditor Critique" if self.language == "English" else "ملاحظة المدقق"), self.styles['CustomBody'])
-            ]]
+            ]], colWidths=MARKER_TABLE_COL_WIDTHS, style=MARKER_HEADER_STYLE)
+            header_table.keepWithNext = True
+            elements.append(header_table)
             
             for marker in comp_data.get('markers', []):
                 status = marker.get('status', 'Fail')
@@ -513,76 +820,46 @@ class PDFRenderer:
                 evidence = marker.get('evidence', 'N/A')
                 auditor_note = marker.get('auditor_note', '')
                 
-                # Create Paragraphs for each cell to allow proper wrapping
-                marker_cell = Paragraph(
-                    self._process_arabic_text(f"{marker_id}<br/>[{status}]"),
-                    self.styles['CustomBody']
-                )
-                
-                evidence_cell = Paragraph(
-                    self._process_arabic_text(evidence),
-                    self.styles['CustomBody']
-                )
+                # Color code rows based on Pass/Fail
+                row_style = MARKER_PASS_ROW_STYLE if status == 'Pass' else MARKER_FAIL_ROW_STYLE
                 
-                auditor_cell = Paragraph(
-                    self._process_arabic_text(auditor_note),
-                    self.styles['CustomBody']
-                )
-                
-                table_data.append([marker_cell, evidence_cell, auditor_cell])
-            
-            markers_table = Table(table_data, colWidths=[0.8*inch, 2.8*inch, 2.8*inch])
-            
-            # Apply styling
-            style_commands = [
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#37474f')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP')
-            ]
-            
-            # Color code rows based on Pass/Fail
-            for i, marker in enumerate(comp_data.get('markers', []), start=1):
-                if marker.get('status') == 'Pass':
-                    style_commands.append(('BACKGROUND', (0, i), (-1, i), colors.HexColor('#e8f5e9')))
-                else:
-                    style_commands.append(('BACKGROUND', (0, i), (-1, i), colors.HexColor('#ffebee')))
-            
-            markers_table.setStyle(TableStyle(style_commands))
+                # Over-long evidence/notes continue in extra rows, each short enough to fit on a page
+                evidence_parts = _split_long_text(evidence)
+                note_parts = _split_long_text(auditor_note)
+                for part in range(max(len(evidence_parts), len(note_parts))):
+                    # Create Paragraphs for each cell to allow proper wrapping
+                    marker_cell = Paragraph(
+                        self._process_arabic_text(f"{marker_id}<br/>[{status}]" if part == 0 else "..."),
+                        self.styles['CustomBody']
+                    )
+                    
+                    evidence_cell = Paragraph(
+                        self._process_arabic_text(evidence_parts[part] if part < len(evidence_parts) else ""),
+                        self.styles['CustomBody']
+                    )
+                    
+                    auditor_cell = Paragraph(
+                        self._process_arabic_text(note_parts[part] if part < len(note_parts) else ""),
+                        self.styles['CustomBody']
+                    )
+                    
+                    elements.append(Table([[marker_cell, evidence_cell, auditor_cell]],
+                                          colWidths=MARKER_TABLE_COL_WIDTHS, style=row_style))
             
-            elements.append(markers_table)
             elements.append(Spacer(1, 0.3*inch))
-        
-        return elements
+            yield elements
     
-    def _create_recommendations(self, result):
-        """Create development recommendations page with professional formatting"""
-        elements = []
-        
+    def _iter_recommendations(self, result):
+        """Yield the development recommendations page section by section"""
         # Section title
         header_text = "Development Recommendations" if self.language == "English" else "توصيات التطوير"
         header = Paragraph(self._process_arabic_text(header_text), self.styles['CustomTitle'])
-        elements.append(header)
-        elements.append(Spacer(1, 0.3*inch))
         
         # Introduction
         intro_text = "Based on the PCC-level audit, the following markers require focused development:" if self.language == "English" else "بناءً على تدقيق مستوى PCC، تحتاج العلامات التالية إلى تطوير مركز:"
-        intro_style = ParagraphStyle(
-            'IntroStyle',
-            parent=self.styles['CustomBody'],
-            fontSize=12,
-            spaceAfter=20,
-            fontName='Helvetica-Bold' if self.language == "English" else self.arabic_font
-        )
+        intro_style = self.styles['IntroStyle']
         intro = Paragraph(self._process_arabic_text(intro_text), intro_style)
-        elements.append(intro)
-        elements.append(Spacer(1, 0.2*inch))
+        yield [header, Spacer(1, 0.3*inch), intro, Spacer(1, 0.2*inch)]
         
         competencies = result.get('competencies', {})
         
@@ -603,19 +880,14 @@ class PDFRenderer:
             # No recommendations needed
             no_rec_text = "Excellent work! All markers demonstrated at PCC level." if self.language == "English" else "عمل ممتاز! جميع العلامات ظهرت بمستوى PCC."
             no_rec = Paragraph(self._process_arabic_text(no_rec_text), self.styles['CustomBody'])
-            elements.append(no_rec)
+            yield [no_rec]
         else:
             # Create recommendations table
             for rec in recommendations:
+                elements = []
+                
                 # Competency header with background
-                comp_header_style = ParagraphStyle(
-                    'CompHeader',
-                    parent=self.styles['CustomBody'],
-                    fontSize=13,
-                    textColor=colors.HexColor('#1a237e'),
-                    fontName='Helvetica-Bold' if self.language == "English" else self.arabic_font,
-                    spaceAfter=5
-                )
+                comp_header_style = self.styles['CompHeader']
                 
                 comp_header_text = f"{rec['id']}: {rec['name']}"
                 comp_header = Paragraph(self._process_arabic_text(comp_header_text), comp_header_style)
@@ -643,7 +915,7 @@ class PDFRenderer:
                     
                     marker_data.append([marker_cell, action_cell])
                 
-                marker_table = Table(marker_data, colWidths=[1*inch, 5.4*inch])
+                marker_table = Table(marker_data, colWidths=[1*inch, 5.4*inch], repeatRows=1, splitInRow=1)
                 marker_table.setStyle(TableStyle([
                     ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e3f2fd')),
                     ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1565c0')),
@@ -661,8 +933,7 @@ class PDFRenderer:
                 
                 elements.append(marker_table)
                 elements.append(Spacer(1, 0.2*inch))
-        
-        return elements
+                yield elements
 
 
 def generate_mcc_pdf(analysis_result, language="English", radar_chart_path=None):
@@ -672,7 +943,7 @@ def generate_mcc_pdf(analysis_result, language="English", radar_chart_path=None)
     Args:
         analysis_result: Analysis data dictionary
         language: "English" or "العربية"
-        radar_chart_path: Path to radar chart image
+        radar_chart_path: Path to radar chart image (optional; drawn from the competencies if omitted)
     
     Returns:
         Bytes of the generated PDF
@@ -2,9 +2,11 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
-from firebase_config import get_user_stats
+from firebase_config import get_user_stats, get_user_history_page, get_session_report
 from recommendation_engine import analyze_performance
 
+HISTORY_PAGE_SIZE = 10
+
 def show(language="English"):
     """
     Displays the User Profile & Progress Dashboard.
@@ -51,6 +53,7 @@ def show(language="English"):
             "rank_mcc": "كوتش خبير (MCC)",
             "smart_plan": "Smart Development Plan",
             "focus_area": "⚠️ Focus Area",
+            "weak_markers": "Markers to practice",
             "weekly_plan": "Your Plan for this Week",
             "read": "📖 Read",
             "drill": "🎮 Drill",
@@ -76,6 +79,7 @@ def show(language="English"):
             "rank_mcc": "كوتش خبير (MCC)",
             "smart_plan": "خطة التطوير الذكية",
             "focus_area": "⚠️ منطقة التركيز",
+            "weak_markers": "مؤشرات للتمرين",
             "weekly_plan": "خطتك لهذا الأسبوع",
             "read": "📖 اقرأ",
             "drill": "🎮 تمرن",
@@ -167,7 +171,7 @@ def show(language="English"):
     st.markdown("---")
 
     # --- Stats & Progress ---
-    user_stats = get_user_stats(st.session_state.user_email)
+    user_stats = get_user_stats(st.session_state.user_id)
     
     # If no stats, create default empty stats so the UI still shows
     if not user_stats:
@@ -177,8 +181,7 @@ def show(language="English"):
             'avg_score': 0,
             'arcade_games': 0,
             'arcade_points': 0,
-            'rank_key': 'rank_novice',
-            'recent_sessions': []
+            'rank_key': 'rank_novice'
         }
         # Optional: Show a small tip that they can start
         st.info(txt['no_data'])
@@ -205,7 +208,7 @@ def show(language="English"):
     st.subheader(f"🎯 {txt['smart_plan']}")
     
     # Get Recommendation
-    smart_plan = analyze_performance(st.session_state.user_email)
+    smart_plan = analyze_performance(st.session_state.user_id)
     
     if smart_plan:
         focus = smart_plan['focus_area']
@@ -214,6 +217,11 @@ def show(language="English"):
         # Focus Area Alert
         st.warning(f"**{txt['focus_area']}: {focus['name']}**\n\nYour average score here is **{focus['avg_score']}%**. Let's work on this!")
         
+        if smart_plan.get('weak_markers'):
+            st.caption(f"**{txt['weak_markers']}:** " + " · ".join(
+                f"{m['id']} ({m['rate']:.0f}%)" for m in smart_plan['weak_markers']
+            ))
+        
         st.write(f"### {txt['weekly_plan']}")
         
         col_p1, col_p2, col_p3 = st.columns(3)
@@ -271,9 +279,20 @@ def show(language="English"):
     with col_history:
         st.subheader(txt['history'])
         
-        if user_stats['recent_sessions']:
-            history_data = []
-            for s in user_stats['recent_sessions']:
+        # One page of summary rows at a time; full reports load only when asked for
+        if 'history_cursors' not in st.session_state:
+            st.session_state.history_cursors = [None]
+        if 'loaded_reports' not in st.session_state:
+            st.session_state.loaded_reports = {}
+        
+        history_page = get_user_history_page(
+            st.session_state.user_id,
+            page_size=HISTORY_PAGE_SIZE,
+            start_after=st.session_state.history_cursors[-1]
+        )
+        
+        if history_page['sessions']:
+            for s in history_page['sessions']:
                 # Format date
                 created_at = s.get('created_at')
                 date_str = "Unknown"
@@ -283,14 +302,32 @@ def show(language="English"):
                         date_str = created_at.strftime("%Y-%m-%d")
                     except:
                         date_str = str(created_at)[:10]
-                        
-                history_data.append({
-                    txt['date']: date_str,
-                    txt['type']: "Full Session" if s.get('mode') == 'exam' else "Training",
-                    txt['score']: f"{s.get('compliance_percentage', 0)}%"
-                })
+                
+                session_type = s.get('session_type', 'Training')
+                with st.expander(f"{date_str} · {session_type} · {txt['score']}: {s.get('compliance_percentage', 0)}%"):
+                    if s.get('duration'):
+                        st.caption(s['duration'])
+                    
+                    report = st.session_state.loaded_reports.get(s['id'])
+                    if report is None:
+                        if st.button("📄 View Report" if language == "English" else "📄 عرض التقرير", key=f"history_report_{s['id']}"):
+                            report = get_session_report(s['id']) or {}
+                            st.session_state.loaded_reports[s['id']] = report
+                    if report:
+                        st.json(report, expanded=False)
+                    elif report is not None:
+                        st.caption("No report saved for this session" if language == "English" else "لا يوجد تقرير محفوظ لهذه الجلسة")
             
-            df = pd.DataFrame(history_data)
-            st.dataframe(df, use_container_width=True, hide_index=True)
+            prev_col, page_col, next_col = st.columns([1, 1, 1])
+            with prev_col:
+                if len(st.session_state.history_cursors) > 1 and st.button("⬅️", key="history_prev"):
+                    st.session_state.history_cursors.pop()
+                    st.rerun()
+            with page_col:
+                st.caption(f"Page {len(st.session_state.history_cursors)}" if language == "English" else f"صفحة {len(st.session_state.history_cursors)}")
+            with next_col:
+                if history_page['next_cursor'] is not None and st.button("➡️", key="history_next"):
+                    st.session_state.history_cursors.append(history_page['next_cursor'])
+                    st.rerun()
         else:
             st.info(txt['no_data'])
@@ -1,104 +1,304 @@
-import json
 import random
 import os
-from firebase_config import get_user_stats
+from datetime import datetime, timezone
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from firebase_config import get_competency_profile
+from reference_data import get_reference_data
+
+# Competencies the Smart Plan can focus on (C1/C2 are gatekeepers scored Pass/Fail)
+COMPETENCY_NAMES = {
+    "C3": "Establishes and Maintains Agreements",
+    "C4": "Cultivates Trust and Safety",
+    "C5": "Maintains Presence",
+    "C6": "Listens Actively",
+    "C7": "Evokes Awareness",
+    "C8": "Facilitates Client Growth"
+}
+
+# A session's weight halves every DECAY_HALF_LIFE_DAYS, so recent practice counts most
+DECAY_HALF_LIFE_DAYS = 30
+WEAK_MARKERS_LIMIT = 3
+# A marker observed in at least this share (%) of recent sessions is not reported as weak
+MARKER_PASS_RATE = 50
 
 def load_markers():
     """
-    Load markers from the JSON file.
+    Shared markers.json document (parsed once, see reference_data).
     """
     try:
-        with open('markers.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return get_reference_data().markers
     except Exception as e:
         print(f"Error loading markers: {e}")
         return None
 
-def analyze_performance(user_id):
+def summarize_report(report):
     """
-    Analyze user's last 5 sessions and arcade games to generate a Smart Plan.
+    Compact, columnar per-session results (stored on the session document as 'score_summary').
+    
+    Returns:
+        dict: {'marker_ids', 'marker_observed' (1/0), 'competency_ids', 'competency_scores' (0-100)}
     """
-    stats = get_user_stats(user_id)
+    summary = {'marker_ids': [], 'marker_observed': [], 'competency_ids': [], 'competency_scores': []}
+    if not isinstance(report, dict):
+        return summary
+    competencies = report.get('competencies')
+    if not isinstance(competencies, dict):
+        return _summarize_full_session(report, summary)
     
-    if not stats:
-        return None
+    for cid, data in competencies.items():
+        if not isinstance(data, dict):
+            continue
         
-    # 1. Calculate Competency Scores from Recent Sessions
-    competency_scores = {
-        "C3": {"total": 0, "count": 0, "name": "Establishes and Maintains Agreements"},
-        "C4": {"total": 0, "count": 0, "name": "Cultivates Trust and Safety"},
-        "C5": {"total": 0, "count": 0, "name": "Maintains Presence"},
-        "C6": {"total": 0, "count": 0, "name": "Listens Actively"},
-        "C7": {"total": 0, "count": 0, "name": "Evokes Awareness"},
-        "C8": {"total": 0, "count": 0, "name": "Facilitates Client Growth"}
+        # Marker-based competencies: observed share; C1/C2: Pass=100, Fail=0
+        markers = [m for m in data.get('markers') or [] if isinstance(m, dict) and m.get('id')]
+        if markers:
+            observed = [1 if str(m.get('status', '')).lower() in ('observed', 'pass') else 0 for m in markers]
+            summary['marker_ids'].extend(str(m['id']) for m in markers)
+            summary['marker_observed'].extend(observed)
+            score = sum(observed) / len(observed) * 100
+        elif 'status' in data:
+            score = 100 if str(data['status']).lower() == 'pass' else 0
+        else:
+            continue
+        summary['competency_ids'].append(str(cid))
+        summary['competency_scores'].append(round(score, 1))
+    return summary
+
+def _summarize_full_session(report, summary):
+    """
+    Full-session reports carry per-marker turn counts ('markers_demonstrated') instead of a
+    per-competency breakdown: a PCC marker counts as observed if any evaluated turn demonstrated it.
+    """
+    marker_counts = report.get('markers_demonstrated')
+    if not isinstance(marker_counts, dict) or not report.get('individual_scores'):
+        return summary  # no evaluated turns - nothing to score
+    
+    for cid, markers in get_reference_data().markers_by_competency.items():
+        if not markers:
+            continue
+        observed = [1 if marker_counts.get(m['id'], 0) > 0 else 0 for m in markers]
+        summary['marker_ids'].extend(str(m['id']) for m in markers)
+        summary['marker_observed'].extend(observed)
+        summary['competency_ids'].append(str(cid))
+        summary['competency_scores'].append(round(sum(observed) / len(observed) * 100, 1))
+    return summary
+
+def _session_weights(timestamps, half_life_days, now):
+    """Exponential time-decay weight per session (sessions without a timestamp count as the oldest)"""
+    created = pd.to_datetime(pd.Series(timestamps, dtype=object), utc=True, errors='coerce')
+    age_days = (now - created).dt.total_seconds().to_numpy() / 86400
+    if np.isnan(age_days).all():
+        return np.ones(len(age_days))
+    age_days = np.clip(np.nan_to_num(age_days, nan=np.nanmax(age_days)), 0, None)
+    return np.exp2(-age_days / half_life_days)
+
+def _weighted_rates(ids_per_session, values_per_session, weights, scale):
+    """
+    Weighted mean of values per ID across all sessions.
+    
+    Returns:
+        DataFrame indexed by id: rate (decayed mean * scale), sessions, total (plain sum),
+        w / wv (sum of weights / weighted values)
+    """
+    counts = np.fromiter((len(ids) for ids in ids_per_session), dtype=np.int64, count=len(ids_per_session))
+    ids = list(chain.from_iterable(ids_per_session))
+    if not ids:
+        return pd.DataFrame({column: pd.Series(dtype=float) for column in ['rate', 'sessions', 'total', 'w', 'wv']})
+    values = np.fromiter(chain.from_iterable(values_per_session), dtype=float, count=len(ids))
+    row_weights = np.repeat(weights, counts)
+    frame = pd.DataFrame({'id': ids, 'v': values, 'w': row_weights, 'wv': row_weights * values})
+    grouped = frame.groupby('id', sort=False).agg(
+        w=('w', 'sum'), wv=('wv', 'sum'), total=('v', 'sum'), sessions=('w', 'size')
+    )
+    grouped['rate'] = (grouped['wv'] / grouped['w'] * scale).round(1)
+    return grouped[['rate', 'sessions', 'total', 'w', 'wv']]
+
+def score_history(history, half_life_days=DECAY_HALF_LIFE_DAYS, now=None):
+    """
+    Time-decayed competency scores and marker observed rates over a user's whole history.
+    
+    Args:
+        history: List of (created_at, score_summary) pairs
+        half_life_days: Age at which a session counts half as much as today's
+    
+    Returns:
+        dict: {'competencies', 'markers'} DataFrames indexed by ID with 'rate' (0-100), 'sessions'
+              and the raw sums (see _weighted_rates)
+    """
+    now = now or pd.Timestamp.now(tz='UTC')
+    timestamps = [created_at for created_at, _ in history]
+    summaries = [summary or {} for _, summary in history]
+    weights = _session_weights(timestamps, half_life_days, now)
+    
+    competencies = _weighted_rates(
+        [s.get('competency_ids', []) for s in summaries],
+        [s.get('competency_scores', []) for s in summaries],
+        weights, scale=1
+    )
+    markers = _weighted_rates(
+        [s.get('marker_ids', []) for s in summaries],
+        [s.get('marker_observed', []) for s in summaries],
+        weights, scale=100
+    )
+    return {'competencies': competencies, 'markers': markers}
+
+# --- Competency profile (one document per user, kept current on every session save) ---
+# Each competency/marker entry holds running count/total/average plus an exponentially
+# time-decayed weight and total; 'ema' = decayed_total / decayed_weight, which equals the
+# score_history rate because a common decay factor cancels out of the ratio.
+
+def _profile_entry(count, total, decayed_weight, decayed_total, scale):
+    count, total = int(count), float(total)
+    decayed_weight, decayed_total = float(decayed_weight), float(decayed_total)
+    return {
+        'count': count,
+        'total': total,
+        'average': round(total / count * scale, 1) if count else 0,
+        'decayed_weight': decayed_weight,
+        'decayed_total': decayed_total,
+        'ema': round(decayed_total / decayed_weight * scale, 1) if decayed_weight else 0
     }
+
+def _decay_entries(entries, decay, scale):
+    return {
+        item_id: _profile_entry(
+            entry['count'], entry['total'], entry['decayed_weight'] * decay, entry['decayed_total'] * decay, scale
+        )
+        for item_id, entry in entries.items()
+    }
+
+def update_profile(profile, summary, at=None, half_life_days=DECAY_HALF_LIFE_DAYS):
+    """
+    Fold one session's score_summary into a competency profile.
+    
+    Args:
+        profile: Existing profile dict (or None for a new one); not modified
+        summary: The session's score_summary
+        at: Session time (defaults to now)
     
-    # We only have detailed data in 'recent_sessions' which are Full Sessions or Rephrase
-    # We need to look at the 'report_json' inside the session data.
-    # get_user_stats returns 'recent_sessions' but it might not have the full report_json 
-    # if get_user_stats only fetches summary fields. 
-    # Looking at firebase_config.py, it does: sessions = [doc.to_dict() for doc in sessions_ref.stream()]
-    # So it fetches everything. Good.
+    Returns:
+        New profile dict
+    """
+    at = at or datetime.now(timezone.utc)
+    profile = profile or {}
     
-    sessions = stats.get('recent_sessions', [])
+    # Age every entry to the new reference time, then add this session with weight 1
+    decay = 1.0
+    last = profile.get('decayed_at')
+    if last is not None:
+        age_days = max((at - last).total_seconds() / 86400, 0)
+        decay = 2 ** (-age_days / half_life_days)
+    competencies = _decay_entries(profile.get('competencies', {}), decay, scale=1)
+    markers = _decay_entries(profile.get('markers', {}), decay, scale=100)
     
-    for session in sessions:
-        report = session.get('report_json', {})
-        if not report:
-            continue
-            
-        # Check if it's a Full Session report (has 'competencies' key)
-        if 'competencies' in report:
-            comps = report['competencies']
-            for cid, data in comps.items():
-                if cid in competency_scores:
-                    # Calculate score for this competency in this session
-                    # If it has markers, use observed/total
-                    # If it's C1/C2, use status (Pass=100, Fail=0)
-                    
-                    score = 0
-                    if 'markers' in data:
-                        markers = data['markers']
-                        if markers:
-                            observed = sum(1 for m in markers if m.get('status') == 'Observed')
-                            score = (observed / len(markers)) * 100
-                    elif 'status' in data:
-                        score = 100 if data['status'] == 'Pass' else 0
-                        
-                    competency_scores[cid]["total"] += score
-                    competency_scores[cid]["count"] += 1
-    
-    # 2. Identify Weakest Competency
-    weakest_cid = None
-    lowest_avg = 101
-    
-    for cid, data in competency_scores.items():
-        if data["count"] > 0:
-            avg = data["total"] / data["count"]
-            if avg < lowest_avg:
-                lowest_avg = avg
-                weakest_cid = cid
-    
-    # Default if no data
-    if weakest_cid is None:
+    for entries, ids, values, scale in [
+        (competencies, summary.get('competency_ids', []), summary.get('competency_scores', []), 1),
+        (markers, summary.get('marker_ids', []), summary.get('marker_observed', []), 100)
+    ]:
+        for item_id, value in zip(ids, values):
+            entry = entries.get(item_id) or _profile_entry(0, 0, 0, 0, scale)
+            entries[item_id] = _profile_entry(
+                entry['count'] + 1, entry['total'] + value,
+                entry['decayed_weight'] + 1, entry['decayed_total'] + value, scale
+            )
+    
+    return {
+        'session_count': profile.get('session_count', 0) + 1,
+        'half_life_days': half_life_days,
+        'decayed_at': max(at, last) if last is not None else at,
+        'competencies': competencies,
+        'markers': markers
+    }
+
+def build_profile(history, half_life_days=DECAY_HALF_LIFE_DAYS):
+    """Competency profile for a whole (created_at, score_summary) history, computed vectorized"""
+    now = datetime.now(timezone.utc)
+    scored = [(created_at, summary) for created_at, summary in history if summary and summary.get('competency_ids')]
+    scores = score_history(scored, half_life_days, pd.Timestamp(now))
+    
+    def entries(frame, scale):
+        return {
+            str(item_id): _profile_entry(row['sessions'], row['total'], row['w'], row['wv'], scale)
+            for item_id, row in frame.iterrows()
+        }
+    
+    return {
+        'session_count': len(scored),
+        'half_life_days': half_life_days,
+        'decayed_at': now,
+        'competencies': entries(scores['competencies'], 1),
+        'markers': entries(scores['markers'], 100)
+    }
+
+def _profile_frame(entries):
+    """Profile entries -> DataFrame indexed by ID with 'rate' (time-decayed, 0-100) and 'sessions'"""
+    return pd.DataFrame(
+        {'rate': [entry['ema'] for entry in entries.values()],
+         'sessions': [entry['count'] for entry in entries.values()]},
+        index=pd.Index(list(entries), dtype=object)
+    )
+
+def analyze_performance(user_id):
+    """
+    Generate a Smart Plan from the user's competency profile (whole history, recent sessions weigh most).
+    """
+    profile = get_competency_profile(user_id)
+    
+    if profile is None:
+        return None
+    
+    scores = {
+        'competencies': _profile_frame(profile.get('competencies', {})),
+        'markers': _profile_frame(profile.get('markers', {}))
+    }
+    competency_rates = scores['competencies']['rate']
+    marker_rates = scores['markers'].sort_values(['rate', 'sessions'], ascending=[True, False])
+    
+    # 1-2. Identify Weakest Competency
+    focus_rates = competency_rates[competency_rates.index.isin(list(COMPETENCY_NAMES))]
+    if not focus_rates.empty:
+        weakest_cid = focus_rates.idxmin()
+        lowest_avg = float(focus_rates.min())
+    else:
         # Default to C7 (Evokes Awareness) as it's a common struggle
         weakest_cid = "C7"
         lowest_avg = 0
-        
-    weakest_name = competency_scores[weakest_cid]["name"]
     
-    # 3. Generate Action Plan
-    markers_data = load_markers()
+    weakest_name = COMPETENCY_NAMES[weakest_cid]
     
-    # READ: Find a marker from this competency
+    try:
+        reference = get_reference_data()
+    except Exception as e:
+        print(f"Error loading markers: {e}")
+        reference = None
+    
+    weak_markers = []
+    below_pass = marker_rates[marker_rates['rate'] < MARKER_PASS_RATE]
+    for marker_id, row in below_pass.head(WEAK_MARKERS_LIMIT).iterrows():
+        marker = reference.get_marker(marker_id) if reference else None
+        weak_markers.append({
+            'id': marker_id,
+            'text': marker['text'] if marker else "",
+            'rate': float(row['rate']),
+            'sessions': int(row['sessions'])
+        })
+    
+    # 3. Generate Action Plan
+    # READ: The weakest observed marker of this competency (or a random one if none was scored yet)
     read_task = "Review ICF Core Competencies"
-    if markers_data:
-        # Find the competency object
-        comp_obj = next((c for c in markers_data['competencies'] if c['id'] == weakest_cid), None)
-        if comp_obj and comp_obj['markers']:
-            # Pick a random marker
-            marker = random.choice(comp_obj['markers'])
-            read_task = f"Review Marker {marker['id']}: {marker['text']}"
+    comp_markers = reference.get_competency_markers(weakest_cid) if reference else ()
+    if comp_markers:
+        comp_marker_ids = [m['id'] for m in comp_markers]
+        scored = marker_rates[marker_rates.index.isin(comp_marker_ids)]
+        if not scored.empty:
+            marker = reference.get_marker(scored.index[0])
+        else:
+            marker = random.choice(comp_markers)
+        read_task = f"Review Marker {marker['id']}: {marker['text']}"
     
     # DRILL: Arcade Mode
     drill_task = f"Play Arcade Mode (Focus on '{weakest_name}')"
@@ -121,6 +321,8 @@ def analyze_performance(user_id):
             "name": weakest_name,
             "avg_score": round(lowest_avg, 1)
         },
+        "weak_markers": weak_markers,
+        "competency_scores": {cid: float(rate) for cid, rate in competency_rates.items()},
         "plan": {
             "read": read_task,
             "drill": drill_task,
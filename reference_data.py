@@ -0,0 +1,156 @@
+"""
+Reference Data - ICF markers, core competencies, GROW model and Arabic ICF texts, parsed once per process
+All modules share one immutable snapshot with lookup indexes. The JSON files are re-parsed only
+when their modification time changes, so edits are picked up without restarting the server.
+"""
+import json
+import os
+import threading
+import time
+
+from grow_model_data import GROW_MODEL_EN, GROW_MODEL_AR
+from icf_data_arabic import COMPETENCIES_AR
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MARKERS_PATH = os.path.join(BASE_DIR, "markers.json")
+CORE_COMPETENCIES_PATH = os.path.join(BASE_DIR, "icf_core_competencies_2025.json")
+
+# How often (seconds) the file modification times are checked
+RELOAD_CHECK_SECONDS = 2
+
+
+class FrozenDict(dict):
+    """Read-only dict (still a dict, so json.dumps and isinstance checks keep working)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Reference data is read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value):
+    """Recursively convert dicts to FrozenDict and lists to tuples"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _competency_key(comp_id):
+    """'3', 'C3' and 3 all map to 'C3'"""
+    comp_id = str(comp_id).strip()
+    return comp_id if comp_id.upper().startswith('C') else f"C{comp_id}"
+
+
+class ReferenceData:
+    """Immutable snapshot of all reference data plus lookup indexes"""
+
+    def __init__(self, markers, core_competencies, mtimes):
+        self.mtimes = mtimes
+        self.markers = freeze(markers)  # full markers.json document
+        self.core_competencies = freeze(core_competencies)  # full icf_core_competencies_2025.json document
+        self.competencies_ar = freeze(COMPETENCIES_AR)
+        self.grow_model = FrozenDict({"English": freeze(GROW_MODEL_EN), "العربية": freeze(GROW_MODEL_AR)})
+
+        competency_by_id = {}
+        marker_by_id = {}
+        markers_by_competency = {}
+        competency_of_marker = {}
+        for comp in self.markers.get('competencies', ()):
+            competency_by_id[comp['id']] = comp
+            markers_by_competency[comp['id']] = comp.get('markers', ())
+            for marker in comp.get('markers', ()):
+                marker_by_id[marker['id']] = marker
+                competency_of_marker[marker['id']] = comp['id']
+
+        self.competency_by_id = FrozenDict(competency_by_id)  # 'C3' -> competency (with markers)
+        self.marker_by_id = FrozenDict(marker_by_id)  # '3.1' -> marker
+        self.markers_by_competency = FrozenDict(markers_by_competency)  # 'C3' -> markers
+        self.competency_of_marker = FrozenDict(competency_of_marker)  # '3.1' -> 'C3'
+        self.cross_cutting = self.markers.get('cross_cutting_competencies', FrozenDict())
+
+        self.core_competency_by_id = FrozenDict(
+            (_competency_key(comp['id']), comp) for comp in self.core_competencies.get('competencies', ())
+        )  # 'C3' -> 2025 competency definition
+
+        competency_ar_by_id = {}
+        marker_ar_by_id = {}
+        for comp in self.competencies_ar:
+            competency_ar_by_id[_competency_key(comp['id'])] = comp
+            for marker in comp.get('markers', ()):
+                marker_ar_by_id[marker['id']] = marker
+        self.competency_ar_by_id = FrozenDict(competency_ar_by_id)
+        self.marker_ar_by_id = FrozenDict(marker_ar_by_id)
+
+    def get_marker(self, marker_id, language="English"):
+        """Marker dict by ID ('3.1'), or None"""
+        index = self.marker_ar_by_id if language == "العربية" else self.marker_by_id
+        return index.get(str(marker_id).strip())
+
+    def get_competency(self, comp_id, language="English"):
+        """Competency dict by ID ('C3', '3' or 3), or None"""
+        index = self.competency_ar_by_id if language == "العربية" else self.competency_by_id
+        return index.get(_competency_key(comp_id))
+
+    def get_competency_markers(self, comp_id):
+        return self.markers_by_competency.get(_competency_key(comp_id), ())
+
+
+def _load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _current_mtimes():
+    return (os.path.getmtime(MARKERS_PATH), os.path.getmtime(CORE_COMPETENCIES_PATH))
+
+
+_snapshot = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def get_reference_data():
+    """
+    Shared reference data snapshot, re-parsed if a source file changed since it was loaded.
+    Raises if the files cannot be loaded the first time; later reload failures keep the old snapshot.
+    """
+    global _snapshot, _last_check
+    now = time.monotonic()
+    if _snapshot is not None and now - _last_check < RELOAD_CHECK_SECONDS:
+        return _snapshot
+
+    with _lock:
+        if _snapshot is not None and now - _last_check < RELOAD_CHECK_SECONDS:
+            return _snapshot
+        try:
+            mtimes = _current_mtimes()
+            if _snapshot is None or mtimes != _snapshot.mtimes:
+                _snapshot = ReferenceData(_load_json(MARKERS_PATH), _load_json(CORE_COMPETENCIES_PATH), mtimes)
+        except Exception as e:
+            if _snapshot is None:
+                raise
+            print(f"Error reloading reference data: {e}")
+        _last_check = now
+        return _snapshot
+
+
+def get_markers():
+    """The markers.json document"""
+    return get_reference_data().markers
+
+
+def get_core_competencies():
+    """The icf_core_competencies_2025.json document"""
+    return get_reference_data().core_competencies
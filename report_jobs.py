@@ -0,0 +1,173 @@
+"""
+Report Jobs - Render PDF reports in the background and cache the finished artifacts
+PDFs are queued as soon as an analysis completes, so the download button serves ready bytes
+instead of rebuilding the report on every rerun.
+"""
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Bump when the PDF layout changes so stale artifacts are not served
+TEMPLATE_VERSION = "3"
+
+
+def normalize_payload(payload):
+    """Detached, JSON-native copy of a payload (tuples -> lists, datetimes etc. -> str)"""
+    return json.loads(json.dumps(payload, ensure_ascii=False, default=str))
+
+
+def analysis_digest(payload):
+    """Stable content hash of an analysis/report dict"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _render_mcc(payload, language, radar_chart_path=None):
+    from pdf_renderer import generate_mcc_pdf
+    return generate_mcc_pdf(payload, language=language, radar_chart_path=radar_chart_path)
+
+
+def _render_session(payload, language):
+    from pdf_renderer import generate_session_pdf
+    return generate_session_pdf(payload, language=language)
+
+
+_RENDERERS = {
+    'mcc': _render_mcc,
+    'session': _render_session
+}
+
+
+class ReportJobs:
+    def __init__(self, max_workers=2, max_age_seconds=3600, max_total_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            max_workers: PDF render workers (shared by all sessions in the process)
+            max_age_seconds: Cached artifacts older than this are evicted
+            max_total_bytes: Upper bound on the total size of cached artifacts
+        """
+        self.max_age_seconds = max_age_seconds
+        self.max_total_bytes = max_total_bytes
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-pdf")
+        self._lock = threading.Lock()
+        self._artifacts = {}  # key -> {'data', 'size', 'created_at'}
+        self._jobs = {}  # key -> Future (in flight)
+        self._total_bytes = 0
+
+    def _prepare(self, kind, payload, language):
+        """
+        Normalized payload and its artifact key. submit, get and is_pending all hash the
+        normalized copy, so payloads with non-JSON-native values map to the same artifact.
+        """
+        snapshot = normalize_payload(payload)
+        return snapshot, (kind, analysis_digest(snapshot), language, TEMPLATE_VERSION)
+
+    def submit(self, kind, payload, language="English", **render_kwargs):
+        """
+        Queue a PDF render unless the artifact is already cached or being rendered.
+
+        Args:
+            kind: 'mcc' or 'session'
+            payload: Analysis result / session report dict
+            language: Report language
+            render_kwargs: Extra renderer arguments (e.g. radar_chart_path)
+
+        Returns:
+            Artifact key
+        """
+        # Render from a detached copy - the caller's dict lives in session state and may change
+        snapshot, key = self._prepare(kind, payload, language)
+        render = _RENDERERS[kind]
+
+        with self._lock:
+            self._evict_locked()
+            if key in self._artifacts or key in self._jobs:
+                return key
+            future = self._executor.submit(render, snapshot, language, **render_kwargs)
+            self._jobs[key] = future
+
+        future.add_done_callback(lambda f, key=key: self._store(key, f))
+        return key
+
+    def _store(self, key, future):
+        with self._lock:
+            self._jobs.pop(key, None)
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"Error rendering report PDF: {e}")
+                return
+            self._artifacts[key] = {'data': data, 'size': len(data), 'created_at': time.time()}
+            self._total_bytes += len(data)
+            self._evict_locked()
+
+    def get(self, kind, payload, language="English", wait=False, timeout=None, **render_kwargs):
+        """
+        Fetch the rendered PDF bytes.
+
+        Args:
+            wait: Queue the render if needed and block until it finishes
+
+        Returns:
+            PDF bytes, or None if not ready (or rendering failed)
+        """
+        snapshot, key = self._prepare(kind, payload, language)
+        with self._lock:
+            artifact = self._artifacts.get(key)
+            if artifact is not None:
+                return artifact['data']
+            future = self._jobs.get(key)
+
+        if not wait:
+            return None
+
+        if future is None:
+            self.submit(kind, snapshot, language, **render_kwargs)
+            with self._lock:
+                future = self._jobs.get(key)
+        if future is not None:
+            # Surface renderer exceptions to the caller
+            data = future.result(timeout=timeout)
+            return data
+
+        with self._lock:
+            artifact = self._artifacts.get(key)
+            return artifact['data'] if artifact else None
+
+    def is_pending(self, kind, payload, language="English"):
+        _, key = self._prepare(kind, payload, language)
+        with self._lock:
+            return key in self._jobs
+
+    def _evict_locked(self):
+        """Drop expired artifacts, then the oldest ones until under the size budget"""
+        now = time.time()
+        for key in [k for k, a in self._artifacts.items() if now - a['created_at'] > self.max_age_seconds]:
+            self._total_bytes -= self._artifacts.pop(key)['size']
+
+        if self._total_bytes > self.max_total_bytes:
+            for key in sorted(self._artifacts, key=lambda k: self._artifacts[k]['created_at']):
+                self._total_bytes -= self._artifacts.pop(key)['size']
+                if self._total_bytes <= self.max_total_bytes:
+                    break
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'artifacts': len(self._artifacts),
+                'total_bytes': self._total_bytes,
+                'in_flight': len(self._jobs)
+            }
+
+
+# Singleton instance (shared by all sessions in the process)
+_report_jobs_instance = None
+
+def get_report_jobs():
+    """Get or create report job queue instance"""
+    global _report_jobs_instance
+    if _report_jobs_instance is None:
+        _report_jobs_instance = ReportJobs()
+    return _report_jobs_instance
@@ -0,0 +1,174 @@
+"""
+Session Aggregator - Fold per-turn coach evaluations into running session statistics
+Lets the final full-session report be generated from a compact summary instead of the full transcript.
+"""
+import re
+
+GROW_PHASES = ["Goal", "Reality", "Options", "Will"]
+
+# Accept English or Arabic phase names from the per-turn evaluation
+_GROW_ALIASES = {
+    "goal": "Goal", "الهدف": "Goal",
+    "reality": "Reality", "الواقع": "Reality",
+    "options": "Options", "الخيارات": "Options",
+    "will": "Will", "way forward": "Will", "الإرادة": "Will", "الارادة": "Will"
+}
+
+
+def _normalize_grow_phase(phase):
+    phase_lower = str(phase or "").strip().lower()
+    for alias, name in _GROW_ALIASES.items():
+        if alias in phase_lower:
+            return name
+    return None
+
+
+def _normalize_competency(competency):
+    """'Competency 7: Evokes Awareness' -> 'C7'"""
+    match = re.search(r'(\d)', str(competency or ""))
+    return f"C{match.group(1)}" if match else None
+
+
+def _clip(text, limit):
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+class SessionAggregator:
+    def __init__(self, questions_per_phase=3, moments_per_kind=2, text_limit=200):
+        """
+        Args:
+            questions_per_phase: Best-scoring coach questions kept per GROW phase
+            moments_per_kind: Strongest and weakest turns kept as key-moment candidates
+            text_limit: Maximum characters kept per quoted message or note
+        """
+        self.questions_per_phase = questions_per_phase
+        self.moments_per_kind = moments_per_kind
+        self.text_limit = text_limit
+
+        # Talk ratio (fed from the message list)
+        self.message_count = 0
+        self.coach_turns = 0
+        self.coach_words = 0
+        self.client_words = 0
+
+        # Per-turn evaluation results
+        self.scores = []
+        self.rating_counts = {}
+        self.marker_counts = {}
+        self.competency_counts = {}
+        self.session_phase_scores = {}  # opening/exploration/... -> {'total', 'count'}
+        self.grow = {phase: {'count': 0, 'score_total': 0, 'questions': []} for phase in GROW_PHASES}
+        self.strongest_turns = []
+        self.weakest_turns = []
+        self.failed_evaluations = 0
+
+    def sync_messages(self, messages):
+        """Count words for messages added since the last call"""
+        for msg in messages[self.message_count:]:
+            words = len(str(msg.get('content', '')).split())
+            if msg.get('role') == 'Coach':
+                self.coach_turns += 1
+                self.coach_words += words
+            elif msg.get('role') == 'Client':
+                self.client_words += words
+        self.message_count = max(self.message_count, len(messages))
+        return self
+
+    def add_analysis(self, entry):
+        """
+        Fold one hidden analysis entry (as stored in hidden_analyses) into the running state.
+        """
+        analysis = entry.get('analysis') or {}
+        if 'error' in analysis or 'score' not in analysis:
+            self.failed_evaluations += 1
+            return
+
+        try:
+            score = float(analysis.get('score', 0))
+        except (TypeError, ValueError):
+            self.failed_evaluations += 1
+            return
+        self.scores.append(score)
+
+        rating = analysis.get('rating')
+        if rating:
+            self.rating_counts[rating] = self.rating_counts.get(rating, 0) + 1
+
+        for marker_id in analysis.get('markers_demonstrated', []) or []:
+            marker_id = str(marker_id).strip()
+            if marker_id:
+                self.marker_counts[marker_id] = self.marker_counts.get(marker_id, 0) + 1
+
+        comp_id = _normalize_competency(analysis.get('primary_competency'))
+        if comp_id:
+            self.competency_counts[comp_id] = self.competency_counts.get(comp_id, 0) + 1
+
+        session_phase = entry.get('phase')
+        if session_phase:
+            bucket = self.session_phase_scores.setdefault(session_phase, {'total': 0, 'count': 0})
+            bucket['total'] += score
+            bucket['count'] += 1
+
+        turn = {
+            'timestamp': entry.get('timestamp', ''),
+            'score': score,
+            'coach_message': _clip(entry.get('coach_message', ''), self.text_limit),
+            'note': _clip(analysis.get('feedback', ''), self.text_limit)
+        }
+
+        grow_phase = _normalize_grow_phase(analysis.get('grow_phase'))
+        if grow_phase:
+            phase_state = self.grow[grow_phase]
+            phase_state['count'] += 1
+            phase_state['score_total'] += score
+            phase_state['questions'] = self._keep_top(phase_state['questions'], turn, self.questions_per_phase, best=True)
+
+        self.strongest_turns = self._keep_top(self.strongest_turns, turn, self.moments_per_kind, best=True)
+        self.weakest_turns = self._keep_top(self.weakest_turns, turn, self.moments_per_kind, best=False)
+
+    @staticmethod
+    def _keep_top(items, item, limit, best=True):
+        items = items + [item]
+        items.sort(key=lambda t: t['score'], reverse=best)
+        return items[:limit]
+
+    def talk_ratio(self):
+        """Returns (coach %, client %)"""
+        total_words = self.coach_words + self.client_words
+        coach_ratio = int((self.coach_words / total_words) * 100) if total_words > 0 else 0
+        return coach_ratio, 100 - coach_ratio
+
+    def average_score(self):
+        return sum(self.scores) / len(self.scores) if self.scores else 0
+
+    def summary(self):
+        """Compact, JSON-serializable session summary"""
+        coach_ratio, client_ratio = self.talk_ratio()
+        return {
+            'coach_turns': self.coach_turns,
+            'talk_ratio': {'coach': coach_ratio, 'client': client_ratio},
+            'average_score': round(self.average_score(), 1),
+            'individual_scores': self.scores,
+            'ratings': self.rating_counts,
+            'markers_demonstrated': dict(sorted(self.marker_counts.items())),
+            'primary_competencies': dict(sorted(self.competency_counts.items())),
+            'session_phases': {
+                phase: {'turns': data['count'], 'avg_score': round(data['total'] / data['count'], 1)}
+                for phase, data in self.session_phase_scores.items() if data['count']
+            },
+            'grow_phases': {
+                phase: {
+                    'turns': data['count'],
+                    'avg_score': round(data['score_total'] / data['count'], 1) if data['count'] else 0,
+                    'best_questions': [
+                        {'timestamp': q['timestamp'], 'score': q['score'], 'question': q['coach_message']}
+                        for q in data['questions']
+                    ]
+                }
+                for phase, data in self.grow.items()
+            },
+            'strongest_moments': self.strongest_turns,
+            'weakest_moments': self.weakest_turns,
+            'unscored_turns': self.failed_evaluations
+        }
@@ -0,0 +1,101 @@
+"""
+Storage - One place to get the document database, whichever backend is configured
+Modules call get_db() instead of firestore.client() and use the write sentinels from this module
+(storage.SERVER_TIMESTAMP, storage.DELETE_FIELD, storage.Increment, storage.transactional), so the
+same code runs against Cloud Firestore or the local store in local_store.py.
+
+Backends (STORAGE_BACKEND environment variable):
+    firestore   Cloud Firestore via firebase_admin (default, needs firebase_key.json)
+    sqlite      local store persisted to STORAGE_SQLITE_PATH (on-prem mode, no credentials)
+    memory      local store kept in memory (load tests and benchmarks of the data layer)
+"""
+import os
+import threading
+
+BACKENDS = ('firestore', 'sqlite', 'memory')
+DEFAULT_SQLITE_PATH = 'local_store.sqlite3'
+
+# Query directions have the same values in both backends
+ASCENDING = 'ASCENDING'
+DESCENDING = 'DESCENDING'
+
+# Backend-specific write sentinels, set by configure()
+SERVER_TIMESTAMP = None
+DELETE_FIELD = None
+Increment = None
+transactional = None
+
+_backend = None
+_sqlite_path = None
+_local_db = None
+_lock = threading.Lock()
+
+
+def configure(backend=None, sqlite_path=None, db=None):
+    """
+    Select the storage backend (called on import with the environment settings).
+
+    Args:
+        backend: 'firestore', 'sqlite' or 'memory' (default: STORAGE_BACKEND, else 'firestore')
+        sqlite_path: SQLite file for the 'sqlite' backend (default: STORAGE_SQLITE_PATH)
+        db: Ready-made local store to use instead of creating one (e.g. a pre-filled load-test fixture)
+    """
+    global SERVER_TIMESTAMP, DELETE_FIELD, Increment, transactional, _backend, _sqlite_path, _local_db
+    backend = (backend or os.getenv('STORAGE_BACKEND') or 'firestore').strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+
+    with _lock:
+        if backend == 'firestore':
+            from firebase_admin import firestore
+            SERVER_TIMESTAMP = firestore.SERVER_TIMESTAMP
+            DELETE_FIELD = firestore.DELETE_FIELD
+            Increment = firestore.Increment
+            transactional = firestore.transactional
+        else:
+            import local_store
+            SERVER_TIMESTAMP = local_store.SERVER_TIMESTAMP
+            DELETE_FIELD = local_store.DELETE_FIELD
+            Increment = local_store.Increment
+            transactional = local_store.transactional
+
+        if _local_db is not None and _local_db is not db:
+            _local_db.close()
+        _backend = backend
+        _sqlite_path = sqlite_path or os.getenv('STORAGE_SQLITE_PATH') or DEFAULT_SQLITE_PATH
+        _local_db = db
+
+
+def get_backend():
+    return _backend
+
+
+def is_local():
+    """True when data is kept by the local store (no Firebase app or credentials involved)"""
+    return _backend != 'firestore'
+
+
+def is_ready():
+    """True if get_db() can be called: always for the local store, after initialize_app() for Firestore"""
+    if is_local():
+        return True
+    import firebase_admin
+    return bool(firebase_admin._apps)
+
+
+def get_db():
+    """Database client of the configured backend (Firestore client or LocalStore)"""
+    global _local_db
+    if not is_local():
+        from firebase_admin import firestore
+        return firestore.client()
+
+    if _local_db is None:
+        with _lock:
+            if _local_db is None:
+                from local_store import LocalStore
+                _local_db = LocalStore(_sqlite_path if _backend == 'sqlite' else None)
+    return _local_db
+
+
+configure()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests never need Firebase credentials: the data layer runs on the in-memory local store
+os.environ.setdefault('STORAGE_BACKEND', 'memory')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,66 @@
+import pytest
+
+import admin_analytics
+import storage
+from admin_analytics import AdminAnalytics, _query_cache
+
+
+class FlakyCollection:
+    def __init__(self, db, failures):
+        self._db = db
+        self.failures = failures
+
+    def __call__(self, name):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("transient backend error")
+        return self._db.collection(name)
+
+
+@pytest.fixture
+def analytics(monkeypatch):
+    storage.configure('memory')
+    _query_cache.invalidate()
+    analytics = AdminAnalytics()
+    analytics.db.collection('users').document('a@x.com').set({'email': 'a@x.com', 'role': 'user'})
+    yield analytics
+    _query_cache.invalidate()
+    storage.configure()
+
+
+def test_failed_query_is_not_cached(analytics, monkeypatch):
+    flaky = FlakyCollection(analytics.db, failures=1)
+    monkeypatch.setattr(analytics, 'db', type('FlakyDB', (), {'collection': staticmethod(flaky)})())
+    assert analytics.get_total_users() == 0  # fallback while the backend fails
+    assert analytics.get_total_users() == 1  # retried, not served from the cache
+
+
+def test_dependent_query_is_not_cached_after_inner_failure(analytics, monkeypatch):
+    real_db = analytics.db
+    flaky = FlakyCollection(real_db, failures=1)
+    monkeypatch.setattr(analytics, 'db', type('FlakyDB', (), {'collection': staticmethod(flaky)})())
+    assert analytics.get_total_stats()['total_users'] == 0
+    assert analytics.get_total_stats()['total_users'] == 1
+
+
+def test_successful_query_is_cached(analytics):
+    assert analytics.get_total_users() == 1
+    analytics.db.collection('users').document('b@x.com').set({'email': 'b@x.com'})
+    assert analytics.get_total_users() == 1
+    analytics.invalidate('get_total_users')
+    assert analytics.get_total_users() == 2
+
+
+def test_search_finds_users_by_email_prefix_after_backfill(analytics):
+    assert analytics.search_users('A@')['users'] == []  # created before email_lower, not indexed yet
+    assert analytics.backfill_email_lower() == 1
+    analytics.invalidate('search_users')
+    assert [user['email'] for user in analytics.search_users('A@')['users']] == ['a@x.com']
+
+
+def test_cohort_refresh_runs_in_background(analytics):
+    assert analytics.get_cohort_snapshot() is None
+    assert analytics.start_cohort_refresh()
+    admin_analytics._cohort_refresh.result(timeout=10)
+    assert not analytics.cohort_refresh_running()
+    assert analytics.get_cohort_snapshot()['computed_at'] is not None
@@ -0,0 +1,57 @@
+import csv
+import io
+import zipfile
+
+import pytest
+
+import bulk_export
+import firebase_config
+import storage
+
+
+def session_report(score):
+    return {'overall_score': score,
+            'session_flow': {'opening': 'Strong', 'exploration': 'Acceptable', 'deepening': 'Weak', 'closing': 'Strong'},
+            'strengths': ['Clear agreement'], 'areas_for_improvement': ['Deeper questions'],
+            'recommendations': ['Practice silence'], 'key_moments': [], 'grow_analysis': {},
+            'talk_ratio': 'Coach: 40% / Client: 60%', 'talk_ratio_assessment': 'Balanced'}
+
+
+@pytest.fixture
+def sessions():
+    storage.configure('memory')
+    firebase_config.link_user_id('coach@example.com', 'uid-coach')
+    for user_id, score in [('uid-coach', 7), ('uid-coach', 8), ('uid-other', 5)]:
+        assert firebase_config.save_session(user_id, {'user_id': user_id, 'session_type': 'Full Session',
+                                                      'date': '2025-03-01 10:00', 'report_json': session_report(score)})
+    yield
+    storage.configure()
+
+
+def read_manifest(path):
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+        rows = list(csv.DictReader(io.StringIO(archive.read('manifest.csv').decode('utf-8'))))
+    return names, rows
+
+
+def test_export_filtered_by_email(sessions, tmp_path):
+    out = tmp_path / 'reports.zip'
+    assert bulk_export.main(['--user', 'coach@example.com', '--out', str(out), '--workers', '1']) == 0
+    names, rows = read_manifest(out)
+    assert len(rows) == 2
+    assert {row['user_id'] for row in rows} == {'uid-coach'}
+    assert all(row['status'] == 'exported' for row in rows)
+    assert len([name for name in names if name.endswith('.pdf')]) == 2
+
+
+def test_export_filtered_by_uid(sessions, tmp_path):
+    out = tmp_path / 'reports.zip'
+    counts = bulk_export.export_sessions_zip(str(out), user_id='uid-other', max_workers=1)
+    assert counts == {'exported': 1, 'skipped': 0, 'failed': 0}
+
+
+def test_unknown_email_is_an_error(sessions, tmp_path):
+    out = tmp_path / 'reports.zip'
+    assert bulk_export.main(['--user', 'nobody@example.com', '--out', str(out)]) == 1
+    assert not out.exists()
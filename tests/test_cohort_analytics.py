@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+import storage
+from cohort_analytics import (LATEST_SNAPSHOT_ID, SNAPSHOT_COLLECTION, build_frames, compute_cohort_snapshot,
+                              run_cohort_job)
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def row(user_id, day, score, marker_observed=(), competency_scores=(), session_type='MCC Analysis'):
+    return {
+        'user_id': user_id, 'created_at': START + timedelta(days=day), 'session_type': session_type,
+        'compliance_percentage': score,
+        'score_summary': {'marker_ids': ['7.1', '6.1'][:len(marker_observed)],
+                          'marker_observed': list(marker_observed),
+                          'competency_ids': ['C7', 'C6'][:len(competency_scores)],
+                          'competency_scores': list(competency_scores)}
+    }
+
+
+ROWS = [
+    row('u1', 0, 40, (1, 0), (50.0, 20.0)),
+    row('u2', 1, 90, (1, 1), (80.0, 60.0)),
+    row('u1', 2, 60, (0,), (30.0,)),
+    row('u2', 3, None, session_type='Full Session'),  # not scored
+    row('u1', 5, 75, (1, 1), (70.0, 40.0))
+]
+
+
+def test_build_frames_columns_and_session_numbers():
+    sessions, markers, competencies = build_frames(ROWS)
+    assert list(sessions['session_number']) == [1, 1, 2, 2, 3]
+    assert sessions['score'].isna().tolist() == [False, False, False, True, False]
+    assert str(sessions['created_at'].dt.tz) == 'UTC'
+    assert list(markers['session']) == [0, 0, 1, 1, 2, 4, 4]
+    assert list(markers['id']) == ['7.1', '6.1', '7.1', '6.1', '7.1', '7.1', '6.1']
+    assert list(competencies.loc[competencies['id'] == 'C7', 'score']) == [50.0, 80.0, 30.0, 70.0]
+
+
+def test_build_frames_numbers_sessions_chronologically():
+    sessions, _, _ = build_frames([row('u1', 5, 10), row('u1', 1, 20), row('u1', 3, 30)])
+    assert list(sessions['session_number']) == [3, 1, 2]
+
+
+def test_build_frames_of_no_rows():
+    sessions, markers, competencies = build_frames([])
+    assert sessions.empty and markers.empty and competencies.empty
+    snapshot = compute_cohort_snapshot(sessions, markers, competencies)
+    assert snapshot['session_count'] == 0 and snapshot['marker_pass_rates'] == []
+
+
+def test_compute_cohort_snapshot():
+    snapshot = compute_cohort_snapshot(*build_frames(ROWS))
+    assert snapshot['session_count'] == 5 and snapshot['user_count'] == 2
+
+    distribution = snapshot['score_distribution']
+    assert distribution['count'] == 4
+    assert distribution['mean'] == pytest.approx((40 + 90 + 60 + 75) / 4, abs=0.1)
+    assert sum(bin_['sessions'] for bin_ in distribution['histogram']) == 4
+    assert set(snapshot['score_distribution_by_type']) == {'MCC Analysis'}
+
+    # Weakest marker first: 6.1 observed in 2 of 3 sessions, 7.1 in 3 of 4
+    assert snapshot['marker_pass_rates'] == [
+        {'marker_id': '6.1', 'competency': 'C6', 'pass_rate': 66.7, 'observations': 3},
+        {'marker_id': '7.1', 'competency': 'C7', 'pass_rate': 75.0, 'observations': 4}
+    ]
+    c7 = next(item for item in snapshot['competency_scores'] if item['competency'] == 'C7')
+    assert c7 == {'competency': 'C7', 'sessions': 4, 'mean': 57.5, 'median': 60.0}
+
+    assert snapshot['improvement_curve'][0] == {'session_number': 1, 'avg_score': 65.0, 'users': 2}
+    # u1 went from 40 to 75; u2 has one scored session
+    assert snapshot['improvement'] == {'users': 1, 'avg_change': 35.0, 'improved_share': 100.0}
+
+
+def test_run_cohort_job_stores_latest_snapshot():
+    storage.configure('memory')
+    try:
+        db = storage.get_db()
+        for data in ROWS:
+            db.collection('sessions').add(dict(data))
+        snapshot = run_cohort_job(db, page_size=2)
+        assert snapshot['session_count'] == 5
+        latest = db.collection(SNAPSHOT_COLLECTION).document(LATEST_SNAPSHOT_ID).get().to_dict()
+        assert latest['computed_at'] == snapshot['computed_at']
+        assert isinstance(latest['computed_at'], (datetime, pd.Timestamp))
+    finally:
+        storage.configure()
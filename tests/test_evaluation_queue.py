@@ -0,0 +1,30 @@
+import threading
+
+from evaluation_queue import EvaluationQueue
+
+
+class SlowTrainer:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def evaluate_coach_response(self, history, message, language="English"):
+        self.release.wait(5)
+        return {'score': 7}
+
+
+def test_timed_out_evaluation_is_flagged_and_filled_in_later():
+    trainer = SlowTrainer()
+    queue = EvaluationQueue()
+    entry = {'coach_message': 'What do you want?'}
+    queue.submit(trainer, entry, [], entry['coach_message'])
+
+    assert queue.collect(wait_for_all=True, timeout=0.05) == []
+    assert entry['analysis_pending'] is True
+    assert 'analysis' not in entry
+    assert queue.pending_count() == 1
+
+    trainer.release.set()
+    assert queue.collect(wait_for_all=True, timeout=5) == [entry]
+    assert entry['analysis'] == {'score': 7}
+    assert 'analysis_pending' not in entry
+    assert queue.pending_count() == 0
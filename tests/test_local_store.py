@@ -0,0 +1,159 @@
+"""
+LocalStore behaviour the app relies on where it mirrors Cloud Firestore: query ordering and cursors,
+write transforms, transactions and the SQLite round-trip.
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from local_store import (DELETE_FIELD, DESCENDING, SERVER_TIMESTAMP, Increment, LocalStore, NotFound,
+                         transactional)
+
+
+@pytest.fixture
+def db():
+    store = LocalStore()
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def scores(db):
+    collection = db.collection('scores')
+    for doc_id, score in [('a', 2), ('b', 3), ('c', 2), ('d', 1), ('e', 3)]:
+        collection.document(doc_id).set({'score': score})
+    collection.document('f').set({'other': 1})  # no 'score': left out of ordered queries
+    return collection
+
+
+def ids(docs):
+    return [doc.id for doc in docs]
+
+
+def test_ties_are_ordered_by_document_id_in_the_last_direction(scores):
+    assert ids(scores.order_by('score').stream()) == ['d', 'a', 'c', 'b', 'e']
+    assert ids(scores.order_by('score', direction=DESCENDING).stream()) == ['e', 'b', 'c', 'a', 'd']
+
+
+def test_start_after_snapshot_on_descending_query(scores):
+    query = scores.order_by('score', direction=DESCENDING).limit(2)
+    first = list(query.stream())
+    assert ids(first) == ['e', 'b']
+    second = list(query.start_after(first[-1]).stream())
+    assert ids(second) == ['c', 'a']
+    assert ids(query.start_after(second[-1]).stream()) == ['d']
+
+
+def test_start_after_field_values_skips_whole_tie(scores):
+    query = scores.order_by('score', direction=DESCENDING)
+    assert ids(query.start_after({'score': 3}).stream()) == ['c', 'a', 'd']
+
+
+def test_inequality_filter_orders_by_its_field(scores):
+    assert ids(scores.where('score', '>=', 2).stream()) == ['a', 'c', 'b', 'e']
+
+
+def test_merge_set_with_nested_increment(db):
+    ref = db.collection('users').document('u1')
+    ref.set({'email': 'u@x.com', 'usage_stats': {'calls': 1, 'tokens': 10}})
+    ref.set({'usage_stats': {'calls': Increment(2), 'new': Increment(5)}, 'role': 'admin'}, merge=True)
+    assert ref.get().to_dict() == {'email': 'u@x.com', 'role': 'admin',
+                                   'usage_stats': {'calls': 3, 'tokens': 10, 'new': 5}}
+
+
+def test_set_without_merge_replaces_document(db):
+    ref = db.collection('users').document('u1')
+    ref.set({'a': 1, 'b': {'c': 2}})
+    ref.set({'b': {'d': Increment(1)}})
+    assert ref.get().to_dict() == {'b': {'d': 1}}
+
+
+def test_update_with_dotted_paths_and_delete_field(db):
+    ref = db.collection('sessions').document('s1')
+    ref.set({'report_json': {'x': 1}, 'stats': {'views': 1, 'keep': True}})
+    ref.update({'report_json': DELETE_FIELD, 'stats.views': Increment(1), 'stats.last': SERVER_TIMESTAMP,
+                'meta.owner': 'uid-1'})
+    data = ref.get().to_dict()
+    assert 'report_json' not in data
+    assert data['stats']['views'] == 2 and data['stats']['keep'] is True
+    assert isinstance(data['stats']['last'], datetime)
+    assert data['meta'] == {'owner': 'uid-1'}
+
+    ref.update({'stats.keep': DELETE_FIELD})
+    assert ref.get().to_dict()['stats'] == {'views': 2, 'last': data['stats']['last']}
+
+
+def test_update_of_missing_document_fails(db):
+    with pytest.raises(NotFound):
+        db.collection('sessions').document('missing').update({'a': 1})
+
+
+def test_failed_transaction_writes_nothing(db):
+    first, second = db.collection('docs').document('one'), db.collection('docs').document('two')
+
+    @transactional
+    def write(transaction):
+        transaction.set(first, {'value': 1})
+        transaction.update(second, {'value': 2})  # missing document: the commit fails
+
+    with pytest.raises(NotFound):
+        write(db.transaction())
+    assert not first.get().exists
+
+
+def test_transaction_rolls_back_on_exception(db):
+    ref = db.collection('docs').document('one')
+    ref.set({'value': 1})
+
+    @transactional
+    def write(transaction):
+        transaction.set(ref, {'value': 2})
+        raise RuntimeError("abort")
+
+    with pytest.raises(RuntimeError):
+        write(db.transaction())
+    assert ref.get().to_dict() == {'value': 1}
+
+
+def test_concurrent_transactions_do_not_lose_updates(db):
+    ref = db.collection('counters').document('c')
+    ref.set({'count': 0})
+
+    @transactional
+    def bump(transaction):
+        count = ref.get(transaction=transaction).to_dict()['count']
+        transaction.set(ref, {'count': count + 1})
+
+    def worker():
+        for _ in range(50):
+            bump(db.transaction())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert ref.get().to_dict()['count'] == 200
+
+
+def test_sqlite_round_trip_of_datetimes_and_bytes(tmp_path):
+    path = str(tmp_path / 'store' / 'data.sqlite3')
+    created = datetime(2025, 3, 1, 10, 30, tzinfo=timezone.utc)
+    store = LocalStore(path)
+    store.collection('sessions').document('s1').set({'created_at': created, 'blob': b'\x00\x01zlib'})
+    store.collection('sessions').document('s1').collection('details').document('report').set({'n': 1})
+    store.collection('sessions').document('s2').set({'created_at': created + timedelta(days=1)})
+    store.collection('sessions').document('s2').delete()
+    store.close()
+
+    reopened = LocalStore(path)
+    try:
+        data = reopened.collection('sessions').document('s1').get().to_dict()
+        assert data == {'created_at': created, 'blob': b'\x00\x01zlib'}
+        assert data['created_at'].tzinfo is not None
+        assert reopened.document('sessions/s1/details/report').get().to_dict() == {'n': 1}
+        assert not reopened.collection('sessions').document('s2').get().exists
+        assert ids(reopened.collection('sessions').where('created_at', '>=', created).stream()) == ['s1']
+    finally:
+        reopened.close()
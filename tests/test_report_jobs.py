@@ -0,0 +1,22 @@
+from datetime import datetime
+
+import report_jobs
+from report_jobs import ReportJobs
+
+
+def test_get_finds_artifact_for_non_json_native_payload(monkeypatch):
+    rendered = []
+
+    def fake_render(payload, language):
+        rendered.append(payload)
+        return b"%PDF"
+
+    monkeypatch.setitem(report_jobs._RENDERERS, 'session', fake_render)
+    jobs = ReportJobs(max_workers=1)
+    payload = {'overall_score': 7, 'created': datetime(2025, 1, 2, 3, 4), 'scores': (1, 2), 3: 'int key'}
+
+    jobs.submit('session', payload)
+    assert jobs.get('session', payload, wait=True, timeout=10) == b"%PDF"
+    assert jobs.get('session', payload) == b"%PDF"
+    assert not jobs.is_pending('session', payload)
+    assert len(rendered) == 1
@@ -0,0 +1,163 @@
+"""
+Score summaries and time-decayed scoring, driven through save_session with the report shapes
+the app really stores (MCC analysis JSON and the full-session report), on the in-memory store.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import firebase_config
+import storage
+from recommendation_engine import (DECAY_HALF_LIFE_DAYS, MARKER_PASS_RATE, analyze_performance, build_profile,
+                                   score_history, summarize_report, update_profile)
+from reference_data import get_reference_data
+from session_aggregator import SessionAggregator
+
+
+@pytest.fixture(autouse=True)
+def memory_store():
+    storage.configure('memory')
+    yield storage.get_db()
+    storage.configure()
+
+
+def mcc_report(observed_ids):
+    """Shape returned by AnalysisEngine.analyze_markers"""
+    competencies = {
+        'C1': {'name': 'Demonstrates Ethical Practice', 'status': 'Pass', 'feedback': '...'},
+        'C2': {'name': 'Embodies a Coaching Mindset', 'status': 'Fail', 'feedback': '...'}
+    }
+    for cid, markers in get_reference_data().markers_by_competency.items():
+        if markers:
+            competencies[cid] = {'name': cid, 'markers': [
+                {'id': m['id'], 'behavior': '...', 'evidence': '...', 'feedback': '...',
+                 'status': 'Observed' if m['id'] in observed_ids else 'Not Observed'}
+                for m in markers
+            ]}
+    return {'markers_observed': len(observed_ids), 'compliance_percentage': len(observed_ids) / 37 * 100,
+            'overall_pcc_result': 'Fail', 'competencies': competencies}
+
+
+def full_session_report(turns):
+    """Shape returned by TrainingEngine.analyze_full_coaching_session (model JSON plus metadata)"""
+    aggregator = SessionAggregator()
+    for markers in turns:
+        aggregator.add_analysis({'analysis': {'score': 7, 'markers_demonstrated': markers,
+                                              'primary_competency': 'Competency 7: Evokes Awareness'}})
+    return {
+        'overall_score': 7,
+        'session_flow': {'opening': 'Strong', 'exploration': 'Acceptable', 'deepening': 'Weak', 'closing': 'Strong'},
+        'strengths': [], 'areas_for_improvement': [], 'recommendations': [], 'key_moments': [],
+        'individual_scores': list(aggregator.scores),
+        'average_individual_score': round(aggregator.average_score(), 1),
+        'markers_demonstrated': dict(sorted(aggregator.marker_counts.items()))
+    }
+
+
+def test_mcc_report_summary():
+    summary = summarize_report(mcc_report({'3.1', '3.2', '7.1'}))
+    scores = dict(zip(summary['competency_ids'], summary['competency_scores']))
+    assert scores['C1'] == 100 and scores['C2'] == 0
+    assert scores['C3'] == 50.0
+    assert dict(zip(summary['marker_ids'], summary['marker_observed']))['7.1'] == 1
+
+
+def test_full_session_report_summary():
+    summary = summarize_report(full_session_report([['7.1', '7.2'], ['6.1'], ['7.1']]))
+    scores = dict(zip(summary['competency_ids'], summary['competency_scores']))
+    assert scores['C7'] == 25.0  # 2 of 8 markers
+    assert scores['C4'] == 0.0
+    observed = dict(zip(summary['marker_ids'], summary['marker_observed']))
+    assert observed['6.1'] == 1 and observed['6.2'] == 0
+
+
+def test_full_session_without_evaluated_turns_is_not_scored():
+    summary = summarize_report(full_session_report([]))
+    assert summary['competency_ids'] == []
+
+
+def test_saved_sessions_feed_decayed_scores_and_profile():
+    user_id = 'uid-1'
+    assert firebase_config.save_session(user_id, {'user_id': user_id, 'session_type': 'MCC Analysis',
+                                                  'report_json': mcc_report({'7.1', '7.2', '7.3', '7.4'})})
+    assert firebase_config.save_session(user_id, {'user_id': user_id, 'session_type': 'Full Session',
+                                                  'report_json': full_session_report([['7.1'], ['6.1']])})
+
+    history = firebase_config.get_user_score_history(user_id)
+    assert len(history) == 2
+    scores = score_history(history)
+    assert not scores['competencies'].empty and not scores['markers'].empty
+    assert scores['markers'].loc['7.1', 'rate'] == 100.0
+    assert scores['competencies'].loc['C7', 'sessions'] == 2
+
+    plan = analyze_performance(user_id)
+    assert plan['competency_scores']['C7'] == pytest.approx((50.0 + 12.5) / 2, abs=0.5)
+    assert plan['weak_markers']
+    assert firebase_config.get_competency_profile(user_id)['session_count'] == 2
+
+
+def test_sessions_saved_under_email_are_rekeyed_on_link(memory_store):
+    email, user_id = 'coach@example.com', 'uid-coach'
+    for observed in (['7.1'], ['7.1', '6.1']):
+        assert firebase_config.save_session(email, {'user_id': email, 'session_type': 'MCC Analysis',
+                                                    'report_json': mcc_report(observed)})
+    assert firebase_config.save_arcade_result(email, 120, 1, {})
+    assert firebase_config.get_competency_profile(user_id)['session_count'] == 0  # built before the link
+
+    assert firebase_config.link_user_id(email, user_id)
+    assert firebase_config.get_competency_profile(user_id)['session_count'] == 2
+    assert firebase_config.get_user_stats(user_id)['arcade_games'] == 1
+    assert not firebase_config.get_user_score_history(email)
+
+
+def test_migrate_email_user_ids_uses_linked_uids(memory_store):
+    assert firebase_config.save_session('a@example.com', {'user_id': 'a@example.com', 'session_type': 'MCC Analysis',
+                                                          'report_json': mcc_report(['7.1'])})
+    assert firebase_config.save_session('b@example.com', {'user_id': 'b@example.com', 'session_type': 'MCC Analysis',
+                                                          'report_json': mcc_report(['7.1'])})
+    memory_store.collection('users').document('a@example.com').set({'email': 'a@example.com', 'uid': 'uid-a'})
+
+    assert firebase_config.migrate_email_user_ids() == 1
+    assert len(firebase_config.get_user_score_history('uid-a')) == 1
+    assert len(firebase_config.get_user_score_history('b@example.com')) == 1  # unknown uid: left alone
+
+
+def test_incremental_profile_matches_profile_built_from_history():
+    start = datetime.now(timezone.utc) - timedelta(days=90)
+    history = [
+        (start, summarize_report(mcc_report({'7.1', '6.1'}))),
+        (start + timedelta(days=10), summarize_report(full_session_report([['7.1', '7.2'], ['6.1']]))),
+        (start + timedelta(days=45), summarize_report(mcc_report({'3.1', '7.3'}))),
+        (start + timedelta(days=80), summarize_report(full_session_report([['8.1'], ['7.1']])))
+    ]
+    incremental = None
+    for created_at, summary in history:
+        incremental = update_profile(incremental, summary, at=created_at)
+    built = build_profile(history)
+
+    assert incremental['session_count'] == built['session_count'] == len(history)
+    # Decayed sums differ only by the common decay between the two reference times
+    decay = 2 ** (-(built['decayed_at'] - incremental['decayed_at']).total_seconds() / 86400 / DECAY_HALF_LIFE_DAYS)
+    for kind in ('competencies', 'markers'):
+        assert set(incremental[kind]) == set(built[kind])
+        for item_id, entry in built[kind].items():
+            other = incremental[kind][item_id]
+            assert (other['count'], other['total'], other['average']) == (entry['count'], entry['total'], entry['average'])
+            assert other['ema'] == pytest.approx(entry['ema'], abs=0.1)
+            assert other['decayed_weight'] * decay == pytest.approx(entry['decayed_weight'])
+            assert other['decayed_total'] * decay == pytest.approx(entry['decayed_total'])
+
+
+def test_weak_markers_only_lists_markers_below_the_pass_rate():
+    strong = 'uid-strong'
+    all_ids = {m['id'] for markers in get_reference_data().markers_by_competency.values() for m in markers}
+    assert firebase_config.save_session(strong, {'user_id': strong, 'session_type': 'MCC Analysis',
+                                                 'report_json': mcc_report(all_ids)})
+    assert analyze_performance(strong)['weak_markers'] == []
+
+    mixed = 'uid-mixed'
+    assert firebase_config.save_session(mixed, {'user_id': mixed, 'session_type': 'MCC Analysis',
+                                                'report_json': mcc_report(all_ids - {'7.1'})})
+    weak = analyze_performance(mixed)['weak_markers']
+    assert [marker['id'] for marker in weak] == ['7.1']
+    assert all(marker['rate'] < MARKER_PASS_RATE for marker in weak)
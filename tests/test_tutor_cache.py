@@ -0,0 +1,30 @@
+from tutor_cache import TutorAnswerCache, normalize_question
+
+LONG_QUESTION = ("Explain marker {} of the ICF PCC markers and give me two practical examples of how a coach "
+                 "demonstrates it during the exploration part of a coaching session with a new client")
+
+
+def test_near_duplicate_hit():
+    cache = TutorAnswerCache()
+    cache.put("What is active listening in coaching sessions?", "answer")
+    assert cache.get("what is active listening in coaching sessions??") == "answer"
+    assert cache.get("Please explain active listening in coaching sessions") == "answer"
+    assert cache.get_stats()['near_duplicate_hits'] == 1
+
+
+def test_marker_ids_must_match_exactly():
+    cache = TutorAnswerCache()
+    cache.put(LONG_QUESTION.format("4.2"), "answer for 4.2")
+    assert cache.get(LONG_QUESTION.format("4.3")) is None
+    assert cache.get(LONG_QUESTION.format("4.2") + " please") == "answer for 4.2"
+
+
+def test_competency_numbers_must_match_exactly():
+    cache = TutorAnswerCache()
+    cache.put("How can I improve competency 7 evokes awareness in my practice sessions?", "c7")
+    assert cache.get("How can I improve competency 8 evokes awareness in my practice sessions?") is None
+
+
+def test_marker_id_is_one_token():
+    assert normalize_question("Marker 4.2?") == "marker 4.2"
+    assert normalize_question("Marker ٤.٢؟") == "marker 4.2"
@@ -1,16 +1,15 @@
 """
 Token Tracker - Track API usage and costs for Gemini API
 """
-import firebase_admin
-from firebase_admin import firestore
+import storage
 from datetime import datetime
 import streamlit as st
 
 class TokenTracker:
     def __init__(self):
         try:
-            if firebase_admin._apps:
-                self.db = firestore.client()
+            if storage.is_ready():
+                self.db = storage.get_db()
             else:
                 self.db = None
         except Exception as e:
@@ -39,7 +38,7 @@ class TokenTracker:
             log_entry = {
                 'user_id': user_id,
                 'service_type': service_type,
-                'timestamp': firestore.SERVER_TIMESTAMP,
+                'timestamp': storage.SERVER_TIMESTAMP,
                 'tokens_used': tokens_used,
                 'cost_estimate': cost,
                 'model': model
@@ -87,25 +86,24 @@ class TokenTracker:
             user_doc = user_ref.get()
             
             if user_doc.exists:
-                current_stats = user_doc.to_dict().get('usage_stats', {})
-                
+                # Server-side increments: no read-modify-write race, other usage_stats fields are kept
                 user_ref.update({
-                    'usage_stats': {
-                        'total_tokens': current_stats.get('total_tokens', 0) + tokens,
-                        'total_cost': current_stats.get('total_cost', 0) + cost,
-                        'last_activity': firestore.SERVER_TIMESTAMP
-                    }
+                    'email_lower': user_id.lower(),
+                    'usage_stats.total_tokens': storage.Increment(tokens),
+                    'usage_stats.total_cost': storage.Increment(cost),
+                    'usage_stats.last_activity': storage.SERVER_TIMESTAMP
                 })
             else:
                 # Create user document if doesn't exist
                 user_ref.set({
                     'email': user_id,
+                    'email_lower': user_id.lower(),
                     'role': 'user',
-                    'created_at': firestore.SERVER_TIMESTAMP,
+                    'created_at': storage.SERVER_TIMESTAMP,
                     'usage_stats': {
                         'total_tokens': tokens,
                         'total_cost': cost,
-                        'last_activity': firestore.SERVER_TIMESTAMP
+                        'last_activity': storage.SERVER_TIMESTAMP
                     }
                 })
         except Exception as e:
@@ -170,7 +168,7 @@ class TokenTracker:
             summary = {
                 'user_id': user_id,
                 'session_type': session_type,
-                'timestamp': firestore.SERVER_TIMESTAMP,
+                'timestamp': storage.SERVER_TIMESTAMP,
                 'score': score,
                 'duration': duration,
                 'competencies_observed': competencies_observed,
@@ -184,9 +182,8 @@ class TokenTracker:
             user_doc = user_ref.get()
             
             if user_doc.exists:
-                current_stats = user_doc.to_dict().get('usage_stats', {})
                 user_ref.update({
-                    'usage_stats.total_sessions': current_stats.get('total_sessions', 0) + 1
+                    'usage_stats.total_sessions': storage.Increment(1)
                 })
             
             return True
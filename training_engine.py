@@ -4,6 +4,25 @@ Training Engine for Advanced Interactive Coaching Simulator
 
 import google.generativeai as genai
 import json
+from conversation_memory import RollingHistory
+from reference_data import get_reference_data
+
+# Turns kept verbatim in client-simulation prompts; older turns are summarized
+CLIENT_HISTORY_RECENT_TURNS = 8
+
+def _marker_index(markers_data):
+    """marker ID -> marker; the shared reference data already carries a prebuilt index"""
+    try:
+        reference = get_reference_data()
+        if markers_data is reference.markers:
+            return reference.marker_by_id
+    except Exception as e:
+        print(f"Error loading reference data: {e}")
+    return {
+        marker['id']: marker
+        for comp in markers_data.get('competencies', [])
+        for marker in comp.get('markers', [])
+    }
 
 class TrainingEngine:
     def __init__(self, api_key, markers_data):
@@ -13,6 +32,19 @@ class TrainingEngine:
             genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel('gemini-flash-latest')
     
+    def _format_history(self, messages, history=None):
+        """
+        Bounded conversation history for client-simulation prompts.
+        
+        Args:
+            messages: Full conversation (list of dicts with 'role' and 'content')
+            history: Optional RollingHistory kept across turns (e.g. in session state);
+                only messages added since its last sync are processed
+        """
+        if history is None:
+            history = RollingHistory(max_recent_turns=CLIENT_HISTORY_RECENT_TURNS)
+        return history.sync(messages).render()
+    
     def generate_bad_question(self, marker_id=None, language="English"):
         """
         Generate a 'bad' coaching question that violates specific markers
@@ -21,12 +53,9 @@ class TrainingEngine:
         
         marker_context = ""
         if marker_id and self.markers_data:
-            # Find the specific marker
-            for comp in self.markers_data.get('competencies', []):
-                for marker in comp.get('markers', []):
-                    if marker['id'] == marker_id:
-                        marker_context = f"\nTarget Marker {marker_id}: {marker['text']}"
-                        break
+            marker = _marker_index(self.markers_data).get(marker_id)
+            if marker:
+                marker_context = f"\nTarget Marker {marker_id}: {marker['text']}"
         
         prompt = f"""
 You are a Training Engine for PCC Coaches.
@@ -102,9 +131,11 @@ Output JSON:
         except Exception as e:
             return {"error": str(e)}
     
-    def simulate_difficult_client(self, persona, conversation_history, topic="career", language="English"):
+    def simulate_difficult_client(self, persona, conversation_history, topic="career", language="English", history=None):
         """
         Act as a difficult client in a coaching conversation with realistic depth and variety
+        
+        history: Optional RollingHistory so prompt size stays flat as the conversation grows
         """
         lang_instruction = "Respond as the client in Arabic" if language == "العربية" else "Respond as the client in English"
         
@@ -222,12 +253,8 @@ Output JSON:
             # Extract context from history
             scenario = "continuing from previous discussion"
         
-        # Format conversation history
-        history_text = ""
-        for msg in conversation_history:
-            role = msg.get('role', 'unknown')
-            content = msg.get('content', '')
-            history_text += f"{role}: {content}\n"
+        # Format conversation history (last turns verbatim + summary of earlier ones)
+        history_text = self._format_history(conversation_history, history)
         
         if len(conversation_history) == 0:
             # First message - introduce the scenario
@@ -310,12 +337,13 @@ Output JSON:
         except Exception as e:
             return {"error": str(e)}
     
-    def simulate_full_session_client(self, persona, topic, session_messages, session_phase, elapsed_minutes, language="English"):
+    def simulate_full_session_client(self, persona, topic, session_messages, session_phase, elapsed_minutes, language="English", history=None):
         """
         Phase-aware client simulation for full coaching sessions with character development
         
         Phases: opening, exploration, deepening, closing
         Client evolves throughout the session based on phase and time
+        history: Optional RollingHistory so prompt size stays flat as the session grows
         """
         lang_instruction = "Respond as the client in Arabic" if language == "العربية" else "Respond as the client in English"
         
@@ -361,12 +389,8 @@ Output JSON:
         persona_info = persona_base.get(persona, {"base": "typical client", "opening": "", "exploration": "", "deepening": "", "closing": ""})
         phase_behavior = persona_info.get(session_phase, persona_info.get("opening", ""))
         
-        # Format conversation history
-        history_text = ""
-        for msg in session_messages:
-            role = msg.get('role', 'unknown')
-            content = msg.get('content', '')
-            history_text += f"{role}: {content}\n"
+        # Format conversation history (last turns verbatim + summary of earlier ones)
+        history_text = self._format_history(session_messages, history)
         
         # First message - include scenario from simulate_difficult_client structure
         if len(session_messages) == 0:
@@ -565,45 +589,70 @@ Output JSON:
         except Exception as e:
             return {"error": str(e)}
     
-    def analyze_full_coaching_session(self, session_messages, hidden_analyses, session_duration_minutes, language="English"):
+    def analyze_full_coaching_session(self, session_messages, hidden_analyses, session_duration_minutes, language="English", aggregator=None):
         """
         Comprehensive analysis of a full coaching session against all 8 ICF competencies
         Returns detailed report with scores, key moments, strengths, and recommendations
+        
+        aggregator: Optional SessionAggregator already fed with every turn's analysis.
+            When given, the prompt carries its compact summary instead of the full transcript.
         """
         lang_instruction = "Output analysis in Arabic" if language == "العربية" else "Output analysis in English"
         
-        # Format session transcript
-        transcript = ""
-        for msg in session_messages:
-            role = msg.get('role', '')
-            content = msg.get('content', '')
-            timestamp = msg.get('timestamp', '')
-            transcript += f"[{timestamp}] {role}: {content}\n"
-        
-        # Calculate talk ratio
-        coach_words = sum(len(msg['content'].split()) for msg in session_messages if msg.get('role') == 'Coach')
-        client_words = sum(len(msg['content'].split()) for msg in session_messages if msg.get('role') == 'Client')
-        total_words = coach_words + client_words
-        coach_ratio = int((coach_words / total_words) * 100) if total_words > 0 else 0
-        client_ratio = 100 - coach_ratio
-        
-        # Extract individual scores from hidden analyses
-        individual_scores = [a['analysis'].get('score', 0) for a in hidden_analyses if 'analysis' in a and 'score' in a['analysis']]
-        avg_score = sum(individual_scores) / len(individual_scores) if individual_scores else 0
+        if aggregator is not None:
+            aggregator.sync_messages(session_messages)
+            coach_ratio, client_ratio = aggregator.talk_ratio()
+            individual_scores = aggregator.scores
+            avg_score = aggregator.average_score()
+            total_exchanges = aggregator.coach_turns
+            marker_counts = aggregator.marker_counts
+            
+            session_context = f"""SESSION SUMMARY (aggregated from the per-turn assessments):
+{json.dumps(aggregator.summary(), ensure_ascii=False)}
+
+Timestamps for key moments come from 'strongest_moments' / 'weakest_moments'.
+Key questions per GROW phase come from 'grow_phases'."""
+        else:
+            # Format session transcript
+            transcript = ""
+            for msg in session_messages:
+                role = msg.get('role', '')
+                content = msg.get('content', '')
+                timestamp = msg.get('timestamp', '')
+                transcript += f"[{timestamp}] {role}: {content}\n"
+            
+            # Calculate talk ratio
+            coach_words = sum(len(msg['content'].split()) for msg in session_messages if msg.get('role') == 'Coach')
+            client_words = sum(len(msg['content'].split()) for msg in session_messages if msg.get('role') == 'Client')
+            total_words = coach_words + client_words
+            coach_ratio = int((coach_words / total_words) * 100) if total_words > 0 else 0
+            client_ratio = 100 - coach_ratio
+            
+            # Extract individual scores from hidden analyses
+            individual_scores = [a['analysis'].get('score', 0) for a in hidden_analyses if 'analysis' in a and 'score' in a['analysis']]
+            avg_score = sum(individual_scores) / len(individual_scores) if individual_scores else 0
+            total_exchanges = len([m for m in session_messages if m.get('role') == 'Coach'])
+            from session_aggregator import SessionAggregator
+            tally = SessionAggregator()
+            for entry in hidden_analyses:
+                tally.add_analysis(entry)
+            marker_counts = tally.marker_counts
+            
+            session_context = f"""FULL SESSION TRANSCRIPT:
+{transcript}
+
+INDIVIDUAL RESPONSE SCORES:
+{individual_scores}"""
         
         prompt = f"""
 You are a RUTHLESS ICF PCC Assessor conducting a comprehensive session analysis.
 
 SESSION DETAILS:
 - Duration: {session_duration_minutes} minutes
-- Total exchanges: {len([m for m in session_messages if m.get('role') == 'Coach'])}
+- Total exchanges: {total_exchanges}
 - Talk ratio: Coach {coach_ratio}% / Client {client_ratio}%
 
-FULL SESSION TRANSCRIPT:
-{transcript}
-
-INDIVIDUAL RESPONSE SCORES:
-{individual_scores}
+{session_context}
 
 TASK: Provide a COMPREHENSIVE analysis of this full coaching session.
 
@@ -686,10 +735,12 @@ Output JSON:
             
             # Add metadata
             result['session_duration'] = f"{session_duration_minutes} minutes"
-            result['total_exchanges'] = len([m for m in session_messages if m.get('role') == 'Coach'])
+            result['total_exchanges'] = total_exchanges
             result['talk_ratio'] = f"Coach: {coach_ratio}% / Client: {client_ratio}%"
-            result['individual_scores'] = individual_scores
+            result['individual_scores'] = list(individual_scores)
             result['average_individual_score'] = round(avg_score, 1)
+            # Per-marker turn counts: the saved session's score summary is built from these
+            result['markers_demonstrated'] = dict(sorted(marker_counts.items()))
             
             return result
         except Exception as e:
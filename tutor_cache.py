@@ -0,0 +1,163 @@
+"""
+Tutor Answer Cache - Reuse AI Tutor answers for repeated or near-duplicate questions
+"""
+import re
+import threading
+from collections import OrderedDict
+
+# Arabic diacritics (tashkeel) and tatweel are dropped before matching
+_ARABIC_DIACRITICS = re.compile(r'[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]')
+_PUNCTUATION = re.compile(r'(?!(?<=\d)\.(?=\d))[^\w\s]')  # keeps '4.2' whole
+_ARABIC_DIGITS = str.maketrans('٠١٢٣٤٥٦٧٨٩', '0123456789')
+
+# Filler words that do not change the meaning of a tutor question
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "of", "to", "in", "on", "for", "and", "or",
+    "what", "whats", "please", "can", "you", "me", "tell", "explain", "about", "do", "does",
+    "ما", "هو", "هي", "في", "من", "عن", "على", "الى", "إلى", "و", "هل", "اشرح", "لي"
+}
+
+
+def normalize_question(text):
+    """
+    Normalize a question for cache matching.
+    Lowercases, strips punctuation (except decimal points, so marker IDs like 4.2 stay one token)
+    and Arabic diacritics, unifies Alef/Yaa/Taa forms and Arabic-Indic digits.
+    """
+    text = str(text or "").lower().translate(_ARABIC_DIGITS)
+    text = _ARABIC_DIACRITICS.sub('', text)
+    text = re.sub(r'[إأآ]', 'ا', text)
+    text = text.replace('ى', 'ي').replace('ة', 'ه')
+    text = _PUNCTUATION.sub(' ', text)
+    return ' '.join(text.split())
+
+
+def question_tokens(normalized_text):
+    """Token set used for near-duplicate matching (stopwords removed)"""
+    tokens = {tok for tok in normalized_text.split() if tok not in _STOPWORDS}
+    # Fall back to all tokens if the question is made only of stopwords
+    return frozenset(tokens) if tokens else frozenset(normalized_text.split())
+
+
+def identifier_tokens(tokens):
+    """Tokens containing a digit (marker IDs, competency numbers like c7, levels...)"""
+    return frozenset(tok for tok in tokens if any(ch.isdigit() for ch in tok))
+
+
+def token_set_similarity(tokens_a, tokens_b):
+    """Jaccard similarity between two token sets (0.0 - 1.0)"""
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+class TutorAnswerCache:
+    def __init__(self, max_entries=256, similarity_threshold=0.85):
+        """
+        Args:
+            max_entries: Maximum number of cached answers (LRU eviction beyond this)
+            similarity_threshold: Minimum token-set similarity for a near-duplicate hit
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._entries = OrderedDict()  # (language, normalized question) -> entry
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, question, language="English"):
+        """
+        Look up a cached answer.
+
+        Returns:
+            str: Cached answer, or None on a miss
+        """
+        normalized = normalize_question(question)
+        if not normalized:
+            return None
+
+        key = (language, normalized)
+        with self._lock:
+            # 1. Exact match on normalized text
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry['hits'] += 1
+                self.hits += 1
+                return entry['answer']
+
+            # 2. Near-duplicate match within the same language; identifiers must match exactly
+            # ("explain marker 4.2" and "explain marker 4.3" need different answers)
+            tokens = question_tokens(normalized)
+            identifiers = identifier_tokens(tokens)
+            best_key = None
+            best_score = 0.0
+            for entry_key, candidate in self._entries.items():
+                if entry_key[0] != language or candidate['identifiers'] != identifiers:
+                    continue
+                score = token_set_similarity(tokens, candidate['tokens'])
+                if score > best_score:
+                    best_key, best_score = entry_key, score
+
+            if best_key is not None and best_score >= self.similarity_threshold:
+                entry = self._entries[best_key]
+                self._entries.move_to_end(best_key)
+                entry['hits'] += 1
+                self.hits += 1
+                self.near_hits += 1
+                return entry['answer']
+
+            self.misses += 1
+            return None
+
+    def put(self, question, answer, language="English"):
+        """Store an answer for a question"""
+        normalized = normalize_question(question)
+        if not normalized or not answer:
+            return
+
+        key = (language, normalized)
+        with self._lock:
+            tokens = question_tokens(normalized)
+            self._entries[key] = {
+                'answer': answer,
+                'tokens': tokens,
+                'identifiers': identifier_tokens(tokens),
+                'hits': 0
+            }
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all cached answers (metrics are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """Hit-rate metrics for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'near_duplicate_hits': self.near_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+# Singleton instance (shared by all sessions in the process)
+_cache_instance = None
+
+def get_tutor_cache():
+    """Get or create tutor answer cache instance"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = TutorAnswerCache()
+    return _cache_instance
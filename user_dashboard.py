@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
 def show_user_dashboard(user_email, is_admin=False, language="English"):
     """
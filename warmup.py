@@ -0,0 +1,137 @@
+"""
+Warm-up - Pay the one-off startup costs before the server accepts traffic
+Preloads reference data, registers PDF fonts, precomputes shaped Arabic labels, initializes
+Firebase and primes the Gemini client, then (with --serve) starts Streamlit in the same process
+so every session reuses the warmed modules and caches. The health endpoint only answers once
+the server is listening, i.e. after the warm-up has finished.
+
+Usage:
+    python warmup.py                                   # warm up and report timings only
+    python warmup.py --serve -- --server.port=8080     # warm up, then run the app
+"""
+import argparse
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Modules the pages import on first use
+PAGE_MODULES = [
+    'analysis_engine',
+    'training_engine',
+    'knowledge_bot',
+    'recommendation_engine',
+    'learning_hub',
+    'profile_page',
+    'report_jobs'
+]
+
+
+def _load_reference_data():
+    from reference_data import get_reference_data
+    get_reference_data()
+
+
+def _import_modules():
+    from lazy_imports import load
+    for name in ['pd', 'px', 'genai']:
+        load(name)
+    for name in PAGE_MODULES:
+        load(name)
+
+
+def _warm_pdf():
+    from pdf_renderer import register_fonts, get_style_set, warm_arabic_cache
+    register_fonts()
+    get_style_set("English")
+    get_style_set("العربية")
+    warm_arabic_cache()
+
+
+def _init_firebase(prime_network):
+    import firebase_config
+    import storage
+    if not firebase_config.initialize_firebase():
+        raise RuntimeError("Firebase initialization failed")
+    db = storage.get_db()
+    from admin_middleware import get_admin_middleware
+    from admin_analytics import get_admin_analytics
+    from token_tracker import get_token_tracker
+    get_admin_middleware()
+    get_admin_analytics()
+    get_token_tracker()
+    if prime_network:
+        # Open the gRPC channel (one document read)
+        db.collection('users').document('_warmup').get()
+
+
+def _prime_gemini(prime_network):
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY not set")
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    model = genai.GenerativeModel('gemini-flash-latest')
+    if prime_network:
+        # Free call that creates the client and its connection
+        model.count_tokens("warm-up")
+
+
+def warm_up(prime_network=True):
+    """
+    Run every warm-up step; a failing step is reported but does not stop the others.
+
+    Args:
+        prime_network: Also make one cheap Firestore read and Gemini count_tokens call
+                       so the first user doesn't pay for channel setup
+
+    Returns:
+        dict: step name -> {'seconds'} or {'seconds', 'error'}
+    """
+    steps = [
+        ('reference_data', _load_reference_data),
+        ('imports', _import_modules),
+        ('pdf_fonts_and_arabic_labels', _warm_pdf),
+        ('firebase', lambda: _init_firebase(prime_network)),
+        ('gemini', lambda: _prime_gemini(prime_network))
+    ]
+    results = {}
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+            results[name] = {'seconds': round(time.perf_counter() - start, 3)}
+        except Exception as e:
+            print(f"Error during warm-up step {name}: {e}")
+            results[name] = {'seconds': round(time.perf_counter() - start, 3), 'error': str(e)}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm up caches and clients, optionally then run the app")
+    parser.add_argument('--serve', action='store_true', help="Start Streamlit (app.py) in this process afterwards")
+    parser.add_argument('--no-network', action='store_true', help="Skip the Firestore/Gemini connection priming")
+    parser.add_argument('streamlit_args', nargs=argparse.REMAINDER, help="Arguments passed to 'streamlit run app.py'")
+    args = parser.parse_args(argv)
+
+    total_start = time.perf_counter()
+    results = warm_up(prime_network=not args.no_network)
+    for name, result in results.items():
+        status = f"failed: {result['error']}" if 'error' in result else "ok"
+        print(f"[warm-up] {name}: {result['seconds']:.2f}s {status}")
+    print(f"[warm-up] total: {time.perf_counter() - total_start:.2f}s")
+
+    if not args.serve:
+        return 0
+
+    streamlit_args = [a for a in args.streamlit_args if a != '--']
+    from streamlit.web import cli as stcli
+    sys.argv = ["streamlit", "run", "app.py", *streamlit_args]
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())